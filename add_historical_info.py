@@ -1,53 +1,117 @@
+import logging
+import os
+import re
+import sys
+
 import pandas as pd
-from IPython.display import display
 
-all_df = pd.DataFrame()
+from course_records import read_records, records_path, write_records
+from schedule_store import STORE_PATH, load_offerings, term_from_filename
 
 path = 'data/'
-import os
 
-for file in os.listdir(path):
-    if file.endswith('.csv'):
-        print(file)
-        df = pd.read_csv(os.path.join(path, file))
-        df['term'] = file.split('_')[1]
-        df['year'] = file.split('_')[2]
-        all_df = pd.concat([all_df, df], ignore_index=True)
+def term_files(csv_dir=path):
+    """The per-term schedule CSVs in csv_dir, sorted (none if it doesn't exist)."""
+    if not os.path.isdir(csv_dir):
+        return []
+    return [os.path.join(csv_dir, file) for file in sorted(os.listdir(csv_dir)) if file.endswith('.csv')]
+
+def read_term_files(path):
+    """Read every per-term schedule CSV in path into one frame (single concat)."""
+    frames = []
+    for file in term_files(path):
+        logging.info("Reading %s", file)
+        df = pd.read_csv(file)
+        df['term'], df['year'] = term_from_filename(file)
+        frames.append(df)
+    if not frames:
+        # No schedule data: every course gets empty terms and professors
+        return prepare_offerings(pd.DataFrame(columns=['course_code', 'section', 'instructor', 'term', 'year']))
+    return prepare_offerings(pd.concat(frames, ignore_index=True))
+
+def prepare_offerings(all_df):
+    # Filter for sections no ending with a number
+    all_df = all_df[~all_df['section'].str.contains(r'\d$', na=False)]
 
-# Filter for sections no ending with a number
-all_df = all_df[~all_df['section'].str.contains(r'\d$', na=False)]
+    all_df['term_year'] = all_df['term'].astype(str) + all_df['year'].astype(str)
+    return all_df
 
-display(all_df[(all_df['course_code'] == 'MATH 6121')])
+def load_all_offerings(course_codes=None):
+    """
+    Offerings for the given courses, from the columnar schedule store if it has
+    been built (python schedule_store.py ingest data/*.csv), else from the CSVs.
+    """
+    if os.path.isdir(STORE_PATH):
+        all_df = load_offerings(columns=['course_code', 'section', 'instructor'], course_codes=course_codes)
+        return prepare_offerings(all_df)
+    return read_term_files(path)
 
-all_df['term_year'] = all_df['term'].astype(str) + all_df['year'].astype(str)
+def history_path(records_file):
+    """data2/gt_MATH_courses.csv -> data2/gt_MATH_courses_history.parquet"""
+    return os.path.splitext(records_file)[0] + '_history.parquet'
 
 def translate_terms(terms):
     # take array([202408, 202208, 202108, 202008, 202308]) and return f"Fall {x // 100}" or f"Spring {x // 100}"
     return [f"Fall {x // 100}" if x % 100 == 8 else f"Spring {x // 100}" for x in terms]
 
 def syntactic_join(lst):
-    if not lst.any() or len(lst) == 0:
+    if len(lst) == 0 or not any(lst):
         return " "
     if len(lst) == 1:
         return str(lst[0])
     return ", ".join(str(item) for item in lst[:-1]) + ", and " + str(lst[-1])
 
-in_file_path = 'data2/gt_math_courses.csv'
-out_file_path = 'data2/gt_math_courses.csv'
-math_courses_df = pd.read_csv(in_file_path)
-math_courses_df['course_code'] = math_courses_df['title'].str.split('-').str[0].str.strip()
-math_courses_df['terms'] = math_courses_df['course_code'].apply(lambda x: all_df[all_df['course_code'] == x].sort_values(['year', 'term'])['term_year'].unique()[-5:][::-1])
-math_courses_df['professors'] = math_courses_df['course_code'].apply(lambda x: all_df[all_df['course_code'] == x].sort_values(['year', 'term'])['instructor'].apply(lambda y: y.split(',')[0].strip() if pd.notna(y) else '').unique()[-5:][::-1])
+def build_offering_index(all_df):
+    """
+    Offerings grouped by course_code, each group sorted by (year, term).
 
-math_courses_df['terms_str'] = math_courses_df['terms'].apply(lambda x: syntactic_join(x))
-math_courses_df['professors_str'] = math_courses_df['professors'].apply(lambda x:  syntactic_join(x))
-import re
-math_courses_df['professors_str'] = math_courses_df['professors_str'].apply(lambda x: re.sub(r'\s+', ' ', x.replace('\n', ' ')).strip())
-math_courses_df['terms_str'] = math_courses_df['terms_str'].apply(lambda x: re.sub(r'\s+', ' ', x.replace('\n', ' ')).strip())  
-math_courses_df['professors_str'] = math_courses_df['professors_str'].str.replace('\n', ' ')
-math_courses_df['terms_str'] = math_courses_df['terms_str'].str.replace('\n', ' ')
+    Built once; every per-course lookup afterwards is a group access instead
+    of a boolean-mask scan over all offerings.
+    """
+    offerings = all_df[['course_code', 'year', 'term', 'term_year', 'instructor']].copy()
+    offerings['instructor'] = offerings['instructor'].str.split(',').str[0].str.strip().fillna('')
+    return offerings.sort_values(['course_code', 'year', 'term'], kind='stable')
+
+def last_distinct(offerings, column, n=5):
+    """
+    For every course, the last n distinct values of column in (year, term)
+    order, most recent first.
+    """
+    # keep='first' keeps each value at its first offering, matching Series.unique()
+    distinct = offerings.drop_duplicates(['course_code', column], keep='first')
+    latest = distinct.groupby('course_code', sort=False).tail(n)
+    return latest.iloc[::-1].groupby('course_code', sort=False)[column].agg(list)
+
+def clean_join(values):
+    return re.sub(r'\s+', ' ', syntactic_join(values).replace('\n', ' ')).strip()
+
+def add_historical_info(courses_df, all_df):
+    """
+    Adds terms/professors (last 5 distinct, most recent first) and their
+    joined *_str forms to a course catalog frame.
+    """
+    offerings = build_offering_index(all_df)
+    terms = last_distinct(offerings, 'term_year')
+    professors = last_distinct(offerings, 'instructor')
+
+    courses_df = courses_df.copy()
+    courses_df['course_code'] = courses_df['title'].str.split('-').str[0].str.strip()
+    courses_df['terms'] = [terms.get(code, []) for code in courses_df['course_code']]
+    courses_df['professors'] = [professors.get(code, []) for code in courses_df['course_code']]
+    courses_df['terms_str'] = courses_df['terms'].apply(clean_join)
+    courses_df['professors_str'] = courses_df['professors'].apply(clean_join)
+    return courses_df
+
+if __name__ == "__main__":
+    in_file_path = sys.argv[1] if len(sys.argv) > 1 else records_path('data2/gt_MATH_courses')
+    # Never overwrite the scraped records; enriched records go next to them
+    out_file_path = sys.argv[2] if len(sys.argv) > 2 else history_path(in_file_path)
+    if os.path.abspath(out_file_path) == os.path.abspath(in_file_path):
+        print("Refusing to overwrite the input file; give a different output path")
+        sys.exit(1)
 
-print(repr(math_courses_df[math_courses_df['course_code'] == 'MATH 2550']['professors_str'].iloc[0]))
-print(math_courses_df[math_courses_df['course_code'] == 'MATH 2550']['professors_str'].iloc[0])
+    math_courses_df = read_records(in_file_path)
+    course_codes = math_courses_df['title'].str.split('-').str[0].str.strip().unique()
+    math_courses_df = add_historical_info(math_courses_df, load_all_offerings(course_codes))
 
-math_courses_df.to_csv(out_file_path, index=False)
+    write_records(math_courses_df, out_file_path)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for every pipeline stage.
+
+Each stage runs on synthetic catalogs and schedules (synthetic.py) at the
+requested sizes, and page parsing runs on the saved OSCAR pages in
+fixtures/oscar with every available extractor backend. Every stage is timed
+on its own, then run again for its peak memory, and the results are written
+as JSON so runs can be compared across commits.
+
+Memory is reported two ways. peak_mib is tracemalloc's peak, which only sees
+Python allocations: lxml's trees, numpy arrays and Arrow buffers don't show
+up there. rss_mib is how far the peak resident set grows while the stage
+runs, measured in a forked process (where fork exists) so earlier stages'
+peaks don't hide it; it includes C allocations:
+
+    python3 benchmark.py run                            # 1e3, 1e4 and 1e5 courses
+    python3 benchmark.py run --sizes 1000 --stages build_graph layout
+    python3 benchmark.py compare bench_results/a1b2c3d.json bench_results/e4f5a6b.json
+
+Results go to bench_results/<commit>.json unless --out is given.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from add_historical_info import add_historical_info, prepare_offerings
+from build_site import render_page
+from course_records import read_records, write_records
+from extract import available_backends
+from gen_network import build_graph, prerequisite_closure
+from layout import apply_layout
+from prereqs import _parse_text, parse_many
+from scraper import parse_course_page
+from synthetic import synthetic_catalog, synthetic_offerings
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+FIXTURES = 'fixtures/oscar'
+RESULTS_DIR = 'bench_results'
+
+
+# Each stage is setup(data) -> args and run(*args); setup is not timed and
+# runs again before the memory pass, since some stages modify their input.
+
+def _fresh_parse(texts):
+    _parse_text.cache_clear()
+    return parse_many(texts)
+
+def _write_read(catalog, directory):
+    path = os.path.join(directory, 'records.parquet')
+    write_records(catalog, path)
+    return read_records(path)
+
+STAGES = {
+    'parse_prereqs': (lambda data: (data['catalog']['prereq_text'],), _fresh_parse),
+    'records_io': (lambda data: (data['catalog'], data['tmp']), _write_read),
+    'add_history': (lambda data: (data['catalog'], prepare_offerings(data['offerings'].copy())),
+                    add_historical_info),
+    'build_graph': (lambda data: (data['catalog'],), lambda catalog: build_graph(catalog, node_ids='code')),
+    'closure': (lambda data: (data['graph'],), prerequisite_closure),
+    'layout': (lambda data: (build_graph(data['catalog'], node_ids='code'),), apply_layout),
+    'render_page': (lambda data: (build_graph(data['catalog'], node_ids='code'),
+                                  os.path.join(data['tmp'], 'page.html')), render_page),
+}
+
+
+def _max_rss_bytes():
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+
+def rss_growth(setup, run):
+    """MiB the peak RSS grows by during run, in a forked child; None without fork."""
+    if not hasattr(os, 'fork'):
+        return None
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            args = setup()
+            before = _max_rss_bytes()
+            run(*args)
+            os.write(write_fd, str((_max_rss_bytes() - before) / 2**20).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        reported = f.read()
+    os.waitpid(pid, 0)
+    return float(reported) if reported else None
+
+
+def measure(setup, run, memory=True):
+    """
+    Seconds for one run and, if memory, peak traced MiB for a second run and
+    the RSS growth of a third (None, None without memory).
+    """
+    args = setup()
+    start = time.perf_counter()
+    run(*args)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    rss = None
+    if memory:
+        args = setup()
+        tracemalloc.start()
+        run(*args)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        del args
+        rss = rss_growth(setup, run)
+    return seconds, peak, rss
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def bench_pages(memory, repeat=20):
+    """parse_course_page over the fixture corpus, once per extractor backend."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+    results = []
+    if not pages:
+        return results
+    for backend in available_backends():
+        def run(pages=pages * repeat, backend=backend):
+            for html in pages:
+                parse_course_page(html, backend)
+        seconds, peak, rss = measure(lambda: (), run, memory)
+        results.append({'stage': f'parse_pages[{backend}]', 'size': len(pages) * repeat,
+                        'seconds': seconds, 'peak_mib': peak, 'rss_mib': rss})
+    return results
+
+
+def run_benchmarks(sizes, stages, memory=True, seed=0):
+    results = []
+    if 'parse_pages' in stages:
+        results.extend(bench_pages(memory))
+        print_results(results)
+    for size in sizes:
+        catalog = synthetic_catalog(size, seed=seed)
+        data = {'catalog': catalog, 'offerings': synthetic_offerings(catalog, seed=seed)}
+        with tempfile.TemporaryDirectory() as tmp:
+            data['tmp'] = tmp
+            data['graph'] = build_graph(catalog, node_ids='code')
+            for name in stages:
+                if name not in STAGES:
+                    continue
+                setup, run = STAGES[name]
+                seconds, peak, rss = measure(lambda: setup(data), run, memory)
+                result = {'stage': name, 'size': size, 'seconds': seconds, 'peak_mib': peak, 'rss_mib': rss}
+                results.append(result)
+                print_results([result])
+    return results
+
+
+def print_results(results):
+    for result in results:
+        peak = '' if result['peak_mib'] is None else f"{result['peak_mib']:9.1f} MiB traced"
+        rss = '' if result.get('rss_mib') is None else f"{result['rss_mib']:9.1f} MiB RSS"
+        print(f"{result['stage']:22} {result['size']:>8} {result['seconds']:9.3f}s {peak} {rss}".rstrip())
+        sys.stdout.flush()
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = {(r['stage'], r['size']): r for r in json.load(f)['results']}
+    with open(new_path) as f:
+        new = json.load(f)['results']
+    print(f"{'stage':22} {'size':>8} {'old':>9} {'new':>9} {'ratio':>7}")
+    for result in new:
+        before = old.get((result['stage'], result['size']))
+        if before is None:
+            continue
+        ratio = result['seconds'] / before['seconds'] if before['seconds'] else float('nan')
+        print(f"{result['stage']:22} {result['size']:>8} {before['seconds']:8.3f}s "
+              f"{result['seconds']:8.3f}s {ratio:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run')
+    run_parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES, help="Catalog sizes (courses)")
+    run_parser.add_argument("--stages", nargs='+', default=['parse_pages'] + list(STAGES),
+                            help="Stages to run (default: all)")
+    run_parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--out", help=f"Results file (default: {RESULTS_DIR}/<commit>.json)")
+    compare_parser = commands.add_parser('compare')
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        compare(args.old, args.new)
+        return
+
+    commit = git_commit()
+    results = run_benchmarks(args.sizes, args.stages, not args.no_memory, args.seed)
+    out = args.out or os.path.join(RESULTS_DIR, f'{commit}.json')
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'results': results,
+        }, f, indent=1)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Build the whole-university site: one page per department plus an overview.
+
+The full catalog (data2/gt_courses.csv) is turned into a single graph keyed
+by course code, then sharded by department. Each shard keeps its own courses
+and, as stub nodes, the courses from other departments it is connected to
+(e.g. MATH 1554 on the CS page), so cross-department edges are still drawn.
+Double-clicking a stub opens that department's page. Shards are laid out and
+written in a process pool, so a full rebuild scales with the number of cores.
+
+The overview page (index.html) has one node per department, sized by course
+count, with an edge wherever one department's courses require another's.
+
+Usage:
+    python3 build_site.py --out site
+    python3 build_site.py --out site --departments MATH CS --processes 4
+"""
+import argparse
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from clusters import page_clusters
+from emit import write_page
+from gen_network import build_graph, load_university_catalog, prerequisite_closure
+from graph_core import CompactGraph, as_compact
+from layout import apply_layout
+from search_index import build_search_index
+from tooltips import write_tooltip_sidecar
+
+STUB_COLOR = '#EEEEEE'
+
+def department(code):
+    return code.split(' ')[0]
+
+def department_page(subject):
+    return f'{subject}.html'
+
+def stub_node(code):
+    subject = department(code)
+    return {
+        'label': code,
+        'color': STUB_COLOR,
+        'shape': 'box',
+        'page': department_page(subject),
+        'desc': f"<div><h3>{code}</h3><br/>Offered by {subject}. Double-click to open the {subject} graph.</div>",
+    }
+
+def shard_graph(net):
+    """
+    Split a code-keyed graph into per-department graphs.
+
+    Returns:
+        Dict of subject -> CompactGraph with that department's courses and
+        stub nodes for the other end of every cross-department edge
+    """
+    members = {}
+    for node in net.nodes:
+        members.setdefault(department(node), []).append(node)
+    shards = {subject: net.subgraph(nodes) for subject, nodes in members.items()}
+
+    stubs = {}
+    for u, v in net.edges:
+        if department(u) == department(v):
+            continue
+        for subject, stub in ((department(v), u), (department(u), v)):
+            nodes, edges = stubs.setdefault(subject, ({}, []))
+            nodes[stub] = stub_node(stub)
+            edges.append((u, v))
+    for subject, (nodes, edges) in stubs.items():
+        shards[subject] = shards[subject].extend(list(nodes), list(nodes.values()), edges)
+
+    # Each shard keeps the prerequisite pairs among its courses and stubs,
+    # not the whole university's list (it is pickled to a worker per shard)
+    if 'prerequisites' in net.graph:
+        prerequisites = {subject: [] for subject in shards}
+        for u, v in net.graph['prerequisites']:
+            for subject in {department(u), department(v)}:
+                if subject in shards and u in shards[subject] and v in shards[subject]:
+                    prerequisites[subject].append((u, v))
+        for subject, pairs in prerequisites.items():
+            shards[subject].graph['prerequisites'] = pairs
+    return shards
+
+def overview_graph(net):
+    """One node per department; an edge A -> B if a course in A is a prerequisite of one in B."""
+    sizes = Counter(department(node) for node in net.nodes)
+    links = Counter((department(u), department(v)) for u, v in net.edges if department(u) != department(v))
+
+    subjects = sorted(sizes)
+    columns = {
+        'label': subjects,
+        'size': [round(10 + 3 * math.sqrt(sizes[subject])) for subject in subjects],
+        'page': [department_page(subject) for subject in subjects],
+        'desc': [f"<div><h3>{subject}</h3><br/>{sizes[subject]} courses</div>" for subject in subjects],
+    }
+    links = sorted(links.items())
+    edge_columns = {
+        'weight': [min(count, 8) for _, count in links],
+        'title': [f"{count} prerequisite edges" for _, count in links],
+    }
+    return CompactGraph.from_edges(subjects, [pair for pair, _ in links], columns, edge_columns)
+
+def render_page(net, out_path, closure=False, clusters='auto'):
+    """Layout, tooltip sidecar, clusters (page_clusters mode), search index and page for one graph."""
+    net = as_compact(net)
+    apply_layout(net)
+    write_tooltip_sidecar(net, out_path)
+    write_page(net, out_path, prerequisite_closure(net) if closure else None, clusters=page_clusters(net, clusters),
+               search=build_search_index(net))
+    return out_path
+
+def _render_job(job):
+    return render_page(*job)
+
+def build_site(catalog, out_dir='site', departments=None, processes=None, closure=False):
+    """
+    Render every department page and the overview into out_dir.
+
+    Args:
+        catalog: Course records for several subjects (see load_university_catalog)
+        out_dir: Output directory
+        departments: Only render these departments' pages (the overview always
+            covers the whole catalog)
+        processes: Worker processes; defaults to the number of cores
+        closure: Embed the transitive prerequisite index in department pages
+
+    Returns:
+        List of written page paths
+    """
+    net = build_graph(catalog, node_ids='code')
+    shards = shard_graph(net)
+    if departments is not None:
+        shards = {subject: shards[subject] for subject in departments if subject in shards}
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    jobs = [(overview_graph(net), os.path.join(out_dir, 'index.html'), False)]
+    # Largest shards first so the pool isn't left waiting on one big department
+    for subject, shard in sorted(shards.items(), key=lambda item: -item[1].number_of_nodes()):
+        jobs.append((shard, os.path.join(out_dir, department_page(subject)), closure))
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_render_job, jobs))
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-department pages and an overview")
+    parser.add_argument("--catalog", default='data2/gt_courses.csv', help="Whole-university catalog CSV")
+    parser.add_argument("--out", default='site', help="Output directory")
+    parser.add_argument("--departments", nargs='+', help="Only build these departments' pages")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--closure", action="store_true", help="Embed the transitive prerequisite index")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pages = build_site(load_university_catalog(args.catalog), args.out, args.departments, args.processes,
+                       args.closure)
+    print(f"Wrote {len(pages)} pages to {args.out} in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Subject-wide catalog ingestion from OSCAR.
+
+OSCAR's catalog search (bwckctlg.p_display_courses) returns every course of a
+subject on one page as a run of nttitle/ntdefault cell pairs. Fetching that
+listing tells us which course numbers actually exist, so the scraper only
+requests detail pages for real courses instead of probing a hand-maintained
+list of numbers.
+"""
+import re
+from html.parser import HTMLParser
+
+import pandas as pd
+
+CATALOG_LISTING_URL = "https://oscar.gatech.edu/bprod/bwckctlg.p_display_courses"
+
+# Course numbers can carry a letter suffix ('2010R') or an X wildcard ('1X51')
+TITLE_PATTERN = re.compile(r'^([A-Z]{2,4})\s+(\w{4,5})\s+-\s+(.*)$')
+CREDITS_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s+Credit hours')
+
+
+def listing_params(subject, term, start="0000", end="9999"):
+    """
+    Query for one subject's catalog listing. Banner expects the 'dummy' entries
+    for every multi-select field, so this is a list of pairs rather than a dict.
+    """
+    params = [("term_in", term), ("call_proc_in", "bwckctlg.p_disp_dyn_ctlg")]
+    for field in ["sel_subj", "sel_levl", "sel_schd", "sel_coll", "sel_divs", "sel_dept", "sel_attr"]:
+        params.append((field, "dummy"))
+    params += [
+        ("sel_subj", subject),
+        ("sel_crse_strt", start),
+        ("sel_crse_end", end),
+        ("sel_title", ""),
+        ("sel_levl", "%"),
+        ("sel_schd", "%"),
+        ("sel_coll", "%"),
+        ("sel_divs", "%"),
+        ("sel_dept", "%"),
+        ("sel_from_cred", ""),
+        ("sel_to_cred", ""),
+        ("sel_attr", "%"),
+    ]
+    return params
+
+
+class CourseListingParser(HTMLParser):
+    """
+    Incremental parser for a catalog listing page.
+
+    Text can be fed in chunks as it arrives; completed course blocks are
+    collected in self.blocks as dicts with subject, number, title, description
+    and credits.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.blocks = []
+        self._cell = None
+        self._depth = 0
+        self._text = []
+        self._pending = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'td':
+            if self._cell:
+                self._depth += 1
+                return
+            cls = dict(attrs).get('class', '')
+            if cls in ('nttitle', 'ntdefault'):
+                self._cell = cls
+                self._depth = 0
+                self._text = []
+        elif tag == 'br' and self._cell:
+            self._text.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag != 'td' or not self._cell:
+            return
+        if self._depth:
+            self._depth -= 1
+            return
+        text = ''.join(self._text)
+        if self._cell == 'nttitle':
+            self._start_block(text.strip())
+        elif self._pending is not None:
+            self._finish_block(text)
+        self._cell = None
+
+    def handle_data(self, data):
+        if self._cell:
+            self._text.append(data)
+
+    def _start_block(self, title):
+        match = TITLE_PATTERN.match(title)
+        self._pending = None
+        if match:
+            self._pending = {
+                "subject": match.group(1),
+                "number": match.group(2),
+                "title": title,
+            }
+
+    def _finish_block(self, text):
+        lines = [line.strip() for line in text.split('\n')]
+        description = next((line for line in lines if line and not CREDITS_PATTERN.search(line)), "")
+        credits = CREDITS_PATTERN.search(text)
+        self._pending["description"] = description
+        self._pending["credits"] = float(credits.group(1)) if credits else None
+        self.blocks.append(self._pending)
+        self._pending = None
+
+
+def parse_listing(html):
+    """Parse a full listing page into course blocks."""
+    parser = CourseListingParser()
+    parser.feed(html)
+    parser.close()
+    return parser.blocks
+
+
+async def fetch_subject_listing(fetcher, subject, term="202502", base_url=CATALOG_LISTING_URL,
+                                ranges=(("0000", "9999"),)):
+    """
+    Fetch and parse the catalog listing for a subject.
+
+    Args:
+        fetcher: Open fetcher.Fetcher
+        subject: Subject code, e.g. 'MATH'
+        term: Term code
+        base_url: Listing endpoint, overridable for local testing
+        ranges: Course number ranges to request; one page per range
+
+    Returns:
+        List of course blocks sorted by course number, deduplicated
+    """
+    parser = CourseListingParser()
+    for start, end in ranges:
+        response = await fetcher.get(base_url, params=listing_params(subject, term, start, end), kind='listing')
+        if response.status >= 400:
+            raise ValueError(f"Listing for {subject} {start}-{end} returned HTTP {response.status}")
+        parser.feed(response.text)
+    parser.close()
+
+    blocks = {}
+    for block in parser.blocks:
+        if block["subject"] == subject:
+            blocks.setdefault(block["number"], block)
+    return [blocks[number] for number in sorted(blocks)]
+
+
+def subjects_from_catalog(path='data2/gt_courses.csv'):
+    """All subject codes present in the university catalog CSV."""
+    df = pd.read_csv(path, usecols=['code'])
+    return sorted(df['code'].str.split().str[0].unique())
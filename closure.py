@@ -0,0 +1,185 @@
+"""
+Transitive prerequisite closure.
+
+The drawn graph keeps only one edge into each course, so "everything I need
+before MATH 6241" can't be read off it. ClosureIndex precomputes, for every
+course, the set of all its transitive prerequisites (ancestors) and of all
+courses it leads to (descendants) over the full prerequisite relation.
+
+Courses get integer ids in topological order and each set is a bitset (a
+Python int with bit i set for course i), filled in one pass over the DAG:
+a course's ancestors are the union of its direct prerequisites' ancestors.
+The order keeps a course's ancestors near it, and sets are stored shifted
+down to their lowest bit, so memory follows the span of each set rather
+than the size of the catalog.
+Cycles from bad catalog data are collapsed first, so every course in a
+cycle shares the same sets. Membership tests are a single bit test and
+listing a set costs O(popcount).
+
+    index = ClosureIndex.from_edges(net.nodes, prerequisite_edges)
+    index.ancestors('6241')
+    index.requires('6241', '2550')
+"""
+import networkx as nx
+
+
+def _bits(bitset):
+    """Indices of the set bits, lowest first."""
+    while bitset:
+        low = bitset & -bitset
+        yield low.bit_length() - 1
+        bitset ^= low
+
+
+def _locality_order(condensed, seeds):
+    """
+    Topological order of the condensed DAG that keeps each component's
+    ancestors close before it: a DFS over predecessors, emitting in
+    postorder, started from components in catalog order. Courses of one
+    subject then sit together, which keeps the stored bitsets short.
+    """
+    order = []
+    done = set()
+    for seed in seeds:
+        if seed in done:
+            continue
+        done.add(seed)
+        stack = [(seed, iter(condensed.predecessors(seed)))]
+        while stack:
+            component, parents = stack[-1]
+            for parent in parents:
+                if parent not in done:
+                    done.add(parent)
+                    stack.append((parent, iter(condensed.predecessors(parent))))
+                    break
+            else:
+                order.append(component)
+                stack.pop()
+    return order
+
+
+def _pack(bitset):
+    """(lowest set bit, bitset shifted down by it); Python ints store every bit below the highest."""
+    if not bitset:
+        return 0, 0
+    low = (bitset & -bitset).bit_length() - 1
+    return low, bitset >> low
+
+
+class ClosureIndex:
+    def __init__(self, ids, ancestors, descendants, cycles=()):
+        self.ids = ids
+        # Groups of courses that (through bad data) are prerequisites of each other
+        self.cycles = list(cycles)
+        self.index = {node: i for i, node in enumerate(ids)}
+        # Packed (offset, bits) pairs, see _pack
+        self._ancestors = ancestors
+        self._descendants = descendants
+
+    @classmethod
+    def from_edges(cls, nodes, edges):
+        """
+        Build the index.
+
+        Args:
+            nodes: Every course id
+            edges: (prerequisite, course) pairs; pairs with an unknown end are ignored
+        """
+        graph = nx.DiGraph()
+        graph.add_nodes_from(nodes)
+        graph.add_edges_from((u, v) for u, v in edges if u in graph and v in graph and u != v)
+
+        # One component per cycle (or single course), in topological order
+        condensed = nx.condensation(graph)
+        mapping = condensed.graph['mapping']
+        order = _locality_order(condensed, (mapping[node] for node in graph.nodes))
+        ids = []
+        cycles = []
+        component_bits = {}
+        for component in order:
+            members = sorted(condensed.nodes[component]['members'], key=str)
+            if len(members) > 1:
+                cycles.append(members)
+            component_bits[component] = ((1 << len(members)) - 1) << len(ids)
+            ids.extend(members)
+
+        # A cycle's members are each other's ancestors and descendants.
+        # Sets are kept packed and only expanded while being combined.
+        up = {}
+        for component in order:
+            bits = component_bits[component] if component_bits[component].bit_count() > 1 else 0
+            for parent in condensed.predecessors(component):
+                low, packed = up[parent]
+                bits |= (packed << low) | component_bits[parent]
+            up[component] = _pack(bits)
+        down = {}
+        for component in reversed(order):
+            bits = component_bits[component] if component_bits[component].bit_count() > 1 else 0
+            for child in condensed.successors(component):
+                low, packed = down[child]
+                bits |= (packed << low) | component_bits[child]
+            down[component] = _pack(bits)
+
+        ancestors = [None] * len(ids)
+        descendants = [None] * len(ids)
+        for component in order:
+            for i in _bits(component_bits[component]):
+                if component_bits[component].bit_count() > 1:
+                    # A course is not its own prerequisite, even inside a cycle
+                    low, packed = up[component]
+                    ancestors[i] = _pack((packed << low) & ~(1 << i))
+                    low, packed = down[component]
+                    descendants[i] = _pack((packed << low) & ~(1 << i))
+                else:
+                    ancestors[i] = up[component]
+                    descendants[i] = down[component]
+        return cls(ids, ancestors, descendants, cycles)
+
+    def ancestor_bits(self, node):
+        """Bitset (by position in ids) of every course needed before node."""
+        low, packed = self._ancestors[self.index[node]]
+        return packed << low
+
+    def descendant_bits(self, node):
+        """Bitset (by position in ids) of every course node leads to."""
+        low, packed = self._descendants[self.index[node]]
+        return packed << low
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def ancestors(self, node):
+        """Every course needed before node, in topological order."""
+        low, packed = self._ancestors[self.index[node]]
+        return [self.ids[i + low] for i in _bits(packed)]
+
+    def descendants(self, node):
+        """Every course node leads to, in topological order."""
+        low, packed = self._descendants[self.index[node]]
+        return [self.ids[i + low] for i in _bits(packed)]
+
+    def requires(self, course, prereq):
+        """True if prereq is a direct or indirect prerequisite of course."""
+        low, packed = self._ancestors[self.index[course]]
+        position = self.index[prereq] - low
+        return position >= 0 and bool(packed >> position & 1)
+
+    def ancestor_count(self, node):
+        return self._ancestors[self.index[node]][1].bit_count()
+
+    def descendant_count(self, node):
+        return self._descendants[self.index[node]][1].bit_count()
+
+    def export(self):
+        """
+        Compact JSON-able form for the page: ids in topological order and, per
+        course, the ids of its ancestors. The viewer derives descendants by
+        inverting the lists once.
+        """
+        return {
+            'ids': [str(node) for node in self.ids],
+            'ancestors': [[i + low for i in _bits(packed)] for low, packed in self._ancestors],
+        }
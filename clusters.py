@@ -0,0 +1,76 @@
+"""
+Level-of-detail clusters for large network pages.
+
+With the whole-university catalog the page would otherwise hand vis.js
+thousands of nodes and edges at once. Instead, courses are grouped by
+department and level (the first digit of the number, as in color_map), and
+the page starts with one node per group. Membership and each cluster's
+position (the centroid of its laid-out members) are computed here at build
+time and embedded as lodClusters; lod.js shows a cluster's courses when it
+is clicked or zoomed into, and folds them back when zooming out.
+"""
+import math
+from collections import defaultdict
+
+# Graphs with more nodes than this are clustered unless asked otherwise
+AUTO_THRESHOLD = 300
+
+# vis.js scales (canvas pixels per layout unit) at which clusters in view
+# expand, and below which expanded clusters collapse again
+EXPAND_SCALE = 0.35
+COLLAPSE_SCALE = 0.2
+
+
+def cluster_key(node):
+    """(department, level) for 'MATH 1552' or, on single-subject pages, ('', '1') for '1552'."""
+    parts = str(node).split()
+    number = parts[-1]
+    department = parts[0] if len(parts) > 1 else ''
+    return department, number[:1]
+
+
+def level_clusters(net, min_size=2):
+    """
+    Cluster export for a laid-out CompactGraph.
+
+    Courses whose group has fewer than min_size members stay on their own.
+
+    Returns:
+        {'clusters': [{'id', 'label', 'members', 'x', 'y', 'color', 'size'}, ...],
+         'expandScale', 'collapseScale'}
+    """
+    groups = defaultdict(list)
+    for i, node in enumerate(net.nodes):
+        groups[cluster_key(node)].append(i)
+
+    xs = net.columns.get('x')
+    ys = net.columns.get('y')
+    colors = net.columns.get('color') or [None] * net.number_of_nodes()
+    clusters = []
+    for (department, level), members in sorted(groups.items()):
+        if len(members) < min_size:
+            continue
+        name = f"{department} {level}xxx".strip()
+        cluster = {
+            'id': f'cluster:{name}',
+            'label': f'{name} ({len(members)})',
+            'members': [net.nodes[i] for i in members],
+            'color': colors[members[0]] or '#CCCCCC',
+            'size': round(10 + 4 * math.sqrt(len(members))),
+        }
+        if xs is not None and ys is not None:
+            cluster['x'] = round(sum(xs[i] for i in members) / len(members), 1)
+            cluster['y'] = round(sum(ys[i] for i in members) / len(members), 1)
+        clusters.append(cluster)
+    return {'clusters': clusters, 'expandScale': EXPAND_SCALE, 'collapseScale': COLLAPSE_SCALE}
+
+
+def page_clusters(net, mode='auto'):
+    """
+    level_clusters export for a page, or None to draw every course.
+
+    mode is 'on', 'off', or 'auto' to cluster graphs over AUTO_THRESHOLD courses.
+    """
+    if mode == 'on' or (mode == 'auto' and net.number_of_nodes() > AUTO_THRESHOLD):
+        return level_clusters(net)
+    return None
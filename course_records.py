@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Typed on-disk format for course records.
+
+Course records are stored as Parquet with real list<string> columns for
+prerequisites, must_have_prereqs, optional_prereqs, terms and professors,
+and a schema version in the file metadata. The scraper writes them once;
+add_historical_info and gen_network read them back as Arrow-backed columns,
+with no per-row string evaluation.
+
+Older CSV files, where list columns are repr'd Python lists or multi-line
+numpy array reprs, can still be loaded (parsed once, column by column) or
+converted:
+
+    python course_records.py convert data2/gt_MATH_courses.csv data2/gt_MATH_courses.parquet
+"""
+import ast
+import os
+import re
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SCHEMA_VERSION = 1
+VERSION_KEY = b'course_records_version'
+
+# Columns that hold lists of strings, in both the scraper schema and the
+# math website snapshot (gt_math_courses_20250121_034050.csv)
+LIST_COLUMNS = [
+    'prerequisites', 'must_have_prereqs', 'optional_prereqs', 'terms', 'professors',
+    'must_have_prerequisites_array', 'optional_prerequisites_array',
+]
+
+STRING_LIST = pa.list_(pa.string())
+
+_QUOTED = re.compile(r"'((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"")
+
+
+def parse_legacy_list(value):
+    """
+    Parse a list cell from an old CSV: a Python list repr, a numpy array repr
+    (space separated, possibly spanning lines) or empty/NaN.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return []
+    # Pull out each quoted literal; works for both reprs, which differ only in separators
+    return [ast.literal_eval(match.group(0)) for match in _QUOTED.finditer(value)]
+
+
+def _string_list(value):
+    """
+    A list cell as a list of strings. Arrays are converted, strings are read
+    as legacy list reprs (so a message such as "No prerequisites found"
+    becomes []), and missing values become [].
+    """
+    if isinstance(value, str):
+        return parse_legacy_list(value)
+    if hasattr(value, 'tolist') and not isinstance(value, (list, tuple)):
+        value = value.tolist()
+    if not isinstance(value, (list, tuple)):
+        return []
+    return [str(item) for item in value]
+
+
+def _to_table(df):
+    # List columns are normalized before Arrow sees them; a column mixing
+    # strings and lists can't be converted as is
+    lists = {column: [_string_list(v) for v in df[column].tolist()]
+             for column in LIST_COLUMNS if column in df.columns}
+    table = pa.Table.from_pandas(df.drop(columns=list(lists)), preserve_index=False)
+    for column, values in lists.items():
+        table = table.add_column(df.columns.get_loc(column), pa.field(column, STRING_LIST),
+                                 pa.array(values, type=STRING_LIST))
+    metadata = dict(table.schema.metadata or {})
+    metadata[VERSION_KEY] = str(SCHEMA_VERSION).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def write_records(records, path):
+    """
+    Write course records (a DataFrame or a list of dicts) to Parquet, or to
+    CSV if path ends in .csv.
+    """
+    df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+    if path.endswith('.csv'):
+        df.to_csv(path, index=False)
+        return
+    pq.write_table(_to_table(df), path)
+
+
+def _list_types(arrow_type):
+    # List columns stay Arrow-backed; scalars use pandas' default dtypes
+    return pd.ArrowDtype(arrow_type) if pa.types.is_list(arrow_type) else None
+
+
+def read_records(path, columns=None):
+    """
+    Read course records.
+
+    Parquet files are read with list columns kept Arrow-backed, so they are
+    not copied into Python objects until a row is accessed. CSV files are the
+    legacy format; their list columns are parsed once here.
+    """
+    if path.endswith('.csv'):
+        df = pd.read_csv(path, usecols=columns)
+        for column in LIST_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].map(parse_legacy_list)
+        return df
+
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    version = int((table.schema.metadata or {}).get(VERSION_KEY, b'0'))
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"{path} has course record schema v{version}; "
+                         f"this code reads up to v{SCHEMA_VERSION}")
+    return table.to_pandas(types_mapper=_list_types)
+
+
+def records_path(stem):
+    """Prefer the typed file for a data stem like 'data2/gt_MATH_courses'."""
+    parquet_path = stem + '.parquet'
+    return parquet_path if os.path.exists(parquet_path) else stem + '.csv'
+
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[1] != 'convert':
+        print("Usage: python course_records.py convert <in.csv> <out.parquet>")
+        sys.exit(1)
+    write_records(read_records(sys.argv[2]), sys.argv[3])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Choosing which prerequisite edges to draw.
+
+Every course's prerequisites form a DAG (must-have prerequisites, or the
+optional ones when it has none). Drawing all of them is unreadable, so the
+drawn edges are its transitive reduction: a prerequisite is dropped if it is
+already required by another of the course's prerequisites (MATH 1551 is not
+drawn into MATH 2551 when MATH 1552 is). The reduction uses the ancestor
+bitsets of closure.ClosureIndex, so it is one OR and one bit test per edge.
+
+Catalog data has a few cycles (courses listed as each other's
+prerequisites). They are reported and broken by dropping the edges that go
+from a higher course number to a lower one.
+
+What remains can still be more than one edge into a course. EdgeRules says
+how many to keep and in which order; the defaults keep one, preferring
+prerequisites that are not demoted and whose number is below the course's,
+then the highest number. Per-subject rules (e.g. MATH courses for other
+majors, which shouldn't be drawn as the way into the math sequence) are read
+from edge_rules.json:
+
+    {"MATH": {"demote": ["3215", "3670"], "max_parents": 1}}
+"""
+import json
+import logging
+import os
+import re
+from typing import NamedTuple, Optional
+
+from closure import ClosureIndex
+
+RULES_PATH = 'edge_rules.json'
+
+logger = logging.getLogger(__name__)
+
+_NUMBER_PATTERN = re.compile(r'\d+')
+
+
+class EdgeRules(NamedTuple):
+    # Prerequisites only drawn when nothing else qualifies
+    demote: frozenset = frozenset()
+    # Edges kept into each course after the reduction; None keeps all
+    max_parents: Optional[int] = 1
+
+
+def load_edge_rules(subject=None, path=RULES_PATH):
+    """EdgeRules for a subject from the rules file, or the defaults."""
+    if subject is None or not os.path.exists(path):
+        return EdgeRules()
+    with open(path) as f:
+        config = json.load(f).get(subject, {})
+    return EdgeRules(demote=frozenset(config.get('demote', ())),
+                     max_parents=config.get('max_parents', 1))
+
+
+def course_number(key):
+    """Numeric part of a node id: '2010R' -> 2010, 'CS 1332' -> 1332."""
+    match = _NUMBER_PATTERN.search(str(key).split(' ')[-1])
+    return int(match.group()) if match else -1
+
+
+def break_cycles(nodes, edges):
+    """
+    Drop edges inside prerequisite cycles that point from a higher course
+    number to a lower one (or equal, which can only be bad data).
+
+    Returns:
+        (acyclic edges, list of cycles found)
+    """
+    index = ClosureIndex.from_edges(nodes, edges)
+    if not index.cycles:
+        return edges, []
+    # Mostly cross-listed courses naming each other; details at debug level
+    logger.warning("Breaking %d prerequisite cycles", len(index.cycles))
+    component = {}
+    for i, members in enumerate(index.cycles):
+        logger.debug("Prerequisite cycle: %s", ' -> '.join(map(str, members)))
+        for member in members:
+            component[member] = i
+    kept = [(u, v) for u, v in edges
+            if component.get(u) is None or component.get(u) != component.get(v)
+            or course_number(u) < course_number(v)]
+    return kept, index.cycles
+
+
+def transitive_reduction(nodes, edges, weak=frozenset()):
+    """
+    Edges (u, v) of a DAG for which no other prerequisite of v already requires u.
+
+    Prerequisites in weak don't make others redundant, so a demoted course
+    never hides the edge from a course it requires itself.
+    """
+    index = ClosureIndex.from_edges(nodes, edges)
+    parents = {}
+    for u, v in edges:
+        parents.setdefault(v, []).append(u)
+
+    reduced = []
+    for v, prereqs in parents.items():
+        implied = 0
+        for u in prereqs:
+            if u not in weak:
+                implied |= index.ancestor_bits(u)
+        reduced.extend((u, v) for u in prereqs if not implied >> index.index[u] & 1)
+    return reduced
+
+
+def priority(prereq, course, rules):
+    """Sort key; lower is drawn first."""
+    number = course_number(prereq)
+    return (prereq in rules.demote, number >= course_number(course), -number, str(prereq))
+
+
+def select_edges(nodes, candidates, rules=EdgeRules()):
+    """
+    Edges to draw.
+
+    Args:
+        nodes: Node ids in the graph
+        candidates: (prerequisite, course) pairs the course actually requires
+        rules: EdgeRules
+
+    Returns:
+        List of (prerequisite, course) edges
+    """
+    nodes = list(nodes)
+    edges = list(dict.fromkeys((u, v) for u, v in candidates if u != v))
+    edges, _ = break_cycles(nodes, edges)
+    reduced = transitive_reduction(nodes, edges, rules.demote)
+
+    parents = {}
+    for u, v in reduced:
+        parents.setdefault(v, []).append(u)
+    selected = []
+    for v, prereqs in parents.items():
+        prereqs.sort(key=lambda u: priority(u, v, rules))
+        keep = prereqs if rules.max_parents is None else prereqs[:rules.max_parents]
+        selected.extend((u, v) for u in keep)
+    return selected
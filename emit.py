@@ -0,0 +1,124 @@
+"""
+Writes a network page in one pass.
+
+The page is streamed straight from the graph: the vis-network includes, the
+node and edge records as minified JSON, the interaction options, optionally
+the closure index export, the level-of-detail clusters with their script
+(lod.js), the viewer script (viewer.js), and the search index with the
+search box (search.js). Keys are
+sorted and records are written in graph order, so an unchanged graph gives a
+byte-identical file.
+"""
+import json
+import os
+
+from graph_core import as_compact
+from tooltips import sidecar_dir
+
+VIEWER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'viewer.js')
+LOD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lod.js')
+SEARCH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'search.js')
+
+VIS_CSS = ('https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/dist/vis-network.min.css',
+           'sha512-WgxfT5LWjfszlPHXRmBWHkV2eceiWTOBvrKCNbdgDYTHrT2AeLCGbF4sZlZw3UMN3WtL0tGUoIAKsu8mllg/XA==')
+VIS_JS = ('https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/vis-network.min.js',
+          'sha512-LnvoEWDFrqGHlHmDD2101OrLcbsfkrzoSpvtSQtxK3RMnRV0eOkhhBN2dXHKRrUU8p2DGRTk35n4O8nWSVe1mQ==')
+
+# Positions are computed at build time (layout.py), so no simulation runs on load
+PAGE_OPTIONS = {
+    "physics": {"enabled": False},
+    "edges": {"smooth": {"type": "cubicBezier", "forceDirection": "vertical", "roundness": 0.4}},
+    "nodes": {"font": {"size": 25}},
+    "interaction": {"hover": True, "tooltipDelay": 50},
+}
+
+HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="{css}" integrity="{css_hash}" crossorigin="anonymous" referrerpolicy="no-referrer" />
+<script src="{js}" integrity="{js_hash}" crossorigin="anonymous" referrerpolicy="no-referrer"></script>
+<style type="text/css">
+html, body {{ margin: 0; padding: 0; }}
+#mynetwork {{ width: 100vw; height: 100vh; background-color: #ffffff; }}
+</style>
+</head>
+<body>
+<div id="mynetwork"></div>
+<script type="text/javascript">
+"""
+
+TAIL = """</script>
+</body>
+</html>
+"""
+
+
+def to_json(value):
+    """Minified, key-sorted JSON that is safe inside a <script> element."""
+    text = json.dumps(value, sort_keys=True, separators=(',', ':'))
+    # Tooltip HTML would otherwise be able to close the script tag
+    return text.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+
+
+def _write_records(f, records):
+    f.write('[')
+    for i, record in enumerate(records):
+        if i:
+            f.write(',')
+        f.write(to_json(record))
+    f.write(']')
+
+
+def _read_script(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def write_page(net, out_path, closure=None, title=None, options=PAGE_OPTIONS, clusters=None, search=None):
+    """
+    Write the page for a laid-out graph.
+
+    Args:
+        net: CompactGraph (or networkx.DiGraph) whose nodes carry x/y
+        out_path: Output HTML file; tooltips are fetched from sidecar_dir(out_path)
+        closure: Optional ClosureIndex to embed as prereqClosure
+        title: Page title; defaults to the file name
+        options: vis-network options
+        clusters: Optional clusters.level_clusters export; the page then starts collapsed
+        search: Optional search_index.build_search_index export; adds the search box
+    """
+    net = as_compact(net)
+    if title is None:
+        title = os.path.splitext(os.path.basename(out_path))[0]
+    viewer = _read_script(VIEWER_PATH)
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(HEAD.format(title=title, css=VIS_CSS[0], css_hash=VIS_CSS[1], js=VIS_JS[0], js_hash=VIS_JS[1]))
+        f.write('var nodes = new vis.DataSet(')
+        _write_records(f, net.vis_nodes())
+        f.write(');\nvar edges = new vis.DataSet(')
+        _write_records(f, net.vis_edges())
+        f.write(');\nvar options = ' + to_json(options) + ';\n')
+        f.write('var tooltipBase = ' + to_json(os.path.basename(sidecar_dir(out_path))) + ';\n')
+        if closure is not None:
+            f.write('var prereqClosure = ' + to_json(closure.export()) + ';\n')
+        if clusters is None:
+            f.write("var network = new vis.Network(document.getElementById('mynetwork'), "
+                    "{nodes: nodes, edges: edges}, options);\n\n")
+        else:
+            f.write('var lodClusters = ' + to_json(clusters) + ';\n')
+            f.write(_read_script(LOD_PATH))
+            f.write("\nvar lod = levelOfDetail(nodes, edges, lodClusters);\n"
+                    "var network = new vis.Network(document.getElementById('mynetwork'), "
+                    "{nodes: lod.nodes, edges: lod.edges}, options);\n"
+                    "lod.attach(network);\n\n")
+        f.write(viewer)
+        if search is not None:
+            f.write('\nvar searchIndex = ' + to_json(search) + ';\n')
+            f.write(_read_script(SEARCH_PATH))
+        f.write(TAIL)
+    # Readers never see a half-written page
+    os.replace(tmp_path, out_path)
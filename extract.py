@@ -0,0 +1,227 @@
+"""
+Extraction of the title and detail cells from OSCAR course detail pages.
+
+scrape_course only needs two cells of each page: the first td.nttitle (course
+title) and the first td.ntdefault (description, hours, prerequisites). Every
+backend here returns the text nodes of those two cells, in document order,
+exactly as BeautifulSoup's get_text() would see them (script and style text
+left out), so records built from any backend are identical.
+
+On broken markup the backends follow HTML's implied end tags, as a browser
+does: a cell ends at its </td>, at the next <td>, <th> or <tr> of its own
+table, or when that table ends; tables nested inside the cell are part of
+it. libxml2 does this while parsing; the stream parser tracks it itself,
+and the bs4 path (whose html.parser builder nests an unclosed cell around
+the following ones) stops reading the cell where the implied end falls.
+
+Backends:
+    lxml   - libxml2 parser plus one XPath per cell; fastest, needs lxml
+    stream - stdlib HTMLParser that keeps only the two cells' text and stops
+             as soon as both are closed; no tree is built
+    bs4    - the original BeautifulSoup html.parser path, kept as the fallback
+             and as the reference the other backends are checked against
+
+Run `python3 extract.py fixtures/oscar` to check that every available backend
+produces the same records as bs4 on the saved pages and to time them;
+tests/test_extract.py runs the same check, plus fixtures/extract's broken
+pages, under pytest.
+"""
+from html.parser import HTMLParser
+from typing import NamedTuple, Optional
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+
+class Cells(NamedTuple):
+    title: Optional[list]
+    desc: Optional[list]
+
+
+def _has_class(attrs, name):
+    for key, value in attrs:
+        if key == 'class' and value and name in value.split():
+            return True
+    return False
+
+
+# Start tags that end an open cell unless they are inside a table nested in it
+_IMPLIED_CLOSERS = {'td', 'th', 'tr', 'tbody', 'thead', 'tfoot'}
+
+
+def _in_nested_table(element, cell):
+    for parent in element.parents:
+        if parent is cell:
+            return False
+        if parent.name == 'table':
+            return True
+    return False
+
+
+def _bs4_cell_strings(cell):
+    """cell.strings, up to the first row or cell that would implicitly close it."""
+    strings = {id(string) for string in cell.strings}
+    found = []
+    for element in cell.descendants:
+        if element.name in _IMPLIED_CLOSERS and not _in_nested_table(element, cell):
+            break
+        if id(element) in strings:
+            found.append(str(element))
+    return found
+
+
+def extract_bs4(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    title_element = soup.find('td', class_='nttitle')
+    desc_element = soup.find('td', class_='ntdefault')
+    return Cells(
+        [''.join(_bs4_cell_strings(title_element))] if title_element else None,
+        _bs4_cell_strings(desc_element) if desc_element else None,
+    )
+
+
+_TITLE_XPATH = '//td[contains(concat(" ", normalize-space(@class), " "), " nttitle ")][1]'
+_DESC_XPATH = '//td[contains(concat(" ", normalize-space(@class), " "), " ntdefault ")][1]'
+_TEXT_XPATH = './/text()[not(ancestor::script) and not(ancestor::style)]'
+
+
+def extract_lxml(html):
+    tree = lxml.html.document_fromstring(html.encode('utf-8'),
+                                         parser=lxml.html.HTMLParser(encoding='utf-8'))
+    cells = []
+    for xpath in (_TITLE_XPATH, _DESC_XPATH):
+        found = tree.xpath(xpath)
+        cells.append([str(text) for text in found[0].xpath(_TEXT_XPATH)] if found else None)
+    return Cells(*cells)
+
+
+class _Done(Exception):
+    pass
+
+
+class _CellParser(HTMLParser):
+    # End tags that close the open cell, outside tables nested in it
+    CLOSERS = {'td', 'tr', 'tbody', 'thead', 'tfoot', 'table', 'body', 'html'}
+
+    def __init__(self):
+        super().__init__()
+        self.found = {}
+        self._cell = None
+        # Tables opened inside the cell and not yet closed
+        self._tables = 0
+        self._skip = 0
+
+    def _close(self):
+        self._cell = None
+        self._skip = 0
+        if len(self.found) == 2:
+            raise _Done
+
+    def handle_starttag(self, tag, attrs):
+        if self._cell:
+            if tag == 'table':
+                self._tables += 1
+                return
+            if tag in ('script', 'style'):
+                self._skip += 1
+                return
+            if self._tables or tag not in _IMPLIED_CLOSERS:
+                return
+            # A new row or cell of the same table ends this one, and may be the other cell
+            self._close()
+        if tag == 'td':
+            for name in ('nttitle', 'ntdefault'):
+                if name not in self.found and _has_class(attrs, name):
+                    self._cell = name
+                    self._tables = 0
+                    self.found[name] = []
+                    return
+
+    def handle_endtag(self, tag):
+        if not self._cell:
+            return
+        if tag in ('script', 'style'):
+            self._skip = max(0, self._skip - 1)
+        elif self._tables:
+            if tag == 'table':
+                self._tables -= 1
+        elif tag in self.CLOSERS:
+            self._close()
+
+    def handle_data(self, data):
+        if self._cell and not self._skip:
+            self.found[self._cell].append(data)
+
+
+def extract_stream(html):
+    parser = _CellParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _Done:
+        pass
+    title = parser.found.get('nttitle')
+    return Cells([''.join(title)] if title is not None else None, parser.found.get('ntdefault'))
+
+
+BACKENDS = {
+    'lxml': extract_lxml,
+    'stream': extract_stream,
+    'bs4': extract_bs4,
+}
+
+DEFAULT_BACKEND = 'lxml' if lxml is not None else 'stream'
+
+
+def available_backends():
+    return [name for name in BACKENDS if name != 'lxml' or lxml is not None]
+
+
+def extract_cells(html, backend=None):
+    """
+    Pull the title and detail cells out of a course detail page.
+
+    Args:
+        html: Raw page HTML
+        backend: 'lxml', 'stream' or 'bs4'; defaults to the fastest available
+
+    Returns:
+        Cells(title, desc) where each is a list of text nodes, or None if the
+        cell is missing
+    """
+    return BACKENDS[backend or DEFAULT_BACKEND](html)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import time
+
+    from scraper import parse_course_page
+
+    if len(sys.argv) < 2:
+        print("Usage: python extract.py <fixture_dir>")
+        sys.exit(1)
+
+    fixture_dir = sys.argv[1]
+    pages = {}
+    for name in sorted(os.listdir(fixture_dir)):
+        if name.endswith('.html'):
+            with open(os.path.join(fixture_dir, name), encoding='utf-8') as f:
+                pages[name] = f.read()
+
+    reference = {name: parse_course_page(html, backend='bs4') for name, html in pages.items()}
+    failed = False
+    for backend in available_backends():
+        start = time.perf_counter()
+        records = {name: parse_course_page(html, backend=backend) for name, html in pages.items()}
+        elapsed = time.perf_counter() - start
+        mismatches = [name for name in pages if repr(records[name]) != repr(reference[name])]
+        failed = failed or bool(mismatches)
+        print(f"{backend:>6}: {len(pages)} pages, {elapsed / max(len(pages), 1) * 1e6:.0f} us/page, "
+              f"{len(mismatches)} mismatches {mismatches[:5] if mismatches else ''}")
+    sys.exit(1 if failed else 0)
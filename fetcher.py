@@ -0,0 +1,186 @@
+"""
+Async fetch engine used by the scraper.
+
+All requests go through one aiohttp session, so connections to OSCAR are kept
+alive and reused instead of doing a TLS handshake per course. The number of
+requests in flight is controlled by an AdaptiveLimiter: it grows slowly while
+responses come back quickly and halves when the server answers 429/5xx or
+times out. Failed requests are retried a bounded number of times with
+exponential backoff and full jitter. If given a telemetry.Telemetry, every
+attempt, retry and queue wait is recorded there.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import NamedTuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying; everything else is returned to the caller as is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """Raised when a request still fails after all retries."""
+
+
+class Response(NamedTuple):
+    url: str
+    status: int
+    text: str
+    headers: dict
+    attempts: int
+    elapsed: float
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit.
+
+    Every healthy response (no error, latency under target_latency) grows the
+    limit by 1/limit, i.e. roughly one extra slot per round of requests. An
+    overloaded response halves it, at most once per cooldown seconds so a burst
+    of failures from the same window only counts once.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32, target_latency=1.5, cooldown=1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.waiting = 0
+        self._last_backoff = 0.0
+        self._cond = None
+
+    def _condition(self):
+        # Created lazily so the limiter can be built outside a running loop
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def acquire(self):
+        cond = self._condition()
+        async with cond:
+            self.waiting += 1
+            try:
+                await cond.wait_for(lambda: self.in_flight < int(self.limit))
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+    async def release(self, latency, overloaded=False):
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if overloaded:
+                if now - self._last_backoff >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_backoff = now
+                    logger.info("Backing off, concurrency limit now %d", int(self.limit))
+            elif latency <= self.target_latency:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            cond.notify_all()
+
+
+def backoff_delay(attempt, base_delay=0.5, max_delay=30.0, retry_after=None):
+    """Full-jitter exponential backoff, honouring a Retry-After header if given."""
+    if retry_after is not None:
+        try:
+            return min(max_delay, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+class Fetcher:
+    """
+    Shared-session HTTP client.
+
+    Usage:
+        async with Fetcher() as fetcher:
+            response = await fetcher.get(url, params={...})
+    """
+
+    def __init__(self, limiter=None, max_retries=3, timeout=20, base_delay=0.5,
+                 max_connections=32, headers=None, telemetry=None):
+        self.limiter = limiter or AdaptiveLimiter(maximum=max_connections)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_connections = max_connections
+        self.headers = headers or {}
+        self.telemetry = telemetry
+        self._session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=self.headers,
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+        self._session = None
+
+    async def get(self, url, params=None, headers=None, kind='page'):
+        """
+        GET a page, retrying on 429/5xx, timeouts and connection errors.
+
+        kind labels the request in the telemetry (e.g. 'listing', 'course').
+
+        Returns:
+            Response for the first non-retryable answer (including 4xx/304).
+
+        Raises:
+            FetchError if every attempt failed.
+        """
+        telemetry = self.telemetry
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if telemetry:
+                telemetry.observe_queue(self.limiter.waiting, self.limiter.in_flight, int(self.limiter.limit))
+            await self.limiter.acquire()
+            start = time.monotonic()
+            retry_after = None
+            overloaded = False
+            try:
+                async with self._session.get(url, params=params, headers=headers) as resp:
+                    text = await resp.text()
+                    elapsed = time.monotonic() - start
+                    if telemetry:
+                        telemetry.observe_attempt(kind, elapsed, resp.status, len(text.encode('utf-8')))
+                    if resp.status not in RETRY_STATUSES:
+                        if telemetry:
+                            telemetry.observe_request(kind, attempt + 1, ok=True)
+                        return Response(str(resp.url), resp.status, text, dict(resp.headers),
+                                        attempt + 1, elapsed)
+                    retry_after = resp.headers.get('Retry-After')
+                    last_error = f"HTTP {resp.status}"
+                    overloaded = True
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+                overloaded = True
+                if telemetry:
+                    telemetry.observe_attempt(kind, time.monotonic() - start, error=type(e).__name__)
+            finally:
+                # The slot goes back however the attempt ended (decode errors and
+                # cancellation included), or the limiter would run out of slots
+                await self.limiter.release(time.monotonic() - start, overloaded=overloaded)
+
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.base_delay, retry_after=retry_after)
+                logger.debug("Retrying %s in %.2fs (%s)", url, delay, last_error)
+                await asyncio.sleep(delay)
+
+        if telemetry:
+            telemetry.observe_request(kind, self.max_retries + 1, ok=False)
+        raise FetchError(f"{url}: {last_error} after {self.max_retries + 1} attempts")
@@ -1,48 +1,21 @@
+import argparse
+import os
+import time
+
 import pandas as pd
-import networkx as nx
-from pyvis.network import Network
-import ast
-import textwrap
-
-def format_text_with_breaks(text, width=100):
-    if not pd.notna(text):
-        return ""
-    
-    formatted = "" + str(text) if text else ""
-    formatted = formatted.replace('\n', ' ')
-    
-    # Use textwrap to split at word boundaries
-    lines = textwrap.wrap(formatted, width=width, break_long_words=True)
-    # lines = textwrap.fill(formatted, width=width).split('\n')
-    
-    # return '<br/>'.join(lines)
-    return text
-  
-# Read the data
-# df = pd.read_csv('gt_math_courses.csv')
-file_path = 'data2/gt_math_courses.csv'
-df = pd.read_csv(file_path)
-# Filter out special topics courses
-df = df[~df['title'].str.contains('Special Topics', case=False, na=False)]
-df = df[~df['title'].str.contains('Honors', case=False, na=False)]
-
-file_path2 = 'data2/gt_math_courses_20250121_034050.csv'
-df2 = pd.read_csv(file_path2)
-
-less_prio_numbers = []
-if file_path.lower().find('math') != -1:
-  print("Adding less priority to 3215 and 3670 and 2605")
-  less_prio_numbers = ['3215', '3670', '2605','2603', '6221']
-  print("Removing 2406")
-  df = df[~df['title'].str.contains('2406', case=False, na=False)]
-  
-  
-# Extract course numbers and create a mapping of numbers to full titles
-df['number'] = df['title'].str.extract(r'(\d+)')
-title_mapping = df.set_index('number')['title'].to_dict()
-numbers_list = df['number'].unique()
-
-df['course_name'] = df['title'].apply(lambda x: x[x.find('-')+1:].strip() if x.find('-') != -1 else x)
+
+from closure import ClosureIndex
+from clusters import AUTO_THRESHOLD, page_clusters
+from course_records import read_records, records_path
+from edge_selection import EdgeRules, load_edge_rules, select_edges
+from emit import write_page
+from graph_core import CompactGraph
+from layout import apply_layout
+from tooltips import write_tooltip_sidecar
+from prereqs import parse_many, must_have_and_optional
+from search_index import build_search_index
+from snapshot_store import WEBSITE_STORE, as_of, course_keys as snapshot_keys, list_terms
+
 # Define color mapping based on first digit
 color_map = {
     '0': '#FFD700', # gold
@@ -56,163 +29,251 @@ color_map = {
     '8': '#FFFFE0',
 }
 
-# df['class_name'] = df['title'].str[df['title'].str.find('-')+1:]
-
-# Create directed graph
-net = nx.DiGraph()
-# Add nodes with only title as label, colored by first digit
-for index, row in df.iterrows():
-    first_digit = row['number'][0] if row['number'] else None
-    color = color_map.get(first_digit, '#CCCCCC')  # Default gray if no matching first digit
-    
-    # Format description with line breaks using HTML line breaks
-    title = f"<h3>{row['title']}</h3><br/>"
-    desc = row['description'] 
-    formatted_desc = desc.replace('\n', ' ')
-    
-    # Get prerequisites and format them
-    prereqs = ast.literal_eval(row['prerequisites'])
-    prereqs_prefix = "<br/><br/><b>Prerequisites:</b> "
-    prereq_text = str(row['prereq_text']).replace('\n', ' ') if row['prereq_text'] and not pd.isna(row['prereq_text']) else "None"
-    if prereq_text.find("None") != -1:
-      # try getting from df2
-      df2_row = df2[df2['course_number'] == int(row['number'])]
-      if len(df2_row) > 0:
-        prereq_text = str(df2_row['prerequisites_text_raw'].values[0]).replace('\n', ' ') if df2_row['prerequisites_text_raw'].values[0] and not pd.isna(df2_row['prerequisites_text_raw'].values[0]) else "None"
-    prereq_text = prereqs_prefix + prereq_text
-    
+def catalog_path(subject):
+    """Records for a subject, preferring the ones enriched by add_historical_info."""
+    history = f'data2/gt_{subject}_courses_history.parquet'
+    return history if os.path.exists(history) else records_path(f'data2/gt_{subject}_courses')
+
+def load_catalog(file_path):
+    """Read a scraped subject catalog and drop courses that shouldn't be drawn."""
+    df = read_records(file_path)
+    # Filter out special topics courses
+    df = df[~df['title'].str.contains('Special Topics', case=False, na=False)]
+    df = df[~df['title'].str.contains('Honors', case=False, na=False)]
+    if file_path.lower().find('math') != -1:
+        df = df[~df['title'].str.contains('2406', case=False, na=False)]
+    df = df.reset_index(drop=True)
+    if 'must_have_prereqs' not in df.columns:
+        # Scraped before the scraper split prerequisites (data2/gt_cs_courses.csv)
+        split = [must_have_and_optional(tree) for tree in parse_many(df['prereq_text'])]
+        df['must_have_prereqs'] = [must for must, _ in split]
+        df['optional_prereqs'] = [optional for _, optional in split]
+    # Scraped records add_historical_info hasn't seen yet
+    for column in ('professors_str', 'terms_str'):
+        if column not in df.columns:
+            df[column] = ''
+    return df
+
+FALLBACK_STEM = 'data2/gt_math_courses_20250121_034050'
+
+def load_fallback(subject='MATH', store=WEBSITE_STORE):
+    """
+    The math website snapshot used where OSCAR has no prerequisite text: the
+    subject's rows of the latest snapshot in the website store, once it has
+    been ingested there (snapshot_store.py), else the dated CSV.
+    """
+    if list_terms(store):
+        return as_of(None, store, subjects=[subject])
+    return read_records(records_path(FALLBACK_STEM))
+
+def load_university_catalog(file_path='data2/gt_courses.csv'):
+    """
+    Read the whole-university catalog (code, title, credits, description,
+    prerequisites) into the same record columns the scraper produces.
+    """
+    raw = pd.read_csv(file_path)
+    codes = raw['code'].str.split().str.join(' ')
+    prereq_text = raw['prerequisites'].str.replace('\xa0', ' ')
+    trees = parse_many(prereq_text)
+    split = [must_have_and_optional(tree) for tree in trees]
+    return pd.DataFrame({
+        'title': codes + ' - ' + raw['title'],
+        'description': raw['description'].fillna(''),
+        'prerequisites': [[str(course) for course in tree.courses()] if tree else [] for tree in trees],
+        'prereq_text': prereq_text,
+        'must_have_prereqs': [must for must, _ in split],
+        'optional_prereqs': [optional for _, optional in split],
+        'professors_str': '',
+        'terms_str': '',
+    })
+
+def course_keys(df, node_ids):
+    """Node ids for a catalog: bare course numbers ('number') or full codes ('code')."""
+    codes = df['title'].str.split(' - ').str[0].str.strip()
+    if node_ids == 'code':
+        return codes
+    return codes.str.split().str[1]
+
+def prereq_key(prereq, node_ids):
+    return prereq if node_ids == 'code' else prereq.split(' ')[1]
+
+def clean_prereq_text(texts):
+    """str(text) with newlines flattened, or "None" for missing/empty text."""
+    present = texts.notna() & (texts.astype(object) != '')
+    return texts.astype(object).where(present, "None").map(str).str.replace('\n', ' ')
+
+def node_descriptions(df, prereq_text):
+    """Tooltip HTML for every course, built column-wise."""
+    professors = df['professors_str'].map(str).str.replace('\n', ' ').str.split().str.join(' ')
+    terms = (df['terms_str'].map(str).str.replace('\n', ' ').str.replace('<br/>', ' ')
+             .str.split().str.join(' '))
     # Clean up professors and terms strings by removing all line breaks and extra whitespace
-    prof_and_terms = "<br/><br/><i>Professors:</i> " + ' '.join(str(row['professors_str']).replace('\n', ' ').split()) + "<br/><i>Last taught in:</i> " + ' '.join(str(row['terms_str']).replace('\n', ' ').replace('<br/>', ' ').split())
-    
-    # Split text into chunks of 80 chars and join with <br/>
-    title_with_breaks = format_text_with_breaks(title)
-    desc_with_breaks = format_text_with_breaks(formatted_desc)
-    prereq_with_breaks = format_text_with_breaks(prereq_text)
-    prof_and_terms_with_breaks = format_text_with_breaks(prof_and_terms)
-    full_text = f"<div>{title_with_breaks}{desc_with_breaks}{prereq_with_breaks}{prof_and_terms_with_breaks}</div>"
-    
-    net.add_node(row['number'],
-                # title=full_text,  # Show description and prerequisites on hover
-                desc=full_text,
-                label=row['course_name'],  # Only show title, not number
-                color=color)
-
-def get_prereq_edge(prereqs, course_number, numbers_list):
-    """Get highest prerequisite edge for a course.
-    
+    return ("<div><h3>" + df['title'] + "</h3><br/>"
+            + df['description'].str.replace('\n', ' ')
+            + "<br/><br/><b>Prerequisites:</b> " + prereq_text
+            + "<br/><br/><i>Professors:</i> " + professors
+            + "<br/><i>Last taught in:</i> " + terms
+            + "</div>")
+
+def merge_fallback(df, fallback, numbers):
+    """
+    Attach the fallback snapshot (math website CSV) to the primary catalog in
+    one indexed join on (subject, course number), so on a multi-subject
+    catalog CS 1332 doesn't pick up MATH 1332's prerequisites.
+
+    Returns:
+        DataFrame aligned with df with columns found, text, must, optional
+    """
+    merged = pd.DataFrame({'found': False, 'text': None, 'must': None, 'optional': None},
+                          index=df.index).astype({'text': object, 'must': object, 'optional': object})
+    if fallback is None:
+        return merged
+    fallback = fallback.assign(key=[f'{subject} {int(number)}' for subject, number in snapshot_keys(fallback)])
+    fallback = fallback.drop_duplicates('key').set_index('key')
+    subjects = df['title'].str.split().str[0]
+    numbers = pd.to_numeric(numbers, errors='coerce').astype('Int64').astype(str)
+    joined = fallback.reindex((subjects + ' ' + numbers).to_numpy())
+    merged['found'] = joined.index.isin(fallback.index)
+    merged['text'] = joined['prerequisites_text_raw'].astype(object).to_numpy()
+    merged['must'] = joined['must_have_prerequisites_array'].astype(object).to_numpy()
+    merged['optional'] = joined['optional_prerequisites_array'].astype(object).to_numpy()
+    return merged
+
+def candidate_edges(keys, prereq_lists, node_keys, node_ids='number'):
+    """
+    (prerequisite, course) pairs to choose drawn edges from: for each course,
+    the first of its lists (must-have, optional, then the fallback's) that
+    names another course in the graph.
+    """
+    edges = []
+    for key, *lists in zip(keys, *prereq_lists):
+        for prereqs in lists:
+            # Missing fallback rows come through the join as NaN
+            if not hasattr(prereqs, '__len__'):
+                continue
+            found = [prereq_key(prereq, node_ids) for prereq in prereqs]
+            found = [prereq for prereq in found if prereq in node_keys and prereq != key]
+            if found:
+                edges.extend((prereq, key) for prereq in found)
+                break
+    return edges
+
+def build_graph(catalog, fallback=None, rules=None, node_ids=None):
+    """
+    Build the prerequisite graph for a catalog.
+
     Args:
-        prereqs: List of prerequisites
-        course_number: Course number to find prereqs for
-        numbers_list: List of valid course numbers
-        
+        catalog: Course records (title, description, prereq_text, must_have_prereqs,
+            optional_prereqs, professors_str, terms_str)
+        fallback: Optional snapshot keyed by course_number with prerequisites_text_raw,
+            must_have_prerequisites_array and optional_prerequisites_array, consulted
+            when the catalog has no prerequisite text or edge for a course
+        rules: EdgeRules (demoted courses, edges per course); defaults to
+            one edge into each course
+        node_ids: 'number' (single subject) or 'code' (several subjects);
+            defaults to 'number' when the catalog has one subject
+
     Returns:
-        Tuple of (prereq_num, course_number) or None if no valid prereq found
+        CompactGraph with desc/label/color node columns (and code/description/
+        professors for the search index) and the edges chosen
+        by edge_selection.select_edges (.to_networkx() for a DiGraph)
     """
-    max_prereq = None
-    max_prereq_num = -1
-    alternate_prereq = -1
-    
-    for prereq in prereqs:
-        prereq_num = prereq.split(' ')[1]
-        # Check if prereq exists in our course list before adding edge
-        if prereq_num in numbers_list:  # Ensure prereq exists in our course list
-            try:
-                prereq_int = int(prereq_num)
-                if prereq_int > max_prereq_num and prereq_int < int(course_number) and prereq_int != int(course_number) and str(prereq_int) not in less_prio_numbers:
-                    max_prereq_num = prereq_int
-                    max_prereq = prereq_num
-                elif prereq_int > alternate_prereq and prereq_int != int(course_number):
-                    alternate_prereq = prereq_int
-            except ValueError:
+    df = catalog.reset_index(drop=True)
+    if node_ids is None:
+        subjects = df['title'].str.split().str[0].unique()
+        node_ids = 'number' if len(subjects) <= 1 else 'code'
+    keys = course_keys(df, node_ids)
+    numbers = df['title'].str.extract(r'(?P<number>\d+)')['number']
+    node_keys = set(keys)
+    fallback = merge_fallback(df, fallback, numbers)
+
+    # Prerequisite text, falling back to the snapshot when the catalog has none
+    prereq_text = clean_prereq_text(df['prereq_text'])
+    use_fallback = prereq_text.str.contains("None", regex=False) & fallback['found']
+    prereq_text = prereq_text.where(~use_fallback, clean_prereq_text(fallback['text']))
+
+    descs = node_descriptions(df, prereq_text)
+    labels = df['title'].map(lambda x: x[x.find('-')+1:].strip() if x.find('-') != -1 else x)
+    colors = numbers.str[0].map(color_map).fillna('#CCCCCC')  # Default gray if no matching first digit
+    codes = df['title'].str.split(' - ').str[0].str.strip()
+    professors = df['professors_str'] if 'professors_str' in df else pd.Series(None, index=df.index, dtype=object)
+
+    # Edges - the transitive reduction of what each course requires, ranked by the rules
+    candidates = candidate_edges(
+        keys, [df['must_have_prereqs'], df['optional_prereqs'], fallback['must'], fallback['optional']],
+        node_keys, node_ids)
+    edges = select_edges(keys, candidates, rules or EdgeRules())
+
+    # One node per id (a repeated course keeps its last record), attributes stored as columns
+    last = ~keys.duplicated(keep='last')
+    return CompactGraph.from_edges(
+        keys[last].tolist(), edges,
+        columns={'desc': descs[last].tolist(), 'label': labels[last].tolist(), 'color': colors[last].tolist(),
+                 # Only read by search_index.build_search_index, which drops them
+                 'code': codes[last].tolist(), 'description': df['description'][last].tolist(),
+                 'professors': professors[last].tolist()},
+        # The full relation (every listed prerequisite in the graph), for the closure index
+        graph={'prerequisites': prerequisite_edges(keys, df['prerequisites'], fallback, node_keys, node_ids)},
+    )
+
+def prerequisite_edges(keys, prerequisites, fallback, node_keys, node_ids='number'):
+    """Every (prerequisite, course) pair between courses in the graph."""
+    edges = set()
+    for key, listed, must, optional in zip(keys, prerequisites, fallback['must'], fallback['optional']):
+        for prereqs in (listed, must, optional):
+            if not hasattr(prereqs, '__len__'):
                 continue
-        else:
-            pass
-            
-    return max_prereq, alternate_prereq
-
-# Create edges using course numbers - only highest prerequisite
-edges = []
-for index, row in df.iterrows():
-    # First try must-have prerequisites
-    prereqs = ast.literal_eval(row['must_have_prereqs'])
-    max_prereq, alternate_prereq = get_prereq_edge(prereqs, row['number'], numbers_list)
-    
-    print(row['number'], row['must_have_prereqs'], row['optional_prereqs'], max_prereq, alternate_prereq)
-    if max_prereq:
-        edges.append((max_prereq, row['number']))
-        continue
-    elif alternate_prereq != -1 and str(alternate_prereq) in numbers_list:
-        edges.append((str(alternate_prereq), row['number']))
-        continue
-        
-    # If no must-have prereqs found, try optional prerequisites
-    prereqs = ast.literal_eval(row['optional_prereqs']) 
-    max_prereq, alternate_prereq = get_prereq_edge(prereqs, row['number'], numbers_list)
-    if max_prereq:
-        edges.append((max_prereq, row['number']))
-        continue
-    elif alternate_prereq != -1 and str(alternate_prereq) in numbers_list:
-        edges.append((str(alternate_prereq), row['number']))
-        continue
-    
-    # take edges from df2
-    if file_path.lower().find('math') != -1:
-      df2_row = df2[df2['course_number'] == int(row['number'])]
-      print(row['number'], df2_row['must_have_prerequisites_array'], df2_row['optional_prerequisites_array'])
-      if len(df2_row) > 0:
-        prereqs = ast.literal_eval(df2_row['must_have_prerequisites_array'].values[0])
-        max_prereq, alternate_prereq = get_prereq_edge(prereqs, row['number'], numbers_list)
-        print("GOT",prereqs, row['number'], max_prereq, alternate_prereq)
-        if max_prereq:
-          edges.append((max_prereq, row['number']))
-          continue
-        elif alternate_prereq != -1 and str(alternate_prereq) in numbers_list:
-          edges.append((str(alternate_prereq), row['number']))
-          continue
-        else:
-          prereqs = ast.literal_eval(df2_row['optional_prerequisites_array'].values[0])
-          max_prereq, alternate_prereq = get_prereq_edge(prereqs, row['number'], numbers_list)
-          print("GOT OPTIONAL",prereqs, row['number'], max_prereq, alternate_prereq)
-          if max_prereq:
-            edges.append((max_prereq, row['number']))
-            continue
-          elif alternate_prereq != -1 and str(alternate_prereq) in numbers_list:
-            edges.append((str(alternate_prereq), row['number']))
-            continue
-
-print("Edges:", edges)
-print("\nAll course numbers:", sorted(numbers_list))
-
-# Add edges to graph
-net.add_edges_from(edges)
-
-# Create Pyvis network with full screen dimensions
-nt = Network(height="100vh",  # Changed to viewport height
-            width="100vw",    # Changed to viewport width
-            bgcolor="#ffffff",
-            directed=True)
-
-# Configure physics options for better spacing
-nt.set_options("""
-{
-  "physics": {
-    "forceAtlas2Based": {
-      "gravitationalConstant": -100,
-      "springLength": 200
-    },
-    "minVelocity": 0.75,
-    "solver": "forceAtlas2Based"
-  },
-  "nodes": {
-    "font": {
-      "size": 14
-    }
-  }
-}
-""")
+            for prereq in prereqs:
+                prereq = prereq_key(prereq, node_ids)
+                if prereq in node_keys and prereq != key:
+                    edges.add((prereq, key))
+    return sorted(edges)
+
+def prerequisite_closure(net):
+    """ClosureIndex over the full prerequisite relation of a graph from build_graph."""
+    return ClosureIndex.from_edges(net.nodes, net.graph.get('prerequisites', net.edges))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the prerequisite network page")
+    parser.add_argument("--catalog", default=catalog_path('MATH'), help="Scraped course records")
+    parser.add_argument("--university", action="store_true", help="Use the whole-university catalog data2/gt_courses.csv")
+    parser.add_argument("--out", default='network_math.html', help="Output HTML file")
+    parser.add_argument("--inline-tooltips", action="store_true",
+                        help="Keep tooltip HTML in the page instead of the .tooltips/ sidecar "
+                             "(needed to open the page from file://)")
+    parser.add_argument("--closure", action="store_true",
+                        help="Embed the transitive prerequisite index; clicking a course highlights its chain")
+    parser.add_argument("--clusters", choices=['auto', 'on', 'off'], default='auto',
+                        help="Start with courses collapsed by department and level "
+                             f"(auto: for graphs over {AUTO_THRESHOLD} courses)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    fallback = None
+    rules = None
+    if args.university:
+        df = load_university_catalog()
+    else:
+        df = load_catalog(args.catalog)
+        if args.catalog.lower().find('math') != -1:
+            fallback = load_fallback()
+            rules = load_edge_rules('MATH')
+
+    net = build_graph(df, fallback, rules)
+    print(f"Built graph with {net.number_of_nodes()} nodes and {net.number_of_edges()} edges "
+          f"in {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    apply_layout(net)
+    print(f"Laid out graph in {time.perf_counter() - start:.3f}s")
 
-# Convert NetworkX graph to Pyvis
-nt.from_nx(net)
+    if not args.inline_tooltips:
+        chunks = write_tooltip_sidecar(net, args.out)
+        print(f"Wrote {chunks} tooltip chunks")
 
-# Save the interactive visualization
-nt.save_graph('network_math.html')
\ No newline at end of file
+    closure = prerequisite_closure(net) if args.closure else None
+    clusters = page_clusters(net, args.clusters)
+    if clusters is not None:
+        print(f"Collapsed into {len(clusters['clusters'])} clusters")
+    search = build_search_index(net)
+    write_page(net, args.out, closure, clusters=clusters, search=search)
@@ -0,0 +1,207 @@
+"""
+Compact graph core for the prerequisite network.
+
+A networkx DiGraph keeps a dict per node, a dict per adjacency entry and a
+dict per edge; pyvis' from_nx then copies all of it into its own lists.
+For the whole catalog that is several dict-heavy copies of the same data.
+
+CompactGraph instead stores:
+    ids            course ids, interned once (index maps id -> int)
+    offsets/targets  CSR adjacency in int32 arrays (successors of node i are
+                   targets[offsets[i]:offsets[i + 1]]); the reverse CSR for
+                   predecessors is built on first use
+    columns        one list per node attribute (label, color, desc, x, ...)
+    edge_columns   one list per edge attribute, in CSR order
+    graph          graph-level data, as networkx' graph.graph
+
+It has the small read API the rest of the code uses (nodes, edges,
+successors, predecessors, degree), converts to and from networkx, and turns
+into vis.js node/edge records for the page (emit.py) without an
+intermediate copy.
+"""
+import networkx as nx
+import numpy as np
+
+DEFAULT_NODE_SIZE = 10
+
+
+class CompactGraph:
+    def __init__(self, ids, offsets, targets, columns=None, edge_columns=None, graph=None):
+        self.ids = list(ids)
+        self.index = {node: i for i, node in enumerate(self.ids)}
+        self.offsets = offsets
+        self.targets = targets
+        self.columns = dict(columns or {})
+        self.edge_columns = dict(edge_columns or {})
+        self.graph = dict(graph or {})
+        self._reverse = None
+
+    @classmethod
+    def from_edges(cls, ids, edges, columns=None, edge_columns=None, graph=None):
+        """
+        Args:
+            ids: Node ids
+            edges: (source, target) id pairs; duplicates are kept once
+            columns: Dict of attribute name -> list aligned with ids
+            edge_columns: Dict of attribute name -> list aligned with edges
+        """
+        ids = list(ids)
+        index = {node: i for i, node in enumerate(ids)}
+        edges = list(edges)
+        sources = np.fromiter((index[u] for u, _ in edges), dtype=np.int32, count=len(edges))
+        targets = np.fromiter((index[v] for _, v in edges), dtype=np.int32, count=len(edges))
+
+        # Sort by (source, target) and drop repeated pairs
+        order = np.lexsort((targets, sources))
+        if len(order):
+            keep = np.ones(len(order), dtype=bool)
+            keep[1:] = (np.diff(sources[order]) != 0) | (np.diff(targets[order]) != 0)
+            order = order[keep]
+        offsets = np.zeros(len(ids) + 1, dtype=np.int32)
+        np.cumsum(np.bincount(sources[order], minlength=len(ids)), out=offsets[1:])
+        edge_columns = {name: [values[i] for i in order] for name, values in (edge_columns or {}).items()}
+        return cls(ids, offsets, targets[order], columns, edge_columns, graph)
+
+    @classmethod
+    def from_networkx(cls, net):
+        ids = list(net.nodes)
+        names = sorted({name for _, data in net.nodes(data=True) for name in data})
+        columns = {name: [net.nodes[node].get(name) for node in ids] for name in names}
+        edges = list(net.edges(data=True))
+        edge_names = sorted({name for _, _, data in edges for name in data})
+        edge_columns = {name: [data.get(name) for _, _, data in edges] for name in edge_names}
+        return cls.from_edges(ids, [(u, v) for u, v, _ in edges], columns, edge_columns, net.graph)
+
+    def to_networkx(self):
+        net = nx.DiGraph()
+        net.graph.update(self.graph)
+        net.add_nodes_from((node, self.node_attributes(node)) for node in self.ids)
+        for i, (u, v) in enumerate(self.edges):
+            net.add_edge(u, v, **{name: values[i] for name, values in self.edge_columns.items()
+                                  if values[i] is not None})
+        return net
+
+    # Read API (the subset of networkx' used by layout, closure and tooltips)
+
+    @property
+    def nodes(self):
+        return self.ids
+
+    @property
+    def edges(self):
+        sources = np.repeat(np.arange(len(self.ids), dtype=np.int32), np.diff(self.offsets))
+        return [(self.ids[u], self.ids[v]) for u, v in zip(sources.tolist(), self.targets.tolist())]
+
+    def number_of_nodes(self):
+        return len(self.ids)
+
+    def number_of_edges(self):
+        return len(self.targets)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def successors(self, node):
+        i = self.index[node]
+        return [self.ids[j] for j in self.targets[self.offsets[i]:self.offsets[i + 1]].tolist()]
+
+    def predecessors(self, node):
+        if self._reverse is None:
+            sources = np.repeat(np.arange(len(self.ids), dtype=np.int32), np.diff(self.offsets))
+            order = np.argsort(self.targets, kind='stable')
+            offsets = np.zeros(len(self.ids) + 1, dtype=np.int32)
+            np.cumsum(np.bincount(self.targets, minlength=len(self.ids)), out=offsets[1:])
+            self._reverse = (offsets, sources[order])
+        offsets, sources = self._reverse
+        i = self.index[node]
+        return [self.ids[j] for j in sources[offsets[i]:offsets[i + 1]].tolist()]
+
+    def degree(self, node):
+        i = self.index[node]
+        out_degree = self.offsets[i + 1] - self.offsets[i]
+        return int(out_degree) + len(self.predecessors(node))
+
+    def node_attributes(self, node):
+        i = self.index[node]
+        return {name: values[i] for name, values in self.columns.items() if values[i] is not None}
+
+    # Building new graphs
+
+    def set_column(self, name, values):
+        self.columns[name] = list(values)
+
+    def pop_column(self, name):
+        return self.columns.pop(name, None)
+
+    def _graph_data(self, kept):
+        """graph for a copy on the kept node ids, with the prerequisite pairs between them only."""
+        graph = dict(self.graph)
+        if 'prerequisites' in graph:
+            graph['prerequisites'] = [(u, v) for u, v in graph['prerequisites'] if u in kept and v in kept]
+        return graph
+
+    def subgraph(self, nodes):
+        """Graph on the given nodes with the edges (and edge attributes) between them."""
+        keep = [self.index[node] for node in nodes]
+        kept = set(keep)
+        edges = []
+        positions = []
+        for i, (u, v) in enumerate(self.edges):
+            if self.index[u] in kept and self.index[v] in kept:
+                edges.append((u, v))
+                positions.append(i)
+        ids = [self.ids[i] for i in keep]
+        return CompactGraph.from_edges(
+            ids, edges,
+            {name: [values[i] for i in keep] for name, values in self.columns.items()},
+            {name: [values[i] for i in positions] for name, values in self.edge_columns.items()},
+            graph=self._graph_data(set(ids)))
+
+    def extend(self, nodes, attributes, edges):
+        """
+        Copy of the graph with extra nodes (attributes: one dict per node) and
+        extra edges, which may also connect existing nodes. Extra edges have
+        no edge attributes; an existing edge keeps its own.
+        """
+        new = [node for node in nodes if node not in self.index]
+        new_attributes = {node: attrs for node, attrs in zip(nodes, attributes)}
+        names = set(self.columns).union(*(new_attributes[node] for node in new))
+        columns = {}
+        for name in names:
+            values = self.columns.get(name, [None] * len(self.ids))
+            columns[name] = list(values) + [new_attributes[node].get(name) for node in new]
+        edges = list(edges)
+        edge_columns = {name: list(values) + [None] * len(edges) for name, values in self.edge_columns.items()}
+        return CompactGraph.from_edges(self.ids + new, self.edges + edges, columns, edge_columns,
+                                       graph=self.graph)
+
+    # HTML emitter adapter
+
+    def vis_nodes(self):
+        """Yields node records as vis.js expects them (dot shape and size 10 unless set)."""
+        names = list(self.columns)
+        for i, node in enumerate(self.ids):
+            record = {name: self.columns[name][i] for name in names if self.columns[name][i] is not None}
+            record['id'] = node
+            record['label'] = record.get('label') or node
+            record.setdefault('shape', 'dot')
+            record.setdefault('size', DEFAULT_NODE_SIZE)
+            yield record
+
+    def vis_edges(self):
+        """Yields edge records; 'weight' becomes the drawn width."""
+        for i, (u, v) in enumerate(self.edges):
+            record = {name: values[i] for name, values in self.edge_columns.items() if values[i] is not None}
+            record['width'] = record.pop('weight', 1)
+            record['from'] = u
+            record['to'] = v
+            record['arrows'] = 'to'
+            yield record
+
+
+def as_compact(net):
+    """CompactGraph for either kind of graph."""
+    return net if isinstance(net, CompactGraph) else CompactGraph.from_networkx(net)
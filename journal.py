@@ -0,0 +1,114 @@
+"""
+Append-only scrape journal.
+
+Every course record is appended to .cache/scrape_journal/{term}.jsonl as soon
+as it is scraped, one JSON line per (term, subject, course):
+
+    {"subject": "MATH", "course": "1552", "ok": true, "record": {...}}
+
+so a crash, Ctrl-C or a bad page late in a long run loses at most the
+records still in flight. A torn last line (the process died mid-write) is
+cut off when the journal is reopened. With resume, the scraper skips the
+courses the journal already has a good record for and only fetches the
+rest; failed fetches (ok false) are kept for the output but retried.
+
+Only the byte offset of the latest line per key is held in memory. The
+per-subject record files are compacted from the journal at the end, one
+subject at a time.
+"""
+import json
+import logging
+import os
+
+DEFAULT_DIR = '.cache/scrape_journal'
+
+
+class ScrapeJournal:
+    def __init__(self, term, directory=DEFAULT_DIR, resume=True, sync_every=64):
+        """
+        Args:
+            term: Term code; each term has its own journal file
+            directory: Where journals are kept
+            resume: Keep what an earlier run journaled; otherwise start empty
+            sync_every: fsync after this many appended records (and on close)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.term = term
+        self.path = os.path.join(directory, f'{term}.jsonl')
+        self.sync_every = sync_every
+        # subject -> {course: (offset of its latest line, ok)}
+        self.entries = {}
+        if resume and os.path.exists(self.path):
+            self._load()
+        else:
+            open(self.path, 'w').close()
+        self._file = open(self.path, 'ab')
+        self._pending = 0
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Torn write from a crash; the next append starts where it began
+                    logging.warning(f"Journal {self.path}: dropping incomplete last line")
+                    break
+                try:
+                    entry = json.loads(line)
+                    self.entries.setdefault(entry['subject'], {})[entry['course']] = (offset, entry['ok'])
+                except (ValueError, KeyError):
+                    logging.warning(f"Journal {self.path}: skipping unreadable line at byte {offset}")
+                offset += len(line)
+        with open(self.path, 'r+b') as f:
+            f.truncate(offset)
+
+    def close(self):
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def completed(self, subject):
+        """Course numbers of subject with a good record in the journal."""
+        return {course for course, (_, ok) in self.entries.get(subject, {}).items() if ok}
+
+    def append(self, subject, course, record):
+        """Journal one course record; records with an 'error' are kept but not completed."""
+        ok = record.get('error') is None
+        line = json.dumps({'subject': subject, 'course': course, 'ok': ok, 'record': record},
+                          separators=(',', ':'), default=_to_json) + '\n'
+        offset = self._file.tell()
+        self._file.write(line.encode('utf-8'))
+        # Whole lines only reach the file, so a crash never leaves half a record behind the last newline
+        self._file.flush()
+        self.entries.setdefault(subject, {})[course] = (offset, ok)
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            self.sync()
+
+    def records(self, subject):
+        """Latest record of every course of subject, in course order."""
+        self._file.flush()
+        courses = self.entries.get(subject, {})
+        with open(self.path, 'rb') as f:
+            for course in sorted(courses):
+                f.seek(courses[course][0])
+                yield json.loads(f.readline())['record']
+
+
+def _to_json(value):
+    # numpy arrays and scalars from the parser
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
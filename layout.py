@@ -0,0 +1,223 @@
+"""
+Layered (Sugiyama-style) layout of the prerequisite DAG, computed at build time.
+
+Steps:
+    1. Break cycles from bad catalog data by reversing DFS back edges.
+    2. Longest-path layering: a course sits one layer below its deepest
+       prerequisite, so every edge points down.
+    3. Edges spanning several layers get dummy nodes so crossing reduction can
+       route them.
+    4. Crossing reduction with alternating down/up barycenter sweeps.
+    5. Coordinate assignment: nodes start at their order in the layer and are
+       pulled towards the median of their neighbours, keeping a minimum gap.
+
+Courses with no edges at all are packed into a grid below the layered part,
+so they don't stretch the first layer across the page.
+"""
+import math
+from collections import defaultdict
+
+from graph_core import CompactGraph
+
+
+def _acyclic_edges(nodes, succ):
+    """Edges with DFS back edges reversed (self-loops dropped), plus the set of reversed edges."""
+    state = {}
+    edges = []
+    reversed_edges = set()
+    for root in nodes:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(succ[root]))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child == node:
+                    # A self-loop can't be drawn pointing down either way
+                    continue
+                if state.get(child) == 1:
+                    edges.append((child, node))
+                    reversed_edges.add((node, child))
+                else:
+                    edges.append((node, child))
+                    if child not in state:
+                        state[child] = 1
+                        stack.append((child, iter(succ[child])))
+                        break
+            else:
+                state[node] = 2
+                stack.pop()
+    return edges, reversed_edges
+
+
+def longest_path_layers(nodes, edges):
+    """Layer index per node; sources are layer 0."""
+    preds = defaultdict(list)
+    indegree = {node: 0 for node in nodes}
+    succ = defaultdict(list)
+    for u, v in edges:
+        succ[u].append(v)
+        preds[v].append(u)
+        indegree[v] += 1
+    layer = {}
+    queue = [node for node in nodes if indegree[node] == 0]
+    while queue:
+        next_queue = []
+        for node in queue:
+            layer[node] = max((layer[p] + 1 for p in preds[node]), default=0)
+            for child in succ[node]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    next_queue.append(child)
+        queue = next_queue
+    return layer
+
+
+class _Dummy:
+    """Placeholder node on a long edge; never appears in the output."""
+    __slots__ = ()
+
+
+def _insert_dummies(edges, layer):
+    """Split long edges into unit-length segments through dummy nodes."""
+    segments = []
+    dummies = []
+    for u, v in edges:
+        previous = u
+        for level in range(layer[u] + 1, layer[v]):
+            dummy = _Dummy()
+            layer[dummy] = level
+            dummies.append(dummy)
+            segments.append((previous, dummy))
+            previous = dummy
+        segments.append((previous, v))
+    return segments, dummies
+
+
+def _barycenter_sweeps(layers, up, down, sweeps):
+    position = {}
+    for nodes in layers:
+        for i, node in enumerate(nodes):
+            position[node] = i
+
+    def reorder(nodes, neighbours):
+        def key(item):
+            i, node = item
+            adjacent = neighbours[node]
+            if not adjacent:
+                return (position[node], i)
+            return (sum(position[n] for n in adjacent) / len(adjacent), i)
+        ordered = [node for _, node in sorted(enumerate(nodes), key=key)]
+        for i, node in enumerate(ordered):
+            position[node] = i
+        return ordered
+
+    for sweep in range(sweeps):
+        if sweep % 2 == 0:
+            for i in range(1, len(layers)):
+                layers[i] = reorder(layers[i], up)
+        else:
+            for i in range(len(layers) - 2, -1, -1):
+                layers[i] = reorder(layers[i], down)
+    return layers
+
+
+def _assign_x(layers, up, down, node_spacing, passes):
+    x = {}
+    for nodes in layers:
+        offset = -(len(nodes) - 1) / 2
+        for i, node in enumerate(nodes):
+            x[node] = (offset + i) * node_spacing
+
+    def place(nodes, neighbours):
+        # Desired position: median of neighbours; then resolve overlaps left to right
+        desired = []
+        for node in nodes:
+            adjacent = sorted(x[n] for n in neighbours[node])
+            desired.append(adjacent[len(adjacent) // 2] if adjacent else x[node])
+        placed = []
+        for want in desired:
+            if placed and want < placed[-1] + node_spacing:
+                want = placed[-1] + node_spacing
+            placed.append(want)
+        # Re-centre the layer on where it wanted to be
+        shift = (sum(desired) - sum(placed)) / len(placed) if placed else 0
+        for node, value in zip(nodes, placed):
+            x[node] = value + shift
+
+    for p in range(passes):
+        if p % 2 == 0:
+            for nodes in layers[1:]:
+                place(nodes, up)
+        else:
+            for nodes in reversed(layers[:-1]):
+                place(nodes, down)
+    return x
+
+
+def layered_layout(graph, node_spacing=220, layer_spacing=180, sweeps=8, passes=4):
+    """
+    Compute fixed positions for a directed graph.
+
+    Args:
+        graph: CompactGraph or networkx.DiGraph (edges point from prerequisite to course)
+        node_spacing: Minimum horizontal gap between nodes in a layer
+        layer_spacing: Vertical distance between layers
+        sweeps: Barycenter crossing-reduction sweeps
+        passes: Coordinate refinement passes
+
+    Returns:
+        Dict of node -> (x, y)
+    """
+    nodes = list(graph.nodes)
+    succ = {node: list(graph.successors(node)) for node in nodes}
+    connected = [node for node in nodes if graph.degree(node) > 0]
+    isolated = [node for node in nodes if graph.degree(node) == 0]
+
+    edges, _ = _acyclic_edges(connected, succ)
+    layer = longest_path_layers(connected, edges)
+    segments, dummies = _insert_dummies(edges, layer)
+
+    layers = defaultdict(list)
+    for node in connected + dummies:
+        layers[layer[node]].append(node)
+    layers = [layers[i] for i in range(len(layers))]
+
+    up = defaultdict(list)
+    down = defaultdict(list)
+    for u, v in segments:
+        up[v].append(u)
+        down[u].append(v)
+
+    layers = _barycenter_sweeps(layers, up, down, sweeps)
+    x = _assign_x(layers, up, down, node_spacing, passes)
+
+    positions = {}
+    for level, layer_nodes in enumerate(layers):
+        for node in layer_nodes:
+            if not isinstance(node, _Dummy):
+                positions[node] = (round(x[node]), level * layer_spacing)
+
+    # Grid for courses without any edges
+    if isolated:
+        widest = max((len(layer_nodes) for layer_nodes in layers), default=0)
+        columns = max(widest, math.ceil(math.sqrt(len(isolated))))
+        top = (len(layers) + 1) * layer_spacing
+        for i, node in enumerate(isolated):
+            row, column = divmod(i, columns)
+            positions[node] = (round((column - (columns - 1) / 2) * node_spacing), top + row * layer_spacing)
+    return positions
+
+
+def apply_layout(graph, **kwargs):
+    """Write x/y computed by layered_layout into graph (node attributes or CompactGraph columns)."""
+    positions = layered_layout(graph, **kwargs)
+    if isinstance(graph, CompactGraph):
+        graph.set_column('x', [positions[node][0] for node in graph.nodes])
+        graph.set_column('y', [positions[node][1] for node in graph.nodes])
+        return graph
+    for node, (x, y) in positions.items():
+        graph.nodes[node]['x'] = x
+        graph.nodes[node]['y'] = y
+    return graph
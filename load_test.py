@@ -0,0 +1,125 @@
+"""
+Load test for query_service.py.
+
+Replays a random mix of subgraph, closure, course and search queries
+against a running service with a fixed number of concurrent clients, and
+reports throughput, latency percentiles per endpoint and the service's
+cache counters over the run:
+
+    python3 query_service.py --university &
+    python3 load_test.py --requests 20000 --concurrency 64
+
+Queries are drawn from a pool of --distinct queries (courses from /courses,
+search words from their titles), so the cache hit rate can be steered.
+--reload-every also posts /reload that often during the run.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+import aiohttp
+
+from query_service import DEFAULT_PORT
+
+# Relative frequency of each endpoint in the mix
+MIX = {'/subgraph': 4, '/ancestors': 2, '/descendants': 2, '/course': 1, '/search': 3}
+
+
+def query_pool(courses, titles, distinct, rng):
+    """distinct (path, params) pairs drawn with the MIX frequencies."""
+    paths = list(MIX)
+    weights = [MIX[path] for path in paths]
+    words = sorted({word for title in titles for word in title.lower().split() if len(word) > 3})
+    pool = []
+    for path in rng.choices(paths, weights, k=distinct):
+        course = rng.choice(courses)
+        if path == '/subgraph':
+            params = {'course': course, 'direction': rng.choice(['up', 'down', 'both'])}
+            if rng.random() < 0.5:
+                params['depth'] = str(rng.randint(1, 3))
+        elif path == '/search':
+            word = rng.choice(words) if words else course
+            params = {'q': word[:rng.randint(3, len(word))]}
+        elif path == '/course':
+            params = {'id': course}
+        else:
+            params = {'course': course}
+        pool.append((path, params))
+    return pool
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run(url, requests, concurrency, distinct, reload_every, seed):
+    rng = random.Random(seed)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with session.get(f'{url}/courses') as response:
+            courses = (await response.json())['courses']
+        titles = []
+        for course in rng.sample(courses, min(len(courses), 200)):
+            async with session.get(f'{url}/course', params={'id': course}) as response:
+                titles.append((await response.json()).get('title') or '')
+        async with session.get(f'{url}/stats') as response:
+            before = await response.json()
+
+        pool = query_pool(courses, titles, distinct, rng)
+        plan = [rng.choice(pool) for _ in range(requests)]
+        latencies = defaultdict(list)
+        statuses = defaultdict(int)
+        next_request = 0
+
+        async def client():
+            nonlocal next_request
+            while next_request < len(plan):
+                n = next_request
+                next_request += 1
+                if reload_every and n and n % reload_every == 0:
+                    async with session.post(f'{url}/reload') as response:
+                        await response.read()
+                path, params = plan[n]
+                start = time.perf_counter()
+                async with session.get(url + path, params=params) as response:
+                    await response.read()
+                    statuses[response.status] += 1
+                latencies[path].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        async with session.get(f'{url}/stats') as response:
+            after = await response.json()
+
+    print(f"{requests} requests, {concurrency} clients, {distinct} distinct queries: "
+          f"{elapsed:.2f}s, {requests / elapsed:.0f} req/s")
+    print("Statuses: " + ', '.join(f'{status}: {count}' for status, count in sorted(statuses.items())))
+    print(f"{'endpoint':<14} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for path, values in sorted(latencies.items()):
+        values.sort()
+        print(f"{path:<14} {len(values):>7} {percentile(values, 0.5) * 1000:>8.2f} "
+              f"{percentile(values, 0.95) * 1000:>8.2f} {percentile(values, 0.99) * 1000:>8.2f} "
+              f"{values[-1] * 1000:>8.2f}")
+    hits = after['cache']['hits'] - before['cache']['hits']
+    misses = after['cache']['misses'] - before['cache']['misses']
+    print(f"Cache: {hits} hits, {misses} misses ({hits / max(hits + misses, 1):.1%}), "
+          f"generation {before['generation']} -> {after['generation']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test a running query_service.py")
+    parser.add_argument("--url", default=f'http://127.0.0.1:{DEFAULT_PORT}')
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--distinct", type=int, default=1000, help="Size of the query pool the requests repeat")
+    parser.add_argument("--reload-every", type=int, default=0, help="POST /reload every this many requests")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args.url.rstrip('/'), args.requests, args.concurrency, args.distinct,
+                    args.reload_every, args.seed))
@@ -0,0 +1,120 @@
+// Level-of-detail view for large network pages (see clusters.py).
+// emit.py inlines this before creating the network when lodClusters is
+// embedded: the network is then given lod.nodes and lod.edges, which show
+// one node per (department, level) cluster until the cluster is opened.
+
+function levelOfDetail(nodes, edges, lodClusters) {
+    var clusterOf = {};
+    var clusterById = {};
+    var expanded = {};
+    lodClusters.clusters.forEach(function (cluster) {
+        clusterById[cluster.id] = cluster;
+        cluster.members.forEach(function (id) {
+            clusterOf[id] = cluster.id;
+        });
+    });
+    nodes.add(lodClusters.clusters.map(function (cluster) {
+        return {id: cluster.id, label: cluster.label, x: cluster.x, y: cluster.y, color: cluster.color,
+                size: cluster.size, shape: 'dot', lodCluster: true};
+    }));
+
+    function shown(id) {
+        var cluster = clusterOf[id];
+        return cluster === undefined || expanded[cluster] === true;
+    }
+
+    var nodeView = new vis.DataView(nodes, {
+        filter: function (node) {
+            return node.lodCluster ? !expanded[node.id] : shown(node.id);
+        }
+    });
+
+    // Edges between shown courses are drawn as they are; every other pair of
+    // ends (a cluster and a course, or two clusters) gets one edge standing
+    // for all the course edges between them
+    var drawnEdges = new vis.DataSet();
+
+    function rebuildEdges() {
+        var records = [];
+        var merged = {};
+        edges.forEach(function (edge) {
+            var from = shown(edge.from) ? edge.from : clusterOf[edge.from];
+            var to = shown(edge.to) ? edge.to : clusterOf[edge.to];
+            if (from === edge.from && to === edge.to) {
+                records.push(edge);
+                return;
+            }
+            if (from === to) return;
+            var id = 'lod:' + from + '>' + to;
+            if (!(id in merged)) {
+                merged[id] = {id: id, from: from, to: to, arrows: 'to', count: 0};
+                records.push(merged[id]);
+            }
+            merged[id].count += 1;
+        });
+        records.forEach(function (record) {
+            if (record.count !== undefined) {
+                record.width = Math.min(record.count, 8);
+                record.title = record.count + ' prerequisite links';
+            }
+        });
+        drawnEdges.clear();
+        drawnEdges.add(records);
+    }
+
+    function setExpanded(ids, value) {
+        var changed = false;
+        ids.forEach(function (id) {
+            if (!!expanded[id] !== value) {
+                expanded[id] = value;
+                changed = true;
+            }
+        });
+        if (changed) {
+            nodeView.refresh();
+            rebuildEdges();
+        }
+    }
+
+    function clustersInView(network) {
+        var scale = network.getScale();
+        var center = network.getViewPosition();
+        var canvas = network.body.container;
+        var halfWidth = canvas.clientWidth / 2 / scale;
+        var halfHeight = canvas.clientHeight / 2 / scale;
+        return lodClusters.clusters.filter(function (cluster) {
+            return Math.abs(cluster.x - center.x) <= halfWidth && Math.abs(cluster.y - center.y) <= halfHeight;
+        }).map(function (cluster) {
+            return cluster.id;
+        });
+    }
+
+    function attach(network) {
+        network.on("click", function (params) {
+            if (params.nodes.length && params.nodes[0] in clusterById) {
+                setExpanded([params.nodes[0]], true);
+            }
+        });
+
+        function followZoom() {
+            var scale = network.getScale();
+            if (scale >= lodClusters.expandScale) {
+                setExpanded(clustersInView(network), true);
+            } else if (scale < lodClusters.collapseScale) {
+                setExpanded(Object.keys(expanded), false);
+            }
+        }
+        network.on("zoom", followZoom);
+        network.on("dragEnd", function (params) {
+            // Panning while zoomed in opens the clusters that come into view
+            if (params.nodes.length === 0) followZoom();
+        });
+    }
+
+    function reveal(id) {
+        if (id in clusterOf) setExpanded([clusterOf[id]], true);
+    }
+
+    rebuildEdges();
+    return {nodes: nodeView, edges: drawnEdges, attach: attach, expand: setExpanded, reveal: reveal};
+}
@@ -0,0 +1,140 @@
+"""
+Persistent cache of OSCAR course pages.
+
+Pages are stored in a small SQLite database keyed by (term, subject, course
+number) together with the validators needed for conditional requests (ETag,
+Last-Modified) and a SHA-256 of the body. The parsed course record is stored
+next to the HTML, so a page that comes back unchanged (304, or 200 with the
+same hash) never goes through the parser again.
+
+Entries not validated for max_age seconds are dropped, and when the stored
+HTML grows past max_bytes the least recently used pages are evicted.
+
+Every write is committed straight away (in WAL mode, where a commit is an
+append to the log), so a scrape that crashes or is killed keeps the pages it
+already stored.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import NamedTuple
+
+DEFAULT_PATH = '.cache/oscar_pages.sqlite'
+
+
+class CachedPage(NamedTuple):
+    html: str
+    etag: str
+    last_modified: str
+    content_hash: str
+    validated_at: float
+    record: dict
+    parser: str
+
+
+def content_hash(html):
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+class PageCache:
+    def __init__(self, path=DEFAULT_PATH, max_age=30 * 24 * 3600, max_bytes=200 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite file, created if missing
+            max_age: Seconds since last validation after which an entry is evicted
+            max_bytes: Upper bound on total stored HTML
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                term TEXT, subject TEXT, number TEXT,
+                html TEXT, etag TEXT, last_modified TEXT, content_hash TEXT,
+                size INTEGER, validated_at REAL, accessed_at REAL,
+                record TEXT, parser TEXT,
+                PRIMARY KEY (term, subject, number)
+            )""")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.evict()
+        self.close()
+
+    def get(self, term, subject, number):
+        row = self.conn.execute(
+            "SELECT html, etag, last_modified, content_hash, validated_at, record, parser "
+            "FROM pages WHERE term = ? AND subject = ? AND number = ?",
+            (term, subject, str(number))).fetchone()
+        if row is None:
+            return None
+        self.conn.execute(
+            "UPDATE pages SET accessed_at = ? WHERE term = ? AND subject = ? AND number = ?",
+            (time.time(), term, subject, str(number)))
+        html, etag, last_modified, digest, validated_at, record, parser = row
+        return CachedPage(html, etag, last_modified, digest, validated_at,
+                          json.loads(record) if record else None, parser)
+
+    def conditional_headers(self, entry):
+        """Request headers that turn a refetch of entry into a revalidation."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def put(self, term, subject, number, html, headers, record, parser, digest=None):
+        now = time.time()
+        headers = {k.lower(): v for k, v in headers.items()}
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (term, subject, str(number), html, headers.get('etag'), headers.get('last-modified'),
+             digest or content_hash(html), len(html.encode('utf-8')), now, now,
+             json.dumps(record), parser))
+        self.conn.commit()
+
+    def mark_validated(self, term, subject, number):
+        """Record that the server confirmed the stored copy is still current."""
+        self.conn.execute(
+            "UPDATE pages SET validated_at = ? WHERE term = ? AND subject = ? AND number = ?",
+            (time.time(), term, subject, str(number)))
+        self.conn.commit()
+
+    def update_record(self, term, subject, number, record, parser):
+        self.conn.execute(
+            "UPDATE pages SET record = ?, parser = ? WHERE term = ? AND subject = ? AND number = ?",
+            (json.dumps(record), parser, term, subject, str(number)))
+        self.conn.commit()
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        self.conn.execute("DELETE FROM pages WHERE validated_at < ?", (time.time() - self.max_age,))
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total > self.max_bytes:
+            rows = self.conn.execute(
+                "SELECT term, subject, number, size FROM pages ORDER BY accessed_at").fetchall()
+            for term, subject, number, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute(
+                    "DELETE FROM pages WHERE term = ? AND subject = ? AND number = ?",
+                    (term, subject, number))
+                total -= size
+        self.conn.commit()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Incremental build of the department pages.
+
+The scripts that make up the pipeline are modelled as stages, one set per
+department, each with declared inputs and outputs:
+
+    scrape   OSCAR                                   -> data2/gt_{S}_courses.parquet
+    history  scraped records + schedule data          -> data2/gt_{S}_courses_history.parquet
+    page     records (+ math website snapshot)        -> network_{s}.html, network_{s}.tooltips/
+
+Inputs include the source files a stage runs, so editing the code reruns the
+stages that use it. After each stage the content hashes of its inputs and
+outputs are recorded in .cache/pipeline_state.json. A stage reruns only if
+an input hash changed, or an output is missing or was changed by hand; a
+stage whose rerun produces byte-identical outputs doesn't trigger the next
+one. Fixing one course description therefore rebuilds one department's
+history file and page and nothing else.
+
+Scraping hits OSCAR, so it only runs for departments that have no records
+yet, or when asked for with --scrape. The history stage needs schedule data
+(data/schedule_store or data/*.csv); without it, pages are built from the
+scraped records directly.
+
+Usage:
+    python3 pipeline.py build                   # every department with records
+    python3 pipeline.py build MATH CS --scrape  # rescrape, then rebuild what changed
+    python3 pipeline.py status MATH             # show which stages are stale
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from typing import Callable, NamedTuple
+
+from add_historical_info import add_historical_info, load_all_offerings, term_files
+from build_site import render_page
+from course_records import read_records, records_path, write_records
+from edge_selection import RULES_PATH, load_edge_rules
+from gen_network import FALLBACK_STEM, build_graph, load_catalog, load_fallback
+from scraper import get_all_courses
+from schedule_store import STORE_PATH as SCHEDULE_STORE
+from snapshot_store import WEBSITE_STORE, list_terms
+from tooltips import sidecar_dir
+
+STATE_PATH = '.cache/pipeline_state.json'
+
+SCRAPE_CODE = ['scraper.py', 'fetcher.py', 'page_cache.py', 'catalog.py', 'extract.py', 'prereqs.py']
+HISTORY_CODE = ['add_historical_info.py', 'schedule_store.py', 'course_records.py']
+PAGE_CODE = ['gen_network.py', 'layout.py', 'tooltips.py', 'emit.py', 'viewer.js', 'lod.js', 'search.js', 'build_site.py',
+             'course_records.py', 'closure.py', 'clusters.py', 'edge_selection.py', 'search_index.py',
+             'snapshot_store.py', RULES_PATH]
+
+
+class Stage(NamedTuple):
+    name: str
+    subject: str
+    inputs: list
+    outputs: list
+    run: Callable[[], None]
+    params: dict = {}
+
+    @property
+    def key(self):
+        return f'{self.name}:{self.subject}'
+
+
+def file_hash(path):
+    """sha256 of a file, or of every file under a directory (by relative path)."""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(root, name)
+                digest.update(os.path.relpath(full, path).encode() + b'\0')
+                digest.update(file_hash(full).encode())
+        return digest.hexdigest()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hashes(paths):
+    return {path: file_hash(path) if os.path.exists(path) else None for path in paths}
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def stale_reason(stage, state):
+    """Why a stage has to run, or None if it is up to date."""
+    recorded = state.get(stage.key)
+    if recorded is None:
+        return 'never built'
+    if recorded.get('params', {}) != stage.params:
+        return 'parameters changed'
+    for path, digest in hashes(stage.inputs).items():
+        if digest is None:
+            return f'missing input {path}'
+        if recorded['inputs'].get(path) != digest:
+            return f'{path} changed'
+    for path, digest in hashes(stage.outputs).items():
+        if digest is None:
+            return f'missing output {path}'
+        if recorded['outputs'].get(path) != digest:
+            return f'{path} modified outside the pipeline'
+    return None
+
+
+def raw_stem(subject):
+    """data2/gt_{S}_courses, or the lowercase stem when only that was saved (gt_cs_courses.csv)."""
+    stem = f'data2/gt_{subject}_courses'
+    lower = f'data2/gt_{subject.lower()}_courses'
+    if not glob.glob(stem + '.*') and glob.glob(lower + '.*'):
+        return lower
+    return stem
+
+def history_stem(subject):
+    return f'data2/gt_{subject}_courses_history'
+
+def page_path(subject):
+    return f'network_{subject.lower()}.html'
+
+def schedule_inputs():
+    """
+    The schedule data a history stage reads: the columnar store if it has
+    been built, else the per-term CSVs in data/ (other things under data/,
+    such as the catalog snapshots, are not schedule data).
+    """
+    if os.path.isdir(SCHEDULE_STORE):
+        return [SCHEDULE_STORE]
+    return term_files()
+
+def run_scrape(subject, term):
+    get_all_courses([subject], term)
+
+def run_history(subject, in_path, out_path):
+    courses_df = read_records(in_path)
+    course_codes = courses_df['title'].str.split('-').str[0].str.strip().unique()
+    write_records(add_historical_info(courses_df, load_all_offerings(course_codes)), out_path)
+
+def run_page(subject, records, out_path):
+    fallback = None
+    if subject == 'MATH':
+        fallback = load_fallback(subject)
+    render_page(build_graph(load_catalog(records), fallback, load_edge_rules(subject)), out_path)
+
+def department_stages(subject, term='202502'):
+    """The scrape -> history -> page stages for one department."""
+    stages = []
+    raw = records_path(raw_stem(subject))
+    if not os.path.exists(raw):
+        raw = raw_stem(subject) + '.parquet'
+    stages.append(Stage('scrape', subject, SCRAPE_CODE, [raw],
+                        lambda: run_scrape(subject, term), {'term': term}))
+
+    records = raw
+    schedules = schedule_inputs()
+    if schedules:
+        # Written next to the scraped file, never over it
+        records = history_stem(subject) + '.parquet'
+        stages.append(Stage('history', subject, [raw] + schedules + HISTORY_CODE, [records],
+                            lambda: run_history(subject, raw, records)))
+
+    page = page_path(subject)
+    page_inputs = [records] + PAGE_CODE
+    if subject == 'MATH':
+        page_inputs.append(records_path(FALLBACK_STEM))
+        # The store is optional; load_fallback only reads it once a snapshot is ingested
+        if list_terms(WEBSITE_STORE):
+            page_inputs.append(WEBSITE_STORE)
+    stages.append(Stage('page', subject, page_inputs, [page, sidecar_dir(page)],
+                        lambda: run_page(subject, records, page)))
+    return stages
+
+def known_subjects():
+    """Departments that already have scraped records in data2/ (gt_cs_courses.csv counts as CS)."""
+    subjects = set()
+    for path in glob.glob('data2/gt_*_courses.*'):
+        subject = os.path.basename(path)[len('gt_'):].rsplit('_courses', 1)[0]
+        if subject.isalpha():
+            subjects.add(subject.upper())
+    return sorted(subjects)
+
+def build(subjects, term='202502', scrape=False, force=False, state_path=STATE_PATH):
+    """
+    Run every stale stage for the given departments, in order.
+
+    Args:
+        scrape: Rescrape even if records exist
+        force: Rerun every stage
+
+    Returns:
+        List of (stage key, reason) for the stages that ran
+    """
+    state = load_state(state_path)
+    ran = []
+    for subject in subjects:
+        for stage in department_stages(subject, term):
+            if stage.name == 'scrape':
+                # Never scrape implicitly when records already exist
+                if not (scrape or force or not os.path.exists(stage.outputs[0])):
+                    continue
+                reason = 'requested' if (scrape or force) else 'no records yet'
+            else:
+                reason = 'forced' if force else stale_reason(stage, state)
+                if reason is None:
+                    continue
+
+            start = time.perf_counter()
+            stage.run()
+            print(f"{stage.key}: {reason}, ran in {time.perf_counter() - start:.2f}s")
+            state[stage.key] = {'inputs': hashes(stage.inputs), 'outputs': hashes(stage.outputs),
+                                'params': stage.params}
+            # Save after every stage so an interrupted build keeps its progress
+            save_state(state, state_path)
+            ran.append((stage.key, reason))
+    save_state(state, state_path)
+    return ran
+
+def status(subjects, term='202502', state_path=STATE_PATH):
+    state = load_state(state_path)
+    for subject in subjects:
+        for stage in department_stages(subject, term):
+            if stage.name == 'scrape':
+                reason = None if os.path.exists(stage.outputs[0]) else 'no records yet'
+            else:
+                reason = stale_reason(stage, state)
+            print(f"{stage.key:20} {'up to date' if reason is None else 'stale: ' + reason}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally build the department pages")
+    parser.add_argument("command", choices=['build', 'status'])
+    parser.add_argument("subjects", nargs="*", help="Departments (default: every department with records)")
+    parser.add_argument("--term", default="202502", help="Term code to scrape")
+    parser.add_argument("--scrape", action="store_true", help="Rescrape the departments from OSCAR")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage")
+    args = parser.parse_args()
+
+    subjects = [subject.upper() for subject in args.subjects] or known_subjects()
+    if args.command == 'status':
+        status(subjects, args.term)
+        return
+    start = time.perf_counter()
+    ran = build(subjects, args.term, args.scrape, args.force)
+    print(f"{len(ran)} stages ran in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
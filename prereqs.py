@@ -0,0 +1,328 @@
+"""
+Prerequisite grammar.
+
+Parses catalog prerequisite text such as
+
+    "MATH 1502 or MATH 1512 or ( (MATH 1552 or MATH 15X2 ) and MATH 1553 )"
+    "Graduate standing required; ISYE 6793"
+    "MATH 4107 and one of MATH 2406, MATH 4305, or permission of instructor"
+
+into a boolean expression tree of Course / Other leaves and And / Or nodes.
+Text is tokenized in one pass with a single precompiled pattern and parsed by
+a small recursive-descent parser in which 'and' binds tighter than 'or'.
+Parsing is memoized, and parse_many handles a whole column at once.
+
+Tolerated quirks of the OSCAR/catalog text:
+- Clauses separated by ';' are ANDed; "Credit restriction:" clauses are
+  exclusions, not prerequisites, and are dropped.
+- Commas in a list take the meaning of the connective that ends the list
+  ("A, B, or C" is an OR, "CHE, ME, and TFE 4776" an AND).
+- "one of A, B, or C" is an OR group even when it follows an 'and'.
+- Words directly before a course or '(' ("Implied sequence:") and
+  words directly after one ("with a minimum grade of D") are qualifiers and
+  are dropped. Any other run of words ("SAT Mathematics 600") becomes an
+  Other leaf, so alternatives that are not courses are kept.
+- Dangling or doubled connectives and unbalanced parentheses are ignored.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+import pandas as pd
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<course>\b[A-Z]{2,4}\s*\d{4}\b)
+  | (?P<lparen>\()
+  | (?P<rparen>\))
+  | (?P<and>\b(?i:and)\b)
+  | (?P<or>\b(?i:or)\b)
+  | (?P<comma>,)
+  | (?P<semi>;)
+  | (?P<word>[^\s(),;]+)
+""", re.VERBOSE)
+
+COURSE_PATTERN = re.compile(r'([A-Z]{2,4})\s*(\d{4})')
+
+EXCLUDED_CLAUSES = ('credit restriction',)
+
+
+@dataclass(frozen=True)
+class Course:
+    subject: str
+    number: str
+
+    def __str__(self):
+        return f"{self.subject} {self.number}"
+
+    def courses(self):
+        return [self]
+
+    def to_obj(self):
+        return str(self)
+
+
+@dataclass(frozen=True)
+class Other:
+    """A requirement that is not a course, e.g. 'Graduate standing required'."""
+    text: str
+
+    def __str__(self):
+        return self.text
+
+    def courses(self):
+        return []
+
+    def to_obj(self):
+        return ["other", self.text]
+
+
+@dataclass(frozen=True)
+class And:
+    children: tuple
+
+    def __str__(self):
+        return " and ".join(_wrap(child) for child in self.children)
+
+    def courses(self):
+        return _unique(course for child in self.children for course in child.courses())
+
+    def to_obj(self):
+        return ["and"] + [child.to_obj() for child in self.children]
+
+
+@dataclass(frozen=True)
+class Or:
+    children: tuple
+
+    def __str__(self):
+        return " or ".join(_wrap(child) for child in self.children)
+
+    def courses(self):
+        return _unique(course for child in self.children for course in child.courses())
+
+    def to_obj(self):
+        return ["or"] + [child.to_obj() for child in self.children]
+
+
+def _wrap(node):
+    return f"({node})" if isinstance(node, (And, Or)) else str(node)
+
+
+def _unique(items):
+    return list(dict.fromkeys(items))
+
+
+def _combine(cls, children):
+    """Build an And/Or node, flattening nested nodes of the same kind and dropping empties/duplicates."""
+    flat = []
+    for child in children:
+        if child is None:
+            continue
+        if isinstance(child, cls):
+            flat.extend(child.children)
+        else:
+            flat.append(child)
+    flat = _unique(flat)
+    if not flat:
+        return None
+    if len(flat) == 1:
+        return flat[0]
+    return cls(tuple(flat))
+
+
+def from_obj(obj):
+    """Inverse of Node.to_obj."""
+    if obj is None:
+        return None
+    if isinstance(obj, str):
+        subject, number = obj.split(' ')
+        return Course(subject, number)
+    kind, rest = obj[0], obj[1:]
+    if kind == "other":
+        return Other(rest[0])
+    return (And if kind == "and" else Or)(tuple(from_obj(child) for child in rest))
+
+
+def tokenize(text):
+    """Split text into (kind, value) tokens."""
+    return [(match.lastgroup, match.group()) for match in TOKEN_PATTERN.finditer(text)]
+
+
+def _resolve_commas(tokens):
+    """Give each comma the meaning of the next connective at the same nesting depth."""
+    resolved = list(tokens)
+    for i, (kind, _) in enumerate(tokens):
+        if kind != 'comma':
+            continue
+        depth = 0
+        meaning = 'and'
+        for later_kind, _ in tokens[i + 1:]:
+            if later_kind == 'lparen':
+                depth += 1
+            elif later_kind == 'rparen':
+                if depth == 0:
+                    break
+                depth -= 1
+            elif depth == 0 and later_kind in ('and', 'or'):
+                meaning = later_kind
+                break
+            elif depth == 0 and later_kind == 'semi':
+                break
+        resolved[i] = (meaning, ',')
+    return resolved
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def next(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        nodes = []
+        while self.pos < len(self.tokens):
+            start = self.pos
+            nodes.append(self.parse_or())
+            if self.peek() == 'rparen':
+                # Unbalanced ')', skip it and keep going
+                self.next()
+            elif self.pos == start:
+                # A token no rule takes (a ';' inside parentheses), skip it too
+                self.next()
+        return _combine(And, nodes)
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.peek() == 'or':
+            self.next()
+            children.append(self.parse_and())
+        return _combine(Or, children)
+
+    def parse_and(self):
+        children = [self.parse_atom()]
+        while self.peek() == 'and':
+            self.next()
+            children.append(self.parse_atom())
+        return _combine(And, children)
+
+    def parse_one_of(self):
+        # "one of A, B, or C" groups the whole list, even under an enclosing 'and'
+        children = [self.parse_atom()]
+        while self.peek() == 'or':
+            self.next()
+            children.append(self.parse_atom())
+        return _combine(Or, children)
+
+    def parse_atom(self):
+        # Tolerate doubled or dangling connectives ("A, or B", "A and")
+        while self.peek() in ('and', 'or'):
+            self.next()
+        kind = self.peek()
+        if kind == 'lparen':
+            self.next()
+            node = self.parse_or()
+            if self.peek() == 'rparen':
+                self.next()
+        elif kind == 'course':
+            match = COURSE_PATTERN.match(self.next()[1])
+            node = Course(match.group(1), match.group(2))
+        elif kind == 'word':
+            words = []
+            while self.peek() == 'word':
+                words.append(self.next()[1])
+            if self.peek() in ('course', 'lparen'):
+                if [word.lower() for word in words[-2:]] == ['one', 'of']:
+                    return self.parse_one_of()
+                # Other leading qualifier, e.g. "Implied sequence:"
+                return self.parse_atom()
+            node = Other(' '.join(words))
+        else:
+            return None
+        # Trailing qualifier such as "with a minimum grade of D"
+        while self.peek() == 'word':
+            self.next()
+        return node
+
+
+def _split_clauses(tokens):
+    clauses, current, depth = [], [], 0
+    for token in tokens:
+        if token[0] == 'lparen':
+            depth += 1
+        elif token[0] == 'rparen':
+            depth = max(0, depth - 1)
+        if token[0] == 'semi' and depth == 0:
+            clauses.append(current)
+            current = []
+        else:
+            current.append(token)
+    clauses.append(current)
+    return clauses
+
+
+@lru_cache(maxsize=16384)
+def _parse_text(text):
+    nodes = []
+    for clause in _split_clauses(tokenize(text)):
+        head = ' '.join(value for _, value in clause[:3]).lower()
+        if not clause or head.startswith(EXCLUDED_CLAUSES):
+            continue
+        nodes.append(_Parser(_resolve_commas(clause)).parse())
+    return _combine(And, nodes)
+
+
+def parse_prerequisites(text):
+    """
+    Parse prerequisite text into an expression tree.
+
+    Returns:
+        Course, Other, And or Or node, or None for empty/missing text
+    """
+    if text is None or not isinstance(text, str) or not text.strip():
+        return None
+    return _parse_text(text)
+
+
+def parse_many(texts):
+    """
+    Parse a whole column of prerequisite strings.
+
+    Repeated strings are parsed once. Accepts any iterable (list, Series);
+    returns a list of trees aligned with the input.
+    """
+    if isinstance(texts, pd.Series):
+        texts = texts.tolist()
+    seen = {}
+    trees = []
+    for text in texts:
+        key = text if isinstance(text, str) else None
+        if key not in seen:
+            seen[key] = parse_prerequisites(key)
+        trees.append(seen[key])
+    return trees
+
+
+def must_have_and_optional(tree):
+    """
+    Flatten a tree into (must_have, optional) course lists.
+
+    Courses that are direct operands of the top-level AND (or the whole tree
+    if it is a single course) are must-have; every other course appears in
+    some alternative and is optional.
+    """
+    if tree is None:
+        return [], []
+    if isinstance(tree, Course):
+        return [str(tree)], []
+    must_have = []
+    if isinstance(tree, And):
+        must_have = [str(child) for child in tree.children if isinstance(child, Course)]
+    optional = [str(course) for course in tree.courses() if str(course) not in must_have]
+    return must_have, optional
@@ -0,0 +1,368 @@
+"""
+Local query service for the prerequisite graph.
+
+Every view otherwise means building a whole page. This loads a catalog once
+(the same inputs as gen_network.py), builds the graph, the closure index and
+the search postings, and answers JSON queries over HTTP:
+
+    GET  /courses                                   every course id
+    GET  /course?id=CS 4641                         one course and its direct prerequisites
+    GET  /subgraph?course=CS 4641&direction=up&depth=2
+    GET  /ancestors?course=CS 4641                  /descendants?course=...
+    GET  /search?q=machine learn&limit=10
+    POST /reload                                    re-read the catalog
+    GET  /stats                                     catalog and cache counters
+
+    python3 query_service.py --university --port 8765
+
+Courses can be given by node id or by code ('MATH 1552' on the MATH page,
+whose ids are bare numbers), in any case. Subgraphs follow the full
+prerequisite relation (direction up, down or both, depth hops or the whole
+closure) and list every direct prerequisite pair between their courses,
+with drawn set on the ones the page draws. Search matches word prefixes,
+like the page's search box, without its misspelling fallback.
+
+Response bodies are kept encoded in an LRU cache keyed by the request path
+and query. A reload builds the new catalog off the event loop, swaps it in
+and clears the cache, so no answer from the old catalog is served after it.
+load_test.py replays a mix of queries against a running service.
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import time
+from collections import OrderedDict
+
+from aiohttp import web
+
+from edge_selection import load_edge_rules
+from gen_network import (build_graph, catalog_path, load_catalog, load_fallback, load_university_catalog,
+                         prerequisite_closure)
+from graph_core import CompactGraph
+from search_index import term_postings, tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 4096
+
+# Same ranking as search.js: higher for a match in the code than in the
+# title, professors or description, doubled for an exact term
+FIELD_WEIGHTS = (8, 4, 2, 1)
+MAX_PREFIX_TERMS = 200
+MAX_RESULTS = 50
+
+DIRECTIONS = ('up', 'down', 'both')
+
+
+class QueryError(Exception):
+    """A request the catalog can't answer; status is the HTTP status to reply with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    """Encoded responses by key, dropping the least recently used past maxsize."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        body = self.entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        self.entries[key] = body
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {'size': len(self.entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+
+def load_graph(catalog=None, university=False):
+    """The graph gen_network.py would draw for these inputs (before layout)."""
+    if university:
+        return build_graph(load_university_catalog())
+    catalog = catalog or catalog_path('MATH')
+    df = load_catalog(catalog)
+    fallback = None
+    rules = None
+    if catalog.lower().find('math') != -1:
+        fallback = load_fallback()
+        rules = load_edge_rules('MATH')
+    return build_graph(df, fallback, rules)
+
+
+class CatalogIndex:
+    """Everything the queries read, built once per catalog load."""
+
+    def __init__(self, net):
+        self.net = net
+        self.closure = prerequisite_closure(net)
+        # The full relation as its own CSR graph, for depth-limited walks
+        self.relation = CompactGraph.from_edges(net.nodes, net.graph.get('prerequisites', net.edges))
+        self.drawn = set(net.edges)
+
+        count = net.number_of_nodes()
+        codes = net.columns.get('code') or [None] * count
+        self.codes = [code if isinstance(code, str) else str(node) for code, node in zip(codes, net.nodes)]
+        self.titles = net.columns.get('label') or [None] * count
+        self.colors = net.columns.get('color') or [None] * count
+        self.descriptions = net.columns.get('description') or [None] * count
+        self.professors = net.columns.get('professors') or [None] * count
+
+        # Ids and codes, case and spacing folded
+        self.lookup = {}
+        for node, code in zip(net.nodes, self.codes):
+            self.lookup[_fold(code)] = node
+        for node in net.nodes:
+            self.lookup[_fold(node)] = node
+
+        self.postings = term_postings(self.codes, self.titles, self.professors, self.descriptions)
+        self.terms = sorted(self.postings)
+
+    @classmethod
+    def load(cls, catalog=None, university=False):
+        start = time.perf_counter()
+        index = cls(load_graph(catalog, university))
+        logger.info("Loaded %d courses, %d prerequisite pairs in %.2fs", index.net.number_of_nodes(),
+                    index.relation.number_of_edges(), time.perf_counter() - start)
+        return index
+
+    def resolve(self, course):
+        """Node id for a course id or code, or QueryError 404."""
+        if not course:
+            raise QueryError("missing course")
+        node = self.lookup.get(_fold(course))
+        if node is None:
+            raise QueryError(f"unknown course {course!r}", status=404)
+        return node
+
+    def record(self, node):
+        i = self.net.index[node]
+        return {'id': node, 'code': self.codes[i], 'title': self.titles[i], 'color': self.colors[i]}
+
+    def course(self, course):
+        node = self.resolve(course)
+        i = self.net.index[node]
+        record = self.record(node)
+        description = self.descriptions[i]
+        professors = self.professors[i]
+        record['description'] = description if isinstance(description, str) else ''
+        record['professors'] = professors if isinstance(professors, str) else ''
+        record['prerequisites'] = self.relation.predecessors(node)
+        record['leads_to'] = self.relation.successors(node)
+        record['ancestor_count'] = self.closure.ancestor_count(node)
+        record['descendant_count'] = self.closure.descendant_count(node)
+        return record
+
+    def neighborhood(self, node, direction='both', depth=None):
+        """Courses within depth prerequisite hops of node (the whole closure without a depth)."""
+        if depth is None:
+            found = []
+            if direction in ('up', 'both'):
+                found += self.closure.ancestors(node)
+            if direction in ('down', 'both'):
+                found += self.closure.descendants(node)
+            return [node] + found
+        steps = []
+        if direction in ('up', 'both'):
+            steps.append(self.relation.predecessors)
+        if direction in ('down', 'both'):
+            steps.append(self.relation.successors)
+        found = [node]
+        for step in steps:
+            seen = {node}
+            frontier = [node]
+            for _ in range(depth):
+                frontier = [near for course in frontier for near in step(course) if near not in seen]
+                frontier = list(dict.fromkeys(frontier))
+                seen.update(frontier)
+                found += frontier
+                if not frontier:
+                    break
+        return found
+
+    def subgraph(self, course, direction='both', depth=None):
+        if direction not in DIRECTIONS:
+            raise QueryError(f"direction must be one of {', '.join(DIRECTIONS)}")
+        node = self.resolve(course)
+        members = list(dict.fromkeys(self.neighborhood(node, direction, depth)))
+        kept = set(members)
+        edges = []
+        for member in members:
+            for prereq in self.relation.predecessors(member):
+                if prereq in kept:
+                    edges.append({'from': prereq, 'to': member, 'drawn': (prereq, member) in self.drawn})
+        return {'course': node, 'direction': direction, 'depth': depth,
+                'nodes': [self.record(member) for member in members], 'edges': edges}
+
+    def ancestors(self, course):
+        node = self.resolve(course)
+        ancestors = self.closure.ancestors(node)
+        return {'course': node, 'ancestors': ancestors, 'count': len(ancestors)}
+
+    def descendants(self, course):
+        node = self.resolve(course)
+        descendants = self.closure.descendants(node)
+        return {'course': node, 'descendants': descendants, 'count': len(descendants)}
+
+    def prefix_terms(self, word):
+        start = bisect.bisect_left(self.terms, word)
+        found = []
+        for term in self.terms[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(word):
+                break
+            found.append(term)
+        return found
+
+    def search(self, query, limit=10):
+        """Courses matching a prefix of every word of query, best first."""
+        words = tokens(query)
+        if not words:
+            return {'query': query, 'total': 0, 'results': []}
+        totals = None
+        for word in words:
+            scores = {}
+            for term in self.prefix_terms(word):
+                bonus = 2 if term == word else 1
+                for doc, field in self.postings[term].items():
+                    score = FIELD_WEIGHTS[field] * bonus
+                    if score > scores.get(doc, 0):
+                        scores[doc] = score
+            if totals is None:
+                totals = scores
+            else:
+                totals = {doc: total + scores[doc] for doc, total in totals.items() if doc in scores}
+            if not totals:
+                break
+        ranked = sorted(totals, key=lambda doc: (-totals[doc], doc))
+        return {'query': query, 'total': len(ranked),
+                'results': [self.record(self.net.nodes[doc]) for doc in ranked[:limit]]}
+
+
+def _fold(course):
+    return ' '.join(str(course).split()).upper()
+
+
+def _int_param(query, name, default=None, minimum=0, maximum=None):
+    value = query.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise QueryError(f"{name} must be an integer") from None
+    if number < minimum or (maximum is not None and number > maximum):
+        raise QueryError(f"{name} must be between {minimum} and {maximum}" if maximum is not None
+                         else f"{name} must be at least {minimum}")
+    return number
+
+
+# Query handlers: (CatalogIndex, query) -> JSON-able answer
+QUERIES = {
+    '/courses': lambda index, query: {'courses': index.net.nodes},
+    '/course': lambda index, query: index.course(query.get('id') or query.get('course')),
+    '/subgraph': lambda index, query: index.subgraph(
+        query.get('course'), query.get('direction', 'both'), _int_param(query, 'depth')),
+    '/ancestors': lambda index, query: index.ancestors(query.get('course')),
+    '/descendants': lambda index, query: index.descendants(query.get('course')),
+    '/search': lambda index, query: index.search(
+        query.get('q', ''), _int_param(query, 'limit', 10, minimum=1, maximum=MAX_RESULTS)),
+}
+
+
+def _json(body, status=200):
+    return web.Response(body=body, status=status, content_type='application/json')
+
+
+def _encode(answer):
+    return json.dumps(answer, separators=(',', ':')).encode('utf-8')
+
+
+class QueryService:
+    def __init__(self, catalog=None, university=False, cache_size=CACHE_SIZE):
+        self.catalog = catalog
+        self.university = university
+        self.index = CatalogIndex.load(catalog, university)
+        self.cache = LRUCache(cache_size)
+        self.generation = 1
+        self.loaded_at = time.time()
+        self.requests = 0
+        self._reloading = asyncio.Lock()
+
+    async def query(self, request):
+        self.requests += 1
+        key = (request.path, tuple(sorted(request.query.items())))
+        body = self.cache.get(key)
+        if body is not None:
+            return _json(body)
+        try:
+            answer = QUERIES[request.path](self.index, request.query)
+        except QueryError as e:
+            return _json(_encode({'error': str(e)}), status=e.status)
+        body = _encode(answer)
+        self.cache.put(key, body)
+        return _json(body)
+
+    async def reload(self, request):
+        async with self._reloading:
+            start = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            index = await loop.run_in_executor(None, CatalogIndex.load, self.catalog, self.university)
+            # Swap and clear together; nothing awaits in between
+            self.index = index
+            self.cache.clear()
+            self.generation += 1
+            self.loaded_at = time.time()
+        return _json(_encode({'generation': self.generation, 'courses': index.net.number_of_nodes(),
+                              'seconds': round(time.perf_counter() - start, 3)}))
+
+    async def stats(self, request):
+        return _json(_encode({
+            'generation': self.generation,
+            'loaded_at': self.loaded_at,
+            'courses': self.index.net.number_of_nodes(),
+            'prerequisite_pairs': self.index.relation.number_of_edges(),
+            'requests': self.requests,
+            'cache': self.cache.stats(),
+        }))
+
+    def app(self):
+        app = web.Application()
+        for path in QUERIES:
+            app.router.add_get(path, self.query)
+        app.router.add_post('/reload', self.reload)
+        app.router.add_get('/stats', self.stats)
+        return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve prerequisite subgraph, closure and search queries as JSON")
+    parser.add_argument("--catalog", default=None, help="Scraped course records (default: the MATH catalog)")
+    parser.add_argument("--university", action="store_true", help="Use the whole-university catalog data2/gt_courses.csv")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="Responses kept in the LRU cache")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    service = QueryService(args.catalog, args.university, args.cache_size)
+    web.run_app(service.app(), host=args.host, port=args.port, access_log=None)
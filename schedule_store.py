@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Columnar store for per-term schedule snapshots.
+
+Each term is one Parquet partition, data/schedule_store/year=YYYY/term=TERM/,
+written once at ingestion. course_code and instructor are dictionary encoded
+and rows are sorted by course_code, so row-group statistics let the reader
+skip data for courses that were not asked for. Reads go through a
+memory-mapped filesystem with column projection and predicate pushdown on
+course_code/term/year, so enrichment only touches the columns and terms it
+needs.
+
+Usage:
+    python schedule_store.py ingest data/*.csv     # add or replace terms
+    python schedule_store.py list                  # show stored terms
+"""
+import os
+import shutil
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs
+import pyarrow.parquet as pq
+
+STORE_PATH = 'data/schedule_store'
+
+DICTIONARY_COLUMNS = ['course_code', 'instructor']
+
+# Partition keys stay strings, as read_term_files gives them ('08' is not 8)
+PARTITIONING = ds.partitioning(pa.schema([('year', pa.string()), ('term', pa.string())]), flavor='hive')
+
+def term_from_filename(file):
+    """Schedule CSVs are named like <prefix>_<term>_<year>_<...>.csv."""
+    parts = os.path.basename(file).split('_')
+    return parts[1], parts[2]
+
+def partition_path(store, term, year):
+    return os.path.join(store, f'year={year}', f'term={term}')
+
+def ingest_term(csv_path, store=STORE_PATH, row_group_size=16384):
+    """
+    Write one term CSV as its own partition. Other partitions are not touched;
+    re-ingesting a term replaces only that term.
+    """
+    term, year = term_from_filename(csv_path)
+    df = pd.read_csv(csv_path).sort_values('course_code', kind='stable')
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for column in DICTIONARY_COLUMNS:
+        if column in table.column_names:
+            index = table.schema.get_field_index(column)
+            table = table.set_column(index, column, table[column].cast(pa.string()).dictionary_encode())
+
+    out_dir = partition_path(store, term, year)
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+    pq.write_table(table, os.path.join(out_dir, 'part-0.parquet'), row_group_size=row_group_size)
+    return term, year, table.num_rows
+
+def open_store(store=STORE_PATH):
+    return ds.dataset(store, format='parquet', partitioning=PARTITIONING,
+                      filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True))
+
+def load_offerings(store=STORE_PATH, columns=None, course_codes=None, terms=None):
+    """
+    Read offerings from the store.
+
+    Args:
+        columns: Columns to read (partition columns term/year are always available)
+        course_codes: Only these course codes (pushed down to row groups)
+        terms: Only these (term, year) pairs (pushed down to partitions)
+
+    Returns:
+        DataFrame with plain string columns, term and year included
+    """
+    dataset = open_store(store)
+    predicate = None
+    if course_codes is not None:
+        predicate = ds.field('course_code').isin(list(course_codes))
+    if terms is not None:
+        term_filter = None
+        for term, year in terms:
+            clause = (ds.field('term') == str(term)) & (ds.field('year') == str(year))
+            term_filter = clause if term_filter is None else term_filter | clause
+        predicate = term_filter if predicate is None else predicate & term_filter
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + ['term', 'year']))
+
+    df = dataset.to_table(columns=columns, filter=predicate).to_pandas()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+    return df
+
+def list_terms(store=STORE_PATH):
+    if not os.path.isdir(store):
+        return []
+    terms = []
+    for year_dir in sorted(os.listdir(store)):
+        for term_dir in sorted(os.listdir(os.path.join(store, year_dir))):
+            terms.append((term_dir.split('=', 1)[1], year_dir.split('=', 1)[1]))
+    return terms
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('ingest', 'list'):
+        print("Usage: python schedule_store.py ingest <term.csv>... | list")
+        sys.exit(1)
+
+    if sys.argv[1] == 'ingest':
+        for csv_path in sys.argv[2:]:
+            term, year, rows = ingest_term(csv_path)
+            print(f"{csv_path}: {rows} rows -> {term} {year}")
+    else:
+        for term, year in list_terms():
+            print(f"{term} {year}")
+
+if __name__ == "__main__":
+    main()
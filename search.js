@@ -0,0 +1,220 @@
+// Course search box for the network pages, over the index from search_index.py.
+// emit.py inlines this after viewer.js when searchIndex is embedded.
+
+var searchBox = document.createElement('div');
+searchBox.style.position = 'absolute';
+searchBox.style.top = '10px';
+searchBox.style.left = '10px';
+searchBox.style.zIndex = '99998';
+searchBox.style.fontFamily = 'sans-serif';
+searchBox.style.fontSize = '14px';
+searchBox.innerHTML = '<input id="courseSearch" type="search" placeholder="Search courses" autocomplete="off" '
+    + 'style="width: 260px; padding: 6px; border: 1px solid #ccc; border-radius: 4px;">'
+    + '<div id="courseSearchResults" style="background-color: #f8f8f8; border: 1px solid #ccc; '
+    + 'border-radius: 4px; display: none; max-width: 360px;"></div>';
+document.body.appendChild(searchBox);
+
+var searchInput = document.getElementById('courseSearch');
+var searchResults = document.getElementById('courseSearchResults');
+
+// Courses are the first searchIndex.count node records, in page order
+var searchIds = nodes.getIds().slice(0, searchIndex.count);
+
+// Terms and postings, decoded once: postings of term t are
+// postingValues[postingStart[t]:postingStart[t + 1]], each doc << 2 | field
+var searchTerms = [];
+(searchIndex.terms ? searchIndex.terms.split('\n') : []).forEach(function (coded, t) {
+    // Front coded: shared prefix length with the previous term, then the rest
+    var shared = coded.charCodeAt(0) - 48;
+    searchTerms.push((t ? searchTerms[t - 1].substr(0, shared) : '') + coded.substr(1));
+});
+var postingStart = new Uint32Array(searchTerms.length + 1);
+var postingValues = (function () {
+    var bytes = Uint8Array.from(atob(searchIndex.postings), function (c) { return c.charCodeAt(0); });
+    var values = new Uint32Array(bytes.length);
+    var position = 0;
+    var count = 0;
+    function next() {
+        var value = 0;
+        var shift = 0;
+        var b;
+        do {
+            b = bytes[position++];
+            value += (b & 0x7F) * Math.pow(2, shift);
+            shift += 7;
+        } while (b & 0x80);
+        return value;
+    }
+    for (var t = 0; t < searchTerms.length; t++) {
+        postingStart[t] = count;
+        var n = next();
+        var value = 0;
+        for (var k = 0; k < n; k++) {
+            value += next();
+            values[count++] = value;
+        }
+    }
+    postingStart[searchTerms.length] = count;
+    return values.subarray(0, count);
+})();
+
+// Words tokens() leaves out of the index, so a query keeps matching past them
+var searchStopwords = {};
+(searchIndex.stopwords ? searchIndex.stopwords.split(' ') : []).forEach(function (word) {
+    searchStopwords[word] = true;
+});
+
+// Higher for a match in the code than in the title, professors or description
+var FIELD_WEIGHTS = [8, 4, 2, 1];
+var MAX_PREFIX_TERMS = 200;
+var MAX_RESULTS = 10;
+
+function lowerBound(word) {
+    var lo = 0;
+    var hi = searchTerms.length;
+    while (lo < hi) {
+        var mid = (lo + hi) >> 1;
+        if (searchTerms[mid] < word) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+function prefixTerms(word) {
+    var found = [];
+    for (var t = lowerBound(word); t < searchTerms.length && found.length < MAX_PREFIX_TERMS; t++) {
+        if (searchTerms[t].lastIndexOf(word, 0) !== 0) break;
+        found.push(t);
+    }
+    return found;
+}
+
+var trigramTerms = null;
+
+function trigrams(word) {
+    var padded = ' ' + word + ' ';
+    var grams = [];
+    for (var i = 0; i + 3 <= padded.length; i++) grams.push(padded.substr(i, 3));
+    return grams;
+}
+
+function similarTerms(word) {
+    // Terms sharing most of the word's trigrams, for misspelled queries
+    if (trigramTerms === null) {
+        trigramTerms = {};
+        searchTerms.forEach(function (term, t) {
+            trigrams(term).forEach(function (gram) {
+                (trigramTerms[gram] = trigramTerms[gram] || []).push(t);
+            });
+        });
+    }
+    var grams = trigrams(word);
+    var shared = {};
+    grams.forEach(function (gram) {
+        (trigramTerms[gram] || []).forEach(function (t) {
+            shared[t] = (shared[t] || 0) + 1;
+        });
+    });
+    var needed = Math.max(1, Math.ceil(grams.length * 0.6));
+    return Object.keys(shared).filter(function (t) { return shared[t] >= needed; })
+        .sort(function (a, b) { return shared[b] - shared[a]; })
+        .slice(0, MAX_PREFIX_TERMS).map(Number);
+}
+
+// Per-course scratch arrays, reset after every search
+var docCount = searchIndex.count;
+var totalScore = new Float64Array(docCount);
+var wordScore = new Float64Array(docCount);
+var matchedWords = new Uint16Array(docCount);
+
+function searchCourses(query) {
+    var words = (query.toLowerCase().match(/[a-z0-9]+/g) || []).filter(function (word) {
+        return !searchStopwords.hasOwnProperty(word);
+    });
+    var candidates = [];
+    words.forEach(function (word, w) {
+        var terms = prefixTerms(word);
+        if (terms.length === 0 && word.length >= 3) terms = similarTerms(word);
+        var touched = [];
+        terms.forEach(function (t) {
+            // An exact term counts more than one the word is only a prefix of
+            var bonus = searchTerms[t] === word ? 2 : 1;
+            for (var k = postingStart[t]; k < postingStart[t + 1]; k++) {
+                var doc = postingValues[k] >>> 2;
+                var score = FIELD_WEIGHTS[postingValues[k] & 3] * bonus;
+                if (wordScore[doc] === 0) touched.push(doc);
+                if (score > wordScore[doc]) wordScore[doc] = score;
+            }
+        });
+        // A course stays a candidate only if it matched every word so far
+        touched.forEach(function (doc) {
+            if (matchedWords[doc] === w) {
+                matchedWords[doc] = w + 1;
+                totalScore[doc] += wordScore[doc];
+            }
+            wordScore[doc] = 0;
+        });
+        if (w === 0) candidates = touched;
+    });
+    var results = candidates.filter(function (doc) { return matchedWords[doc] === words.length; });
+    results.sort(function (a, b) { return totalScore[b] - totalScore[a] || a - b; });
+    var ids = results.map(function (doc) { return searchIds[doc]; });
+    candidates.forEach(function (doc) {
+        matchedWords[doc] = 0;
+        totalScore[doc] = 0;
+    });
+    return ids;
+}
+
+function drawn(id) {
+    return typeof lod === 'undefined' ? nodes.get(id) !== null : lod.nodes.get(id) !== null;
+}
+
+function jumpTo(id) {
+    // Open its cluster first on pages that start collapsed (lod.js)
+    if (typeof lod !== 'undefined') lod.reveal(id);
+    network.focus(id, {scale: 1.0, animation: {duration: 400}});
+}
+
+function showMatches(matches) {
+    searchResults.innerHTML = '';
+    matches.slice(0, MAX_RESULTS).forEach(function (id) {
+        var row = document.createElement('div');
+        var node = nodes.get(id);
+        row.textContent = id + (node && node.label && node.label !== id ? ' - ' + node.label : '');
+        row.style.padding = '4px 6px';
+        row.style.cursor = 'pointer';
+        row.addEventListener('mousedown', function (event) {
+            event.preventDefault();
+            jumpTo(id);
+            network.selectNodes([id]);
+        });
+        searchResults.appendChild(row);
+    });
+    searchResults.style.display = matches.length ? 'block' : 'none';
+}
+
+searchInput.addEventListener('input', function () {
+    var matches = searchCourses(searchInput.value);
+    showMatches(matches);
+    if (typeof lod !== 'undefined') {
+        // Open the clusters of the listed matches only, not of every prefix hit
+        matches.slice(0, MAX_RESULTS).forEach(function (id) { lod.reveal(id); });
+    }
+    // Highlight every match that is in the drawing
+    network.selectNodes(matches.filter(drawn));
+});
+
+searchInput.addEventListener('keydown', function (event) {
+    if (event.key === 'Enter') {
+        var matches = searchCourses(searchInput.value);
+        if (matches.length) jumpTo(matches[0]);
+    } else if (event.key === 'Escape') {
+        searchInput.value = '';
+        showMatches([]);
+        network.unselectAll();
+    }
+});
+
+searchInput.addEventListener('blur', function () {
+    searchResults.style.display = 'none';
+});
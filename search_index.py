@@ -0,0 +1,122 @@
+"""
+Prebuilt search index for the network pages.
+
+Built once per page from each course's code, title, description and
+professors, and embedded as packed JSON for search.js:
+
+    {"count": 5815,                          courses indexed
+     "terms": "0algebra\\n2alysis\\n...",    sorted, front coded
+     "postings": "<base64>",
+     "stopwords": "a an and ..."}            words left out of terms and queries
+
+Documents are the first count node records of the page, in graph order, so
+the index doesn't repeat the course ids. Terms are newline separated, each
+written as the length of the prefix it shares with the previous term (one
+character, '0' + length, at most 9) followed by the rest of it.
+
+For every term, in order, postings holds a varint count followed by that
+many varint gaps between consecutive (doc << 2 | field) values, where doc
+is the course's position in the graph and field is 0 code, 1 title, 2
+professors, 3 description (a course listed under several fields for one
+term keeps the strongest). Gap-encoded varints keep the postings to about
+a byte per entry, and the page decodes them into typed arrays once.
+
+Stopwords are dropped from the indexed text and, in the page, from the
+query words too, since nothing would match them; search.js reads the list
+from the index rather than keeping its own copy.
+
+The page does prefix lookups with a binary search over the sorted terms,
+and falls back to trigram matching over the terms (built in the page from
+the term list) for misspellings.
+"""
+import base64
+import re
+
+FIELDS = ('code', 'title', 'professors', 'description')
+
+_TAG = re.compile(r'<[^>]+>')
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from in into is it its of on or such that the their this to with'.split())
+
+
+def tokens(text):
+    """Lowercase alphanumeric words of text (HTML tags removed), without stopwords."""
+    if not isinstance(text, str):
+        return []
+    return [token for token in _TOKEN.findall(_TAG.sub(' ', text).lower()) if token not in STOPWORDS]
+
+
+def _varint(value, out):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def term_postings(codes, titles, professors, descriptions):
+    """
+    {term: {doc: field}} over the four fields of every course, doc being its
+    position in the lists. A course listed under several fields for one term
+    keeps the strongest (lowest) field.
+    """
+    postings = {}
+    for doc, texts in enumerate(zip(codes, titles, professors, descriptions)):
+        # Walk fields strongest last, so a term keeps the strongest field it appears in
+        for field in reversed(range(len(FIELDS))):
+            words = tokens(texts[field])
+            if field == 3:
+                # Course numbers in descriptions are mostly prerequisites, not this course
+                words = [word for word in words if not word.isdigit()]
+            if field == 0:
+                # 'MATH 1552' also matches 'math1552'
+                words.append(''.join(words))
+            for word in words:
+                postings.setdefault(word, {})[doc] = field
+    postings.pop('', None)
+    return postings
+
+
+def build_search_index(net):
+    """
+    Index export for a CompactGraph.
+
+    Reads the label (title) column and pops the code ('MATH 1552'),
+    description and professors columns, which the page has no other use
+    for. Nodes without a code are indexed under their id.
+    """
+    count = net.number_of_nodes()
+    codes = net.pop_column('code') or [None] * count
+    descriptions = net.pop_column('description') or [None] * count
+    professors = net.pop_column('professors') or [None] * count
+    titles = net.columns.get('label') or [None] * count
+    codes = [code if isinstance(code, str) else str(node) for code, node in zip(codes, net.nodes)]
+
+    postings = term_postings(codes, titles, professors, descriptions)
+
+    terms = sorted(postings)
+    coded = []
+    previous_term = ''
+    for term in terms:
+        shared = 0
+        limit = min(len(term), len(previous_term), 9)
+        while shared < limit and term[shared] == previous_term[shared]:
+            shared += 1
+        coded.append(chr(ord('0') + shared) + term[shared:])
+        previous_term = term
+
+    packed = bytearray()
+    for term in terms:
+        values = sorted(doc << 2 | field for doc, field in postings[term].items())
+        _varint(len(values), packed)
+        previous = 0
+        for value in values:
+            _varint(value - previous, packed)
+            previous = value
+    return {
+        'count': count,
+        'terms': '\n'.join(coded),
+        'postings': base64.b64encode(bytes(packed)).decode('ascii'),
+        'stopwords': ' '.join(sorted(STOPWORDS)),
+    }
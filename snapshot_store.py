@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Multi-term catalog snapshots stored as deltas.
+
+Each ingested term only stores what changed since the term before it. A
+course record is split into its fields (title, description, prereq_text,
+prerequisites, ...) and every field value is stored once, by content hash,
+in the blob table; a term's delta lists the (subject, course, field, hash)
+rows that differ from the previous term:
+
+    data/catalog_snapshots/deltas/term=202502/part-0.parquet   subject, course, field, hash
+    data/catalog_snapshots/blobs/term=202502/part-0.parquet    hash, value (JSON)
+
+A field that disappears gets a row with a null hash, and a course that is
+dropped from the catalog gets one row with an empty field name. Unchanged
+descriptions and prerequisites therefore cost nothing in later terms, and
+a value that comes back (e.g. a reverted description) is not stored again.
+
+The catalog as of a term is the last row per (subject, course, field) over
+the deltas up to that term. Deltas are sorted by subject and course, so
+asking for a few subjects only reads their row groups, and blobs are read
+with a pushed-down hash filter.
+
+Usage:
+    python snapshot_store.py ingest 202502 data2/gt_MATH_courses.parquet data2/gt_CS_courses.parquet
+    python snapshot_store.py list
+    python snapshot_store.py diff 202408 202502 [--subject MATH]
+    python snapshot_store.py show 202502 [--subject MATH] [--out math_202502.parquet]
+    python snapshot_store.py --store data/catalog_snapshots/website ingest 202502 \
+        data2/gt_math_courses_20250121_034050.csv
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs
+import pyarrow.parquet as pq
+
+from course_records import read_records, write_records
+
+STORE_PATH = 'data/catalog_snapshots'
+# Math website snapshots (gt_math_courses_<date>.csv), kept apart from the OSCAR catalogs
+WEBSITE_STORE = 'data/catalog_snapshots/website'
+
+REMOVED = ''
+
+_PARTITIONING = ds.partitioning(pa.schema([('term', pa.string())]), flavor='hive')
+_DELTA_SCHEMA = pa.schema([('subject', pa.string()), ('course', pa.string()),
+                           ('field', pa.string()), ('hash', pa.string())])
+_BLOB_SCHEMA = pa.schema([('hash', pa.string()), ('value', pa.string())])
+
+
+def _json_value(value):
+    if hasattr(value, 'tolist'):
+        value = value.tolist()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return value
+
+
+def value_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+def course_keys(df):
+    """
+    (subject, course) per row: from department/course_number columns when
+    present (math website snapshot), else from 'SUBJ 1234 - Title' titles.
+    """
+    if 'course_number' in df.columns and 'department' in df.columns:
+        # A website snapshot is one department's listing; a few rows leave the department blank
+        department = df['department'].fillna(df['department'].mode().iloc[0])
+        return list(zip(department.astype(str), df['course_number'].astype(str)))
+    code = df['title'].str.split(' - ').str[0].str.split()
+    return list(zip(code.str[0], code.str[1]))
+
+
+def split_records(df):
+    """
+    Field rows and blobs for a catalog.
+
+    Returns:
+        (DataFrame of subject, course, field, hash; dict of hash -> JSON value)
+    """
+    rows = []
+    blobs = {}
+    columns = list(df.columns)
+    values = [df[column].tolist() for column in columns]
+    for i, (subject, course) in enumerate(course_keys(df)):
+        if not isinstance(subject, str) or not isinstance(course, str):
+            continue
+        for column, column_values in zip(columns, values):
+            text = json.dumps(_json_value(column_values[i]), sort_keys=True, ensure_ascii=False)
+            digest = value_hash(text)
+            blobs[digest] = text
+            rows.append((subject, course, column, digest))
+    state = pd.DataFrame(rows, columns=['subject', 'course', 'field', 'hash'])
+    # A course listed twice keeps its last row, as in build_graph
+    return state.drop_duplicates(['subject', 'course', 'field'], keep='last'), blobs
+
+
+def list_terms(store=STORE_PATH):
+    directory = os.path.join(store, 'deltas')
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name.split('=', 1)[1] for name in os.listdir(directory) if name.startswith('term='))
+
+
+def _dataset(store, table):
+    return ds.dataset(os.path.join(store, table), format='parquet', partitioning=_PARTITIONING,
+                      filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True))
+
+
+def term_state(term, store=STORE_PATH, subjects=None):
+    """
+    Field hashes of every course as of term (the latest term at or before it).
+
+    Returns:
+        DataFrame of subject, course, field, hash
+    """
+    terms = [t for t in list_terms(store) if term is None or t <= term]
+    if not terms:
+        return pd.DataFrame(columns=['subject', 'course', 'field', 'hash'])
+    predicate = ds.field('term').isin(terms)
+    if subjects is not None:
+        predicate &= ds.field('subject').isin(list(subjects))
+    df = _dataset(store, 'deltas').to_table(filter=predicate).to_pandas()
+    df['term'] = df['term'].astype(str)
+    df = df.sort_values('term', kind='stable')
+
+    # Rows from before a course was last removed no longer apply
+    removed = df[df['field'] == REMOVED].groupby(['subject', 'course'])['term'].max().rename('removed')
+    if len(removed):
+        df = df.join(removed, on=['subject', 'course'])
+        df = df[df['removed'].isna() | (df['term'] > df['removed'].fillna(''))]
+    df = df[df['field'] != REMOVED].drop_duplicates(['subject', 'course', 'field'], keep='last')
+    df = df[df['hash'].notna()]
+    return df[['subject', 'course', 'field', 'hash']].sort_values(['subject', 'course']).reset_index(drop=True)
+
+
+def load_blobs(hashes, store=STORE_PATH):
+    """hash -> decoded value for the given hashes."""
+    hashes = list(set(hashes))
+    if not hashes:
+        return {}
+    table = _dataset(store, 'blobs').to_table(columns=['hash', 'value'], filter=ds.field('hash').isin(hashes))
+    return {digest: json.loads(text) for digest, text in zip(table['hash'].to_pylist(), table['value'].to_pylist())}
+
+
+def as_of(term, store=STORE_PATH, subjects=None):
+    """
+    The catalog as of term, as course records (one row per course, one
+    column per field). term=None gives the latest one.
+    """
+    state = term_state(term, store, subjects)
+    blobs = load_blobs(state['hash'], store)
+    state['value'] = state['hash'].map(blobs)
+    fields = list(dict.fromkeys(state['field']))
+    df = state.pivot(index=['subject', 'course'], columns='field', values='value')
+    return df.reindex(columns=fields).reset_index(drop=True)
+
+
+def diff(old_term, new_term, store=STORE_PATH, subjects=None):
+    """
+    What changed between two terms.
+
+    Returns:
+        DataFrame of subject, course, change ('added', 'removed' or
+        'changed') and fields (the changed field names)
+    """
+    old = term_state(old_term, store, subjects).set_index(['subject', 'course', 'field'])['hash']
+    new = term_state(new_term, store, subjects).set_index(['subject', 'course', 'field'])['hash']
+    joined = pd.concat([old.rename('old'), new.rename('new')], axis=1)
+    joined = joined[joined['old'].ne(joined['new']) & ~(joined['old'].isna() & joined['new'].isna())]
+
+    old_courses = set(old.index.droplevel('field'))
+    new_courses = set(new.index.droplevel('field'))
+    rows = []
+    for (subject, course), fields in joined.groupby(level=['subject', 'course']):
+        if (subject, course) not in old_courses:
+            change = 'added'
+        elif (subject, course) not in new_courses:
+            change = 'removed'
+        else:
+            change = 'changed'
+        rows.append((subject, course, change, sorted(fields.index.get_level_values('field'))))
+    return pd.DataFrame(rows, columns=['subject', 'course', 'change', 'fields'])
+
+
+def _delta(previous, current, subjects):
+    """Rows turning state previous into current, for the given subjects only."""
+    previous = previous[previous['subject'].isin(subjects)]
+    merged = previous.merge(current, on=['subject', 'course', 'field'], how='outer',
+                            suffixes=('_old', ''), indicator=True)
+    changed = merged[(merged['_merge'] != 'left_only') & merged['hash_old'].ne(merged['hash'])]
+    # Fields gone from a course that is still there get a null hash
+    current_courses = pd.MultiIndex.from_frame(current[['subject', 'course']]).unique()
+    gone = merged[merged['_merge'] == 'left_only']
+    gone_keys = pd.MultiIndex.from_frame(gone[['subject', 'course']])
+    dropped_fields = gone[gone_keys.isin(current_courses)].assign(hash=None)
+    removed = (gone[~gone_keys.isin(current_courses)][['subject', 'course']]
+               .drop_duplicates().assign(field=REMOVED, hash=None))
+    delta = pd.concat([changed[['subject', 'course', 'field', 'hash']],
+                       dropped_fields[['subject', 'course', 'field', 'hash']], removed])
+    return delta.sort_values(['subject', 'course', 'field']).reset_index(drop=True)
+
+
+def _write_partition(store, table, term, df, schema=None):
+    out_dir = os.path.join(store, table, f'term={term}')
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+    pq.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False),
+                   os.path.join(out_dir, 'part-0.parquet'), row_group_size=16384)
+
+
+def _read_partition(store, table, term):
+    return pq.read_table(os.path.join(store, table, f'term={term}', 'part-0.parquet')).to_pandas()
+
+
+def ingest(records, term, store=STORE_PATH):
+    """
+    Store a term's catalog (a DataFrame of course records).
+
+    Only the subjects present in records are replaced for that term; other
+    subjects carry over from the previous term. Re-ingesting a term, or
+    ingesting one older than terms already stored, rewrites the following
+    term's delta so every later as_of stays the same.
+
+    Returns:
+        (changed rows, new blobs)
+    """
+    current, blobs = split_records(records)
+    subjects = sorted(current['subject'].unique())
+    terms = list_terms(store)
+    later = [t for t in terms if t > term]
+    earlier = [t for t in terms if t < term]
+    # Materialized before anything is written, while the old deltas are still in place
+    next_state = term_state(later[0], store, subjects) if later else None
+    previous = term_state(earlier[-1], store, subjects) if earlier else current.iloc[:0]
+    delta = _delta(previous, current, subjects)
+
+    own_blobs = pd.DataFrame(columns=['hash', 'value'])
+    if term in terms:
+        # Re-ingesting: the term's other subjects keep their rows
+        own = _read_partition(store, 'deltas', term)
+        delta = pd.concat([own[~own['subject'].isin(subjects)], delta])
+        own_blobs = _read_partition(store, 'blobs', term)
+    known = set(_dataset(store, 'blobs').to_table(columns=['hash'])['hash'].to_pylist()) if terms else set()
+    new_blobs = pd.DataFrame(sorted((digest, blobs[digest]) for digest in set(delta['hash'].dropna())
+                                    if digest not in known), columns=['hash', 'value'])
+    _write_partition(store, 'deltas', term, delta.sort_values(['subject', 'course']), _DELTA_SCHEMA)
+    _write_partition(store, 'blobs', term, pd.concat([own_blobs, new_blobs]), _BLOB_SCHEMA)
+
+    if later:
+        # The next term was stored against the old predecessor
+        following = _delta(current, next_state, subjects)
+        rest = _read_partition(store, 'deltas', later[0])
+        rest = rest[~rest['subject'].isin(subjects)]
+        _write_partition(store, 'deltas', later[0], pd.concat([rest, following]).sort_values(['subject', 'course']),
+                         _DELTA_SCHEMA)
+    return len(delta), len(new_blobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-term catalog snapshots")
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest_parser = commands.add_parser('ingest', help="Add or replace a term's catalog")
+    ingest_parser.add_argument('term')
+    ingest_parser.add_argument('files', nargs='+', help="Course record files (parquet or csv)")
+    commands.add_parser('list')
+    diff_parser = commands.add_parser('diff', help="Courses changed between two terms")
+    diff_parser.add_argument('old')
+    diff_parser.add_argument('new')
+    diff_parser.add_argument('--subject', action='append')
+    show_parser = commands.add_parser('show', help="Catalog as of a term")
+    show_parser.add_argument('term')
+    show_parser.add_argument('--subject', action='append')
+    show_parser.add_argument('--out', help="Write the records here instead of printing them")
+    parser.add_argument('--store', default=STORE_PATH)
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        records = pd.concat([read_records(path) for path in args.files], ignore_index=True)
+        changed, new_blobs = ingest(records, args.term, args.store)
+        print(f"{args.term}: {len(records)} courses, {changed} changed fields, {new_blobs} new values")
+    elif args.command == 'list':
+        for term in list_terms(args.store):
+            print(term)
+    elif args.command == 'diff':
+        changes = diff(args.old, args.new, args.store, args.subject)
+        for row in changes.itertuples():
+            print(f"{row.subject} {row.course}: {row.change} {', '.join(row.fields)}")
+    else:
+        df = as_of(args.term, args.store, args.subject)
+        if args.out:
+            write_records(df, args.out)
+        else:
+            print(df)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Synthetic catalogs and schedules for benchmarks.
+
+Generates course records in the scraper's schema and per-term schedule
+offerings in the schema of the data/ CSVs, at any size, deterministically
+from a seed. Prerequisite text follows OSCAR's phrasing ("Undergraduate
+Semester level MATH 1552 Minimum Grade of D and (... or ...)"), including
+non-course alternatives and "Credit restriction" clauses. A course only
+names courses generated before it, mostly lower-numbered ones in its own
+subject, so the relation is acyclic.
+
+    catalog = synthetic_catalog(10_000)
+    offerings = synthetic_offerings(catalog, terms=8)
+"""
+import itertools
+import random
+import string
+
+import pandas as pd
+
+WORDS = ('Linear Algebra Calculus Analysis Topology Probability Statistics Algorithms Systems Design '
+         'Theory Methods Applied Advanced Introduction Modeling Networks Structures Dynamics Control '
+         'Optimization Computation Geometry Mechanics Materials Signals Economics Policy History').split()
+
+TERMS = ['fall', 'spring', 'summer']
+
+
+def subject_codes(count):
+    """count distinct 2-4 letter subject codes."""
+    codes = []
+    for length in (4, 3, 2):
+        for letters in itertools.product(string.ascii_uppercase, repeat=length):
+            codes.append(''.join(letters))
+            if len(codes) == count:
+                return codes
+    return codes
+
+
+def course_phrase(code, rng):
+    level = rng.choice(['Undergraduate Semester level', 'Graduate Semester level'])
+    grade = rng.choice(['D', 'C'])
+    return f"{level} {code} Minimum Grade of {grade}"
+
+
+def prerequisite_text(groups, rng):
+    """OSCAR-style text for an AND of OR groups."""
+    clauses = []
+    for group in groups:
+        phrases = [course_phrase(code, rng) for code in group]
+        if rng.random() < 0.1:
+            phrases.append("SAT Mathematics 600")
+        clauses.append(phrases[0] if len(phrases) == 1 else '(' + ' or '.join(phrases) + ')')
+    text = ' and '.join(clauses)
+    if rng.random() < 0.05:
+        text += ' ; Credit restriction: ' + rng.choice(groups)[0]
+    return text
+
+
+def synthetic_catalog(n_courses, seed=0, courses_per_subject=800):
+    """
+    Course records (title, description, prerequisites, prereq_text,
+    must_have_prereqs, optional_prereqs, professors_str, terms_str).
+    """
+    rng = random.Random(seed)
+    subjects = subject_codes(max(1, -(-n_courses // courses_per_subject)))
+    codes = []
+    for i in range(n_courses):
+        subject = subjects[i % len(subjects)]
+        codes.append((subject, i // len(subjects)))
+    # Spread each subject's courses over the 1000-8999 range, in order
+    per_subject = -(-n_courses // len(subjects))
+    step = max(1, 8000 // per_subject)
+    codes = [f"{subject} {1000 + rank * step + rng.randrange(step):04d}" for subject, rank in codes]
+    earlier = {}
+    seen = []
+
+    records = []
+    for code in codes:
+        subject = code.split()[0]
+        # Up to 40 lower-numbered courses of the same subject
+        same = earlier.setdefault(subject, [])[-40:]
+        earlier[subject].append(code)
+        title = ' '.join(rng.sample(WORDS, rng.randint(2, 4)))
+        description = ' '.join(rng.choice(WORDS).lower() for _ in range(rng.randint(20, 60))).capitalize() + '.'
+
+        groups = []
+        if same and rng.random() < 0.7:
+            for _ in range(rng.randint(1, 3)):
+                size = rng.choice([1, 1, 2, 3])
+                pool = same if rng.random() < 0.85 or len(seen) < 5 else rng.sample(seen, 5)
+                groups.append(rng.sample(pool, min(size, len(pool))))
+        must = [group[0] for group in groups if len(group) == 1]
+        optional = [c for group in groups if len(group) > 1 for c in group]
+        seen.append(code)
+        records.append({
+            'title': f"{code} - {title}",
+            'description': description,
+            'prerequisites': list(dict.fromkeys(c for group in groups for c in group)),
+            'prereq_text': prerequisite_text(groups, rng) if groups else None,
+            'must_have_prereqs': must,
+            'optional_prereqs': optional,
+            'professors_str': '',
+            'terms_str': '',
+        })
+    return pd.DataFrame(records)
+
+
+def synthetic_offerings(catalog, terms=8, seed=0, instructors=None):
+    """
+    Schedule rows (course_code, section, instructor, term, year) for the
+    given number of past terms, as read_term_files would return them before
+    prepare_offerings.
+    """
+    rng = random.Random(seed)
+    codes = catalog['title'].str.split(' - ').str[0].tolist()
+    instructors = instructors or [f"{rng.choice(WORDS)} {rng.choice(string.ascii_uppercase)} Smith{i}"
+                                  for i in range(max(10, len(codes) // 5))]
+    rows = []
+    for t in range(terms):
+        term = TERMS[t % len(TERMS)]
+        year = str(2024 - t // len(TERMS))
+        for code in codes:
+            if rng.random() < 0.4:
+                continue
+            for section in string.ascii_uppercase[:rng.randint(1, 3)]:
+                rows.append((code, section, rng.choice(instructors) + ' (P)', term, year))
+    return pd.DataFrame(rows, columns=['course_code', 'section', 'instructor', 'term', 'year'])
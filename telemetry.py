@@ -0,0 +1,223 @@
+"""
+Scrape telemetry.
+
+A Telemetry object is handed to the Fetcher and the scraper and records,
+for a whole run:
+
+    fetch_seconds      latency histogram per request kind (listing, course),
+                       one observation per attempt
+    fetch_bytes        response size histogram per request kind
+    responses          count per (kind, status); failed attempts without a
+                       response count under their exception name
+    retries            attempts beyond the first, per request kind
+    parse_seconds      parse_course_page time histogram
+    queue_depth        requests waiting for a concurrency slot, sampled at
+                       every acquire (last, max and histogram), next to the
+                       in-flight count and the limiter's current limit
+    stage_seconds      wall time of the scrape stages (listing, details,
+                       write) per subject
+
+Each observation can also be streamed as one JSON line (events_path), the
+totals can be written in the Prometheus text format (write_prometheus), and
+summary() gives the end-of-run report that get_all_courses logs:
+
+    python3 scraper.py CS MATH --metrics-events .cache/scrape_events.jsonl \\
+        --metrics-prom .cache/scrape.prom
+"""
+import bisect
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] is observations <= bounds[i], the last one +Inf."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (inf past the last bound)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class Telemetry:
+    def __init__(self, events_path=None):
+        """
+        Args:
+            events_path: Optional JSON lines file that gets one line per observation
+        """
+        self.fetch_seconds = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.fetch_bytes = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+        self.responses = defaultdict(int)
+        self.retries = defaultdict(int)
+        self.parse_seconds = Histogram(PARSE_BUCKETS)
+        self.queue_depth = Histogram(DEPTH_BUCKETS)
+        self.gauges = {'queue_depth_last': 0, 'queue_depth_max': 0, 'in_flight': 0, 'concurrency_limit': 0}
+        self.stage_seconds = defaultdict(float)
+        self.started = time.time()
+        self._events = None
+        if events_path:
+            if os.path.dirname(events_path):
+                os.makedirs(os.path.dirname(events_path), exist_ok=True)
+            self._events = open(events_path, 'a', encoding='utf-8')
+
+    def close(self):
+        if self._events:
+            self._events.close()
+            self._events = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _event(self, event, **fields):
+        if self._events:
+            fields['event'] = event
+            fields['ts'] = round(time.time(), 6)
+            self._events.write(json.dumps(fields, separators=(',', ':')) + '\n')
+
+    # Observations
+
+    def observe_attempt(self, kind, seconds, status=None, size=0, error=None):
+        """One HTTP attempt: status and size if a response arrived, else the error name."""
+        self.fetch_seconds[kind].observe(seconds)
+        outcome = str(status) if status is not None else error
+        self.responses[kind, outcome] += 1
+        if status is not None:
+            self.fetch_bytes[kind].observe(size)
+        self._event('attempt', kind=kind, seconds=round(seconds, 6), outcome=outcome, bytes=size)
+
+    def observe_request(self, kind, attempts, ok):
+        """One logical request after all its retries."""
+        self.retries[kind] += attempts - 1
+        if attempts > 1 or not ok:
+            self._event('request', kind=kind, attempts=attempts, ok=ok)
+
+    def observe_parse(self, seconds):
+        self.parse_seconds.observe(seconds)
+        self._event('parse', seconds=round(seconds, 6))
+
+    def observe_queue(self, waiting, in_flight, limit):
+        self.queue_depth.observe(waiting)
+        self.gauges['queue_depth_last'] = waiting
+        self.gauges['queue_depth_max'] = max(self.gauges['queue_depth_max'], waiting)
+        self.gauges['in_flight'] = in_flight
+        self.gauges['concurrency_limit'] = limit
+
+    @contextmanager
+    def stage(self, name, subject=None):
+        """Times the enclosed block as stage name (for subject)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stage_seconds[name, subject] += seconds
+            self._event('stage', stage=name, subject=subject, seconds=round(seconds, 6))
+
+    # Export
+
+    def write_prometheus(self, path):
+        """Write every metric in the Prometheus text exposition format (atomically)."""
+        lines = []
+
+        def histogram(name, help_text, histograms):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for labels, hist in histograms:
+                cumulative = 0
+                for bound, count in zip(hist.bounds + ('+Inf',), hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels, le=bound)} {cumulative}')
+                lines.append(f'{name}_sum{_labels(labels)} {hist.sum:.6f}')
+                lines.append(f'{name}_count{_labels(labels)} {hist.count}')
+
+        histogram('scrape_fetch_seconds', 'Latency of each HTTP attempt.',
+                  [({'kind': kind}, hist) for kind, hist in sorted(self.fetch_seconds.items())])
+        histogram('scrape_fetch_bytes', 'Response body size.',
+                  [({'kind': kind}, hist) for kind, hist in sorted(self.fetch_bytes.items())])
+        histogram('scrape_parse_seconds', 'Time to parse one course page.', [({}, self.parse_seconds)])
+        histogram('scrape_queue_depth', 'Requests waiting for a concurrency slot.', [({}, self.queue_depth)])
+
+        lines.append('# HELP scrape_responses_total HTTP attempts by status (or error).')
+        lines.append('# TYPE scrape_responses_total counter')
+        for (kind, outcome), count in sorted(self.responses.items()):
+            lines.append(f'scrape_responses_total{_labels({"kind": kind, "status": outcome})} {count}')
+        lines.append('# HELP scrape_retries_total Attempts beyond the first.')
+        lines.append('# TYPE scrape_retries_total counter')
+        for kind, count in sorted(self.retries.items()):
+            lines.append(f'scrape_retries_total{_labels({"kind": kind})} {count}')
+        lines.append('# HELP scrape_stage_seconds Wall time per scrape stage.')
+        lines.append('# TYPE scrape_stage_seconds gauge')
+        for (stage, subject), seconds in sorted(self.stage_seconds.items(), key=lambda item: str(item[0])):
+            labels = {'stage': stage, 'subject': subject} if subject else {'stage': stage}
+            lines.append(f'scrape_stage_seconds{_labels(labels)} {seconds:.6f}')
+        for name, value in self.gauges.items():
+            lines.append(f'# TYPE scrape_{name} gauge')
+            lines.append(f'scrape_{name} {value}')
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(path + '.tmp', path)
+
+    def summary(self):
+        """Multi-line end-of-run report."""
+        elapsed = time.time() - self.started
+        lines = [f"Scrape telemetry ({elapsed:.1f}s wall)"]
+        for kind, hist in sorted(self.fetch_seconds.items()):
+            statuses = ', '.join(f"{outcome}: {count}" for (k, outcome), count in sorted(self.responses.items())
+                                 if k == kind)
+            size = self.fetch_bytes[kind]
+            lines.append(
+                f"  {kind}: {hist.count} attempts ({statuses}), {self.retries[kind]} retries, "
+                f"latency mean {hist.sum / hist.count:.3f}s p50 <={hist.quantile(0.5)}s "
+                f"p95 <={hist.quantile(0.95)}s, {size.sum / 2**20:.1f} MiB")
+        if self.parse_seconds.count:
+            lines.append(f"  parse: {self.parse_seconds.count} pages, "
+                         f"mean {1000 * self.parse_seconds.sum / self.parse_seconds.count:.2f}ms, "
+                         f"total {self.parse_seconds.sum:.2f}s")
+        if self.queue_depth.count:
+            lines.append(f"  queue depth: mean {self.queue_depth.sum / self.queue_depth.count:.1f}, "
+                         f"max {self.gauges['queue_depth_max']}, final concurrency limit "
+                         f"{self.gauges['concurrency_limit']}")
+        stages = defaultdict(float)
+        for (stage, _), seconds in self.stage_seconds.items():
+            stages[stage] += seconds
+        if stages:
+            lines.append('  stages: ' + ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in stages.items()))
+        return '\n'.join(lines)
+
+
+def _labels(labels, le=None):
+    pairs = [f'{key}="{value}"' for key, value in labels.items()]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
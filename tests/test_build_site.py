@@ -0,0 +1,24 @@
+from build_site import STUB_COLOR, shard_graph
+from graph_core import CompactGraph
+
+
+def test_shards_keep_their_own_prerequisites():
+    net = CompactGraph.from_edges(
+        ['MATH 1551', 'MATH 1552', 'CS 1331', 'CS 1332', 'PHYS 2211'],
+        [('MATH 1551', 'MATH 1552'), ('CS 1331', 'CS 1332'), ('MATH 1552', 'CS 1332')],
+        {'label': ['Differential', 'Integral', 'OOP', 'Data Structures', 'Physics']},
+        graph={'prerequisites': [('MATH 1551', 'MATH 1552'), ('CS 1331', 'CS 1332'), ('MATH 1552', 'CS 1332'),
+                                 ('MATH 1551', 'CS 1332'), ('MATH 1551', 'PHYS 2211')]})
+    shards = shard_graph(net)
+    assert sorted(shards) == ['CS', 'MATH', 'PHYS']
+
+    cs = shards['CS']
+    assert cs.nodes == ['CS 1331', 'CS 1332', 'MATH 1552']
+    assert cs.node_attributes('MATH 1552')['color'] == STUB_COLOR
+    assert cs.edges == [('CS 1331', 'CS 1332'), ('MATH 1552', 'CS 1332')]
+    # MATH 1551 isn't on the CS page, so its pair with CS 1332 isn't either
+    assert cs.graph['prerequisites'] == [('CS 1331', 'CS 1332'), ('MATH 1552', 'CS 1332')]
+    # CS 1332 is a stub on the MATH page, so both its MATH prerequisites are
+    assert shards['MATH'].graph['prerequisites'] == [('MATH 1551', 'MATH 1552'), ('MATH 1552', 'CS 1332'),
+                                                     ('MATH 1551', 'CS 1332')]
+    assert shards['PHYS'].graph['prerequisites'] == []
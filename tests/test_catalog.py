@@ -0,0 +1,57 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from catalog import CourseListingParser, fetch_subject_listing, parse_listing
+from fetcher import Fetcher
+
+LISTING_PAGE = 'fixtures/oscar/MATH_listing.html'
+
+
+def listing_html():
+    with open(LISTING_PAGE, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_parse_listing():
+    blocks = parse_listing(listing_html())
+    assert [block['number'] for block in blocks] == ['1552', '1554', '2010R', '2550', '4803', '1X51']
+    by_number = {block['number']: block for block in blocks}
+    assert by_number['2010R'] == {
+        'subject': 'MATH', 'number': '2010R', 'title': 'MATH 2010R - Calculus Recitation',
+        'description': 'Problem sessions for students taking MATH 1552 or MATH 2550.', 'credits': 1.0}
+    assert by_number['1552']['credits'] == 4.0
+    assert by_number['1554']['description'].startswith('Linear algebra eigenvalues')
+
+
+def test_listing_parses_the_same_in_chunks():
+    html = listing_html()
+    parser = CourseListingParser()
+    for start in range(0, len(html), 97):
+        parser.feed(html[start:start + 97])
+    parser.close()
+    assert parser.blocks == parse_listing(html)
+
+
+def test_fetch_subject_listing():
+    requests = []
+
+    async def listing(request):
+        requests.append(request.query.getall('sel_subj'))
+        return web.Response(text=listing_html(), content_type='text/html')
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/listing', listing)
+        server = TestServer(app, host='127.0.0.1')
+        await server.start_server()
+        try:
+            async with Fetcher(base_delay=0.01) as fetcher:
+                return await fetch_subject_listing(fetcher, 'MATH', base_url=str(server.make_url('/listing')))
+        finally:
+            await server.close()
+
+    blocks = asyncio.run(main())
+    assert [block['number'] for block in blocks] == ['1552', '1554', '1X51', '2010R', '2550', '4803']
+    assert requests == [['dummy', 'MATH']]
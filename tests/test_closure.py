@@ -0,0 +1,51 @@
+import random
+
+import networkx as nx
+import pytest
+
+from closure import ClosureIndex
+
+
+def random_edges(count, edge_count, seed, cycles=False):
+    rng = random.Random(seed)
+    nodes = [f'C {i:04d}' for i in range(count)]
+    edges = set()
+    while len(edges) < edge_count:
+        u, v = rng.sample(range(count), 2)
+        if not cycles and u > v:
+            u, v = v, u
+        edges.add((nodes[u], nodes[v]))
+    return nodes, sorted(edges)
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('cycles', [False, True])
+def test_matches_networkx_transitive_closure(seed, cycles):
+    nodes, edges = random_edges(120, 260, seed, cycles)
+    index = ClosureIndex.from_edges(nodes, edges + [('C 0000', 'unknown')])
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    closure = nx.transitive_closure(graph, reflexive=False)
+
+    assert len(index) == len(nodes)
+    for node in nodes:
+        expected_ancestors = set(closure.predecessors(node)) - {node}
+        expected_descendants = set(closure.successors(node)) - {node}
+        assert set(index.ancestors(node)) == expected_ancestors
+        assert set(index.descendants(node)) == expected_descendants
+        assert index.ancestor_count(node) == len(expected_ancestors)
+        assert index.descendant_count(node) == len(expected_descendants)
+    for u, v in random.Random(seed).sample([(u, v) for u in nodes for v in nodes], 500):
+        assert index.requires(v, u) == (u != v and closure.has_edge(u, v))
+
+
+def test_topological_order_and_cycles():
+    edges = [('A', 'B'), ('B', 'C'), ('C', 'B'), ('C', 'D')]
+    index = ClosureIndex.from_edges(['A', 'B', 'C', 'D', 'E'], edges)
+    assert index.ancestors('D') == ['A', 'B', 'C']
+    assert index.ancestors('B') == ['A', 'C']
+    assert index.descendants('E') == []
+    assert index.cycles == [['B', 'C']]
+    exported = index.export()
+    assert [exported['ids'][i] for i in exported['ancestors'][exported['ids'].index('D')]] == ['A', 'B', 'C']
@@ -0,0 +1,110 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from clusters import AUTO_THRESHOLD, cluster_key, level_clusters, page_clusters
+from graph_core import CompactGraph
+
+# Just enough of vis.DataSet/DataView to run lod.js outside a browser
+LOD_STUB = """
+var vis = {};
+vis.DataSet = function (records) { this.items = []; if (records) this.add(records); };
+vis.DataSet.prototype.add = function (records) { this.items = this.items.concat(records); };
+vis.DataSet.prototype.clear = function () { this.items = []; };
+vis.DataSet.prototype.forEach = function (f) { this.items.forEach(f); };
+vis.DataView = function (data, options) { this.data = data; this.filter = options.filter; };
+vis.DataView.prototype.refresh = function () {};
+vis.DataView.prototype.getIds = function () {
+    return this.data.items.filter(this.filter).map(function (node) { return node.id; });
+};
+var handlers = {};
+var network = {
+    on: function (event, f) { handlers[event] = f; },
+    getScale: function () { return scale; },
+    getViewPosition: function () { return {x: 0, y: 0}; },
+    body: {container: {clientWidth: 1000, clientHeight: 800}}
+};
+var scale = 0.1;
+"""
+
+LOD_SCRIPT = """
+var lod = levelOfDetail(new vis.DataSet(courses), new vis.DataSet(links), lodClusters);
+lod.attach(network);
+function state() {
+    return {nodes: lod.nodes.getIds().sort(),
+            edges: lod.edges.items.map(function (e) { return [e.from, e.to, e.count || 1]; }).sort()};
+}
+var states = [state()];
+lod.reveal('MATH 1552');
+states.push(state());
+handlers.click({nodes: ['cluster:CS 1xxx']});
+states.push(state());
+scale = 0.1;
+handlers.zoom();
+states.push(state());
+console.log(JSON.stringify(states));
+"""
+
+
+def sample():
+    nodes = ['MATH 1551', 'MATH 1552', 'MATH 2550', 'CS 1301', 'CS 1331', 'PHYS 2211']
+    return CompactGraph.from_edges(
+        nodes, [('MATH 1551', 'MATH 1552'), ('MATH 1552', 'MATH 2550'), ('CS 1301', 'CS 1331'),
+                ('MATH 1551', 'CS 1331'), ('MATH 1552', 'CS 1331'), ('MATH 2550', 'PHYS 2211')],
+        {'x': [0, 100, 200, 300, 400, 500], 'y': [0, 180, 360, 0, 180, 360],
+         'color': ['#FFB6C1', '#FFB6C1', '#ADD8E6', None, None, '#90EE90']})
+
+
+def test_cluster_membership():
+    assert cluster_key('MATH 1552') == ('MATH', '1')
+    assert cluster_key('1552') == ('', '1')
+
+    export = level_clusters(sample())
+    clusters = {cluster['id']: cluster for cluster in export['clusters']}
+    # MATH 2550 and PHYS 2211 are alone in their groups and stay single courses
+    assert sorted(clusters) == ['cluster:CS 1xxx', 'cluster:MATH 1xxx']
+    math = clusters['cluster:MATH 1xxx']
+    assert math['members'] == ['MATH 1551', 'MATH 1552']
+    assert (math['x'], math['y'], math['color']) == (50, 90, '#FFB6C1')
+    assert math['label'] == 'MATH 1xxx (2)'
+    assert clusters['cluster:CS 1xxx']['color'] == '#CCCCCC'
+
+    numbers = CompactGraph.from_edges(['1551', '1552', '2550'], [])
+    assert [cluster['id'] for cluster in level_clusters(numbers)['clusters']] == ['cluster:1xxx']
+
+
+def test_auto_mode_threshold():
+    def graph(count):
+        return CompactGraph.from_edges([f'MATH {1000 + i}' for i in range(count)], [])
+
+    assert page_clusters(graph(AUTO_THRESHOLD)) is None
+    assert page_clusters(graph(AUTO_THRESHOLD + 1)) is not None
+    assert page_clusters(graph(AUTO_THRESHOLD + 1), 'off') is None
+    assert page_clusters(graph(3), 'on') is not None
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node to run lod.js')
+def test_lod_view(tmp_path):
+    net = sample()
+    with open('lod.js', encoding='utf-8') as f:
+        lod_js = f.read()
+    script = tmp_path / 'lod_page.js'
+    script.write_text(
+        LOD_STUB + lod_js
+        + '\nvar courses = ' + json.dumps([{'id': node} for node in net.nodes]) + ';\n'
+        + 'var links = ' + json.dumps([{'from': u, 'to': v} for u, v in net.edges]) + ';\n'
+        + 'var lodClusters = ' + json.dumps(level_clusters(net)) + ';\n' + LOD_SCRIPT, encoding='utf-8')
+    result = subprocess.run(['node', str(script)], capture_output=True, text=True, check=True)
+    collapsed, math_open, both_open, zoomed_out = json.loads(result.stdout)
+
+    assert collapsed['nodes'] == ['MATH 2550', 'PHYS 2211', 'cluster:CS 1xxx', 'cluster:MATH 1xxx']
+    # Two course links from MATH 1xxx into CS 1xxx are drawn as one edge
+    assert collapsed['edges'] == [['MATH 2550', 'PHYS 2211', 1], ['cluster:MATH 1xxx', 'MATH 2550', 1],
+                                  ['cluster:MATH 1xxx', 'cluster:CS 1xxx', 2]]
+    assert math_open['nodes'] == ['MATH 1551', 'MATH 1552', 'MATH 2550', 'PHYS 2211', 'cluster:CS 1xxx']
+    assert both_open['edges'] == [['CS 1301', 'CS 1331', 1], ['MATH 1551', 'CS 1331', 1],
+                                  ['MATH 1551', 'MATH 1552', 1], ['MATH 1552', 'CS 1331', 1],
+                                  ['MATH 1552', 'MATH 2550', 1], ['MATH 2550', 'PHYS 2211', 1]]
+    assert zoomed_out == collapsed
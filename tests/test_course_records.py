@@ -0,0 +1,43 @@
+import pandas as pd
+
+from course_records import parse_legacy_list, read_records, write_records
+
+RECORDS = [
+    {'title': 'MATH 1552 - Integral Calculus', 'description': 'Integrals.',
+     'prerequisites': ['MATH 1551'], 'must_have_prereqs': ['MATH 1551'], 'optional_prereqs': [],
+     'prereq_text': 'MATH 1551'},
+    # What the scraper writes when the description cell is missing
+    {'title': 'MATH 8803 - Special Topics', 'description': None,
+     'prerequisites': 'No prerequisites found', 'must_have_prereqs': [], 'optional_prereqs': [],
+     'prereq_text': None},
+    {'title': 'MATH 2550 - Intro Multivariable Calculus', 'description': 'Vectors.',
+     'prerequisites': ('MATH 1552', 'MATH 1555'), 'must_have_prereqs': None, 'optional_prereqs': [],
+     'prereq_text': 'MATH 1552 or MATH 1555'},
+]
+
+
+def test_parquet_round_trip_with_mixed_list_column(tmp_path):
+    path = str(tmp_path / 'records.parquet')
+    write_records(RECORDS, path)
+    df = read_records(path)
+    assert df.columns.tolist() == list(RECORDS[0])
+    assert [list(v) for v in df['prerequisites']] == [['MATH 1551'], [], ['MATH 1552', 'MATH 1555']]
+    assert [list(v) for v in df['must_have_prereqs']] == [['MATH 1551'], [], []]
+    assert df['title'].tolist() == [record['title'] for record in RECORDS]
+    assert pd.isna(df['description'][1])
+
+    # Reading back and writing again keeps the same records
+    again = str(tmp_path / 'again.parquet')
+    write_records(df, again)
+    assert read_records(again).equals(df)
+
+
+def test_legacy_csv_lists(tmp_path):
+    path = str(tmp_path / 'records.csv')
+    pd.DataFrame({'title': ['MATH 2550 - Calc'],
+                  'prerequisites': ["['MATH 1552' 'MATH 1555'\n 'MATH 1502']"],
+                  'terms': [None]}).to_csv(path, index=False)
+    df = read_records(path)
+    assert df['prerequisites'][0] == ['MATH 1552', 'MATH 1555', 'MATH 1502']
+    assert df['terms'][0] == []
+    assert parse_legacy_list("['CS 1331', \"it's\"]") == ['CS 1331', "it's"]
@@ -0,0 +1,62 @@
+import json
+
+import networkx as nx
+
+from edge_selection import EdgeRules, break_cycles, load_edge_rules, select_edges, transitive_reduction
+
+# 1551 -> 1552 -> 2551 -> 2552, with shortcuts that the chain already implies
+NODES = ['1113', '1551', '1552', '1553', '2551', '2552', '3215', '4305']
+EDGES = [('1551', '1552'), ('1552', '2551'), ('1551', '2551'), ('2551', '2552'), ('1552', '2552'),
+         ('1551', '2552'), ('1553', '2552'), ('1113', '1553'), ('1552', '3215'), ('3215', '4305'),
+         ('1553', '4305'), ('1552', '4305')]
+
+
+def test_reduction_matches_networkx():
+    expected = nx.transitive_reduction(nx.DiGraph(EDGES))
+    assert sorted(transitive_reduction(NODES, EDGES)) == sorted(expected.edges)
+
+    graph = nx.gnp_random_graph(40, 0.15, seed=7, directed=True)
+    dag = [(u, v) for u, v in graph.edges if u < v]
+    assert sorted(transitive_reduction(list(graph.nodes), dag)) == \
+        sorted(nx.transitive_reduction(nx.DiGraph(dag)).edges)
+
+
+def test_demoted_courses_dont_hide_edges():
+    # 1552 is implied by 3215 into 4305, unless 3215 is weak
+    assert ('1552', '4305') not in transitive_reduction(NODES, EDGES)
+    assert ('1552', '4305') in transitive_reduction(NODES, EDGES, weak={'3215'})
+
+    # With all parents kept, the demoted 3215 goes after the others
+    rules = EdgeRules(demote=frozenset({'3215'}), max_parents=None)
+    into_4305 = [u for u, v in select_edges(NODES, EDGES, rules) if v == '4305']
+    assert into_4305 == ['1553', '1552', '3215']
+    # One parent: the demoted course is not the one drawn
+    assert [u for u, v in select_edges(NODES, EDGES, EdgeRules(demote=frozenset({'3215'})))
+            if v == '4305'] == ['1553']
+
+
+def test_default_rules_keep_highest_lower_numbered_parent():
+    selected = select_edges(NODES, EDGES)
+    into = {}
+    for u, v in selected:
+        into.setdefault(v, []).append(u)
+    assert all(len(parents) == 1 for parents in into.values())
+    assert into['2552'] == ['2551']
+    assert into['4305'] == ['3215']
+
+
+def test_cycles_broken_from_higher_to_lower_number():
+    edges = [('1552', '2551'), ('2551', '1552'), ('2551', '2552')]
+    kept, cycles = break_cycles(['1552', '2551', '2552'], edges)
+    assert kept == [('1552', '2551'), ('2551', '2552')]
+    assert cycles == [['1552', '2551']]
+    # Self-loops never reach the reduction
+    assert select_edges(['1552'], [('1552', '1552')]) == []
+
+
+def test_load_edge_rules(tmp_path):
+    path = tmp_path / 'edge_rules.json'
+    path.write_text(json.dumps({'MATH': {'demote': ['3215'], 'max_parents': 2}}))
+    assert load_edge_rules('MATH', str(path)) == EdgeRules(frozenset({'3215'}), 2)
+    assert load_edge_rules('CS', str(path)) == EdgeRules()
+    assert load_edge_rules('MATH', str(tmp_path / 'missing.json')) == EdgeRules()
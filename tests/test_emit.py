@@ -0,0 +1,43 @@
+import filecmp
+import os
+
+from build_site import render_page
+from edge_selection import load_edge_rules
+from emit import write_page
+from gen_network import build_graph, catalog_path, load_catalog, load_fallback
+from graph_core import CompactGraph
+
+
+def math_graph():
+    # What pipeline.py's page stage builds for MATH
+    return build_graph(load_catalog(catalog_path('MATH')), load_fallback('MATH'), load_edge_rules('MATH'))
+
+
+def test_math_page_matches_committed(tmp_path):
+    out = str(tmp_path / 'network_math.html')
+    render_page(math_graph(), out)
+    with open(out, 'rb') as built, open('network_math.html', 'rb') as committed:
+        assert built.read() == committed.read()
+    match, mismatch, errors = filecmp.cmpfiles('network_math.tooltips', str(tmp_path / 'network_math.tooltips'),
+                                               sorted(os.listdir('network_math.tooltips')), shallow=False)
+    assert mismatch == [] and errors == []
+
+
+def test_output_is_byte_identical_across_runs(tmp_path):
+    net = CompactGraph.from_edges(
+        ['1551', '1552', '2550'], [('1551', '1552'), ('1552', '2550')],
+        {'label': ['Differential', 'Integral', 'Multivariable'], 'x': [0, 0, 0], 'y': [0, 180, 360],
+         'color': ['#FFB6C1', None, '#ADD8E6']},
+        {'weight': [2, None]})
+    pages = []
+    for name in ('first', 'second'):
+        os.mkdir(tmp_path / name)
+        out = str(tmp_path / name / 'page.html')
+        write_page(net, out, search={'count': 3, 'terms': '', 'postings': '', 'stopwords': ''})
+        with open(out, 'rb') as f:
+            pages.append(f.read())
+    assert pages[0] == pages[1]
+    assert not os.path.exists(str(tmp_path / 'first' / 'page.html.tmp'))
+    page = pages[0].decode('utf-8')
+    assert '"from":"1551","to":"1552","width":2' in page
+    assert page.index('var searchIndex') > page.index('var network = new vis.Network')
@@ -0,0 +1,47 @@
+import glob
+import os
+
+import pytest
+
+from extract import available_backends, extract_cells
+from scraper import parse_course_page
+
+PAGES = sorted(glob.glob('fixtures/oscar/*.html')) + sorted(glob.glob('fixtures/extract/*.html'))
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('path', PAGES, ids=os.path.basename)
+def test_backends_agree(path):
+    html = read(path)
+    reference = extract_cells(html, backend='bs4')
+    record = parse_course_page(html, backend='bs4')
+    assert reference.title and reference.desc
+    for backend in available_backends():
+        assert extract_cells(html, backend=backend) == reference, backend
+        assert repr(parse_course_page(html, backend=backend)) == repr(record), backend
+
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_broken_markup(backend):
+    cells = extract_cells(read('fixtures/extract/nested_table.html'), backend=backend)
+    desc = ''.join(cells.desc)
+    assert 'nested cell' in desc and 'after the nested table' in desc and 'MATH 1551' in desc
+
+    cells = extract_cells(read('fixtures/extract/script_in_cell.html'), backend=backend)
+    assert 'hidden' not in ''.join(cells.desc) and 'color' not in ''.join(cells.desc)
+
+    cells = extract_cells(read('fixtures/extract/unclosed_title.html'), backend=backend)
+    assert cells.title == ['MATH 2550 - Intro Multivariable Calculus\n']
+    assert 'Vectors in three dimensions' in ''.join(cells.desc)
+
+    cells = extract_cells(read('fixtures/extract/implied_cell_end.html'), backend=backend)
+    assert 'next cell' not in ''.join(cells.desc)
+
+
+def test_missing_cells():
+    for backend in available_backends():
+        assert extract_cells('<html><body><p>No courses found</p></body></html>', backend=backend) == (None, None)
@@ -0,0 +1,185 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from fetcher import AdaptiveLimiter, FetchError, Fetcher
+from page_cache import PageCache
+from scraper import scrape_courses_async
+
+COURSE_PAGE = 'fixtures/oscar/MATH_1552.html'
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def serve(handlers):
+    """Local stand-in for OSCAR on an ephemeral port; handlers maps path -> handler."""
+    app = web.Application()
+    for path, handler in handlers.items():
+        app.router.add_get(path, handler)
+    server = TestServer(app, host='127.0.0.1')
+    await server.start_server()
+    return server
+
+
+def test_retries_503_and_shrinks_limit():
+    calls = []
+
+    async def flaky(request):
+        calls.append(request.path)
+        if len(calls) <= 2:
+            return web.Response(status=503)
+        return web.Response(text='ok')
+
+    async def main():
+        server = await serve({'/flaky': flaky})
+        limiter = AdaptiveLimiter(initial=8, cooldown=0)
+        try:
+            async with Fetcher(limiter=limiter, base_delay=0.01) as fetcher:
+                response = await fetcher.get(str(server.make_url('/flaky')))
+        finally:
+            await server.close()
+        return response, limiter
+
+    response, limiter = run(main())
+    assert response.status == 200
+    assert response.text == 'ok'
+    assert response.attempts == 3
+    # Halved once per overloaded answer
+    assert int(limiter.limit) == 2
+    assert limiter.in_flight == 0
+
+
+def test_gives_up_after_max_retries():
+    async def down(request):
+        return web.Response(status=503)
+
+    async def main():
+        server = await serve({'/down': down})
+        limiter = AdaptiveLimiter(initial=4, cooldown=0)
+        try:
+            async with Fetcher(limiter=limiter, max_retries=2, base_delay=0.01) as fetcher:
+                try:
+                    await fetcher.get(str(server.make_url('/down')))
+                except FetchError as e:
+                    return str(e), limiter
+        finally:
+            await server.close()
+
+    message, limiter = run(main())
+    assert 'HTTP 503 after 3 attempts' in message
+    assert limiter.limit == limiter.minimum
+    assert limiter.in_flight == 0
+
+
+def test_304_is_returned_not_retried():
+    calls = []
+
+    async def conditional(request):
+        calls.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text='page', headers={'ETag': '"v1"'})
+
+    async def main():
+        server = await serve({'/page': conditional})
+        try:
+            async with Fetcher(base_delay=0.01) as fetcher:
+                first = await fetcher.get(str(server.make_url('/page')))
+                second = await fetcher.get(str(server.make_url('/page')), headers={'If-None-Match': '"v1"'})
+        finally:
+            await server.close()
+        return first, second
+
+    first, second = run(main())
+    assert first.status == 200
+    assert {k.lower(): v for k, v in first.headers.items()}['etag'] == '"v1"'
+    assert second.status == 304 and second.attempts == 1
+    assert calls == [None, '"v1"']
+
+
+def test_slot_released_on_decode_error_and_cancel():
+    async def bad_bytes(request):
+        return web.Response(body=b'\xff\xfe\xfa', content_type='text/html', charset='utf-8')
+
+    async def slow(request):
+        await asyncio.sleep(5)
+        return web.Response(text='late')
+
+    async def main():
+        server = await serve({'/bad': bad_bytes, '/slow': slow})
+        limiter = AdaptiveLimiter(initial=2)
+        try:
+            async with Fetcher(limiter=limiter, base_delay=0.01) as fetcher:
+                try:
+                    await fetcher.get(str(server.make_url('/bad')))
+                except UnicodeDecodeError:
+                    pass
+                after_error = limiter.in_flight
+                task = asyncio.create_task(fetcher.get(str(server.make_url('/slow'))))
+                await asyncio.sleep(0.1)
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                after_cancel = limiter.in_flight
+        finally:
+            await server.close()
+        return after_error, after_cancel, limiter
+
+    after_error, after_cancel, limiter = run(main())
+    assert after_error == 0
+    assert after_cancel == 0
+    # Neither counts as the server being overloaded
+    assert int(limiter.limit) == 2
+
+
+def test_scrape_304_without_cache_entry_is_an_error(tmp_path):
+    async def always_304(request):
+        return web.Response(status=304)
+
+    async def main():
+        server = await serve({'/detail': always_304})
+        try:
+            async with Fetcher(base_delay=0.01) as fetcher:
+                return await scrape_courses_async('MATH', ['1552'], base_url=str(server.make_url('/detail')),
+                                                  fetcher=fetcher)
+        finally:
+            await server.close()
+
+    [record] = run(main())
+    assert 'HTTP 304' in record['error']
+    assert record['title'] is None
+
+
+def test_scrape_304_serves_cached_record(tmp_path):
+    with open(COURSE_PAGE, encoding='utf-8') as f:
+        html = f.read()
+
+    async def detail(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text=html, content_type='text/html', headers={'ETag': '"v1"'})
+
+    async def main(cache):
+        server = await serve({'/detail': detail})
+        try:
+            async with Fetcher(base_delay=0.01) as fetcher:
+                url = str(server.make_url('/detail'))
+                first = await scrape_courses_async('MATH', ['1552'], base_url=url, fetcher=fetcher, cache=cache)
+                second = await scrape_courses_async('MATH', ['1552'], base_url=url, fetcher=fetcher, cache=cache)
+        finally:
+            await server.close()
+        return first, second
+
+    cache = PageCache(str(tmp_path / 'pages.sqlite'))
+    try:
+        first, second = run(main(cache))
+    finally:
+        cache.close()
+    assert 'error' not in first[0]
+    assert first[0]['title'].startswith('MATH 1552')
+    assert second == first
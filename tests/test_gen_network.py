@@ -0,0 +1,62 @@
+import pandas as pd
+
+from gen_network import build_graph, load_catalog, merge_fallback
+
+
+def catalog(titles):
+    count = len(titles)
+    return pd.DataFrame({
+        'title': titles,
+        'description': ['...'] * count,
+        'prerequisites': [[] for _ in range(count)],
+        'prereq_text': [None] * count,
+        'must_have_prereqs': [[] for _ in range(count)],
+        'optional_prereqs': [[] for _ in range(count)],
+        'professors_str': [''] * count,
+        'terms_str': [''] * count,
+    })
+
+
+FALLBACK = pd.DataFrame({
+    'course_number': [1332, 1111],
+    'department': ['MATH', None],
+    'prerequisites_text_raw': ['MATH 1111 with a minimum grade of D', None],
+    'must_have_prerequisites_array': [['MATH 1111'], []],
+    'optional_prerequisites_array': [[], []],
+})
+
+
+def test_fallback_joins_on_subject_and_number():
+    df = catalog(['CS 1332 - Data Structures', 'MATH 1332 - Some Math', 'MATH 1111 - College Algebra'])
+    numbers = df['title'].str.extract(r'(?P<number>\d+)')['number']
+    merged = merge_fallback(df, FALLBACK, numbers)
+    assert merged['found'].tolist() == [False, True, True]
+    assert merged['text'][1] == 'MATH 1111 with a minimum grade of D'
+
+    net = build_graph(df, FALLBACK)
+    assert net.edges == [('MATH 1111', 'MATH 1332')]
+    assert 'MATH 1111 with a minimum grade of D' not in net.node_attributes('CS 1332')['desc']
+
+
+def test_single_subject_ids_are_numbers():
+    df = catalog(['MATH 1332 - Some Math', 'MATH 1111 - College Algebra'])
+    net = build_graph(df, FALLBACK)
+    assert net.nodes == ['1332', '1111']
+    assert net.edges == [('1111', '1332')]
+
+
+def test_records_without_history_or_split_prereqs(tmp_path):
+    # The columns of data2/gt_cs_courses.csv: no schedule history, prerequisites not split
+    path = tmp_path / 'gt_cs_courses.csv'
+    pd.DataFrame({
+        'title': ['CS 1301 - Intro to Computing', 'CS 1331 - Intro-Object Orient Prog'],
+        'description': ['Programs.', 'Objects.'],
+        'prerequisites': ['[]', "['CS 1301']"],
+        'prereq_text': [None, 'CS 1301 or CS 1315'],
+    }).to_csv(path, index=False)
+    df = load_catalog(str(path))
+    assert df['optional_prereqs'][1] == ['CS 1301', 'CS 1315']
+    assert df['professors_str'].tolist() == ['', '']
+
+    net = build_graph(df)
+    assert net.edges == [('1301', '1331')]
@@ -0,0 +1,64 @@
+import networkx as nx
+
+from graph_core import CompactGraph, as_compact
+
+PREREQUISITES = [('1551', '1552'), ('1552', '2550'), ('1551', '2550'), ('1552', 'CS 1331')]
+
+
+def sample():
+    return CompactGraph.from_edges(
+        ['1551', '1552', '2550', 'CS 1331'],
+        [('1552', '2550'), ('1551', '1552'), ('1552', 'CS 1331'), ('1551', '1552')],
+        {'label': ['Differential Calculus', 'Integral Calculus', 'Multivariable', None]},
+        {'title': ['b', 'a', 'c', 'duplicate']},
+        graph={'prerequisites': PREREQUISITES})
+
+
+def test_csr_adjacency():
+    net = sample()
+    # Sorted by (source, target), the repeated pair kept once with its first attributes
+    assert net.edges == [('1551', '1552'), ('1552', '2550'), ('1552', 'CS 1331')]
+    assert net.edge_columns['title'] == ['a', 'b', 'c']
+    assert net.offsets.tolist() == [0, 1, 3, 3, 3]
+    assert net.successors('1552') == ['2550', 'CS 1331']
+    assert net.predecessors('1552') == ['1551']
+    assert net.predecessors('1551') == []
+    assert net.degree('1552') == 3
+    assert net.node_attributes('CS 1331') == {}
+
+
+def test_networkx_round_trip():
+    net = sample()
+    graph = net.to_networkx()
+    assert sorted(graph.edges(data='title')) == [('1551', '1552', 'a'), ('1552', '2550', 'b'),
+                                                  ('1552', 'CS 1331', 'c')]
+    assert graph.nodes['1552'] == {'label': 'Integral Calculus'}
+    assert graph.graph['prerequisites'] == PREREQUISITES
+
+    back = as_compact(graph)
+    assert back.nodes == net.nodes
+    assert back.edges == net.edges
+    assert back.edge_columns == net.edge_columns
+    assert back.columns['label'] == net.columns['label']
+    assert nx.utils.graphs_equal(back.to_networkx(), graph)
+
+
+def test_subgraph_keeps_edge_columns_and_own_prerequisites():
+    part = sample().subgraph(['1552', '2550', '1551'])
+    assert part.nodes == ['1552', '2550', '1551']
+    assert part.edges == [('1552', '2550'), ('1551', '1552')]
+    assert part.edge_columns['title'] == ['b', 'a']
+    assert part.columns['label'] == ['Integral Calculus', 'Multivariable', 'Differential Calculus']
+    assert part.graph['prerequisites'] == [('1551', '1552'), ('1552', '2550'), ('1551', '2550')]
+
+
+def test_extend_keeps_edge_columns():
+    part = sample().subgraph(['1551', '1552'])
+    extended = part.extend(['CS 1331', '1552'], [{'label': 'Stub'}, {'label': 'ignored'}],
+                           [('1552', 'CS 1331'), ('1551', '1552')])
+    assert extended.nodes == ['1551', '1552', 'CS 1331']
+    assert extended.columns['label'] == ['Differential Calculus', 'Integral Calculus', 'Stub']
+    assert extended.edges == [('1551', '1552'), ('1552', 'CS 1331')]
+    # The existing edge keeps its title; the new one has none
+    assert extended.edge_columns['title'] == ['a', None]
+    assert extended.graph['prerequisites'] == [('1551', '1552')]
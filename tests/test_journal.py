@@ -0,0 +1,91 @@
+import asyncio
+import os
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from fetcher import Fetcher
+from journal import ScrapeJournal
+from scraper import scrape_subject_async
+
+LISTING_PAGE = 'fixtures/oscar/MATH_listing.html'
+COURSE_PAGE = 'fixtures/oscar/MATH_1552.html'
+
+
+def record(title, error=None):
+    return {'title': title, 'description': '...', 'prerequisites': [], 'error': error}
+
+
+def test_resume_after_torn_last_line(tmp_path):
+    directory = str(tmp_path)
+    with ScrapeJournal('202502', directory, resume=False) as journal:
+        journal.append('MATH', '1552', record('MATH 1552 - Integral Calculus'))
+        journal.append('MATH', '1554', record('MATH 1554 - Linear Algebra'))
+        path = journal.path
+    size = os.path.getsize(path)
+    # The process died halfway through writing the next line
+    with open(path, 'ab') as f:
+        f.write(b'{"subject":"MATH","course":"2550","ok":tr')
+
+    with ScrapeJournal('202502', directory) as journal:
+        assert os.path.getsize(path) == size
+        assert journal.completed('MATH') == {'1552', '1554'}
+        journal.append('MATH', '2550', record('MATH 2550 - Intro to Multivariable Calc'))
+        titles = [r['title'] for r in journal.records('MATH')]
+    assert titles == ['MATH 1552 - Integral Calculus', 'MATH 1554 - Linear Algebra',
+                      'MATH 2550 - Intro to Multivariable Calc']
+    with open(path, 'rb') as f:
+        assert all(line.endswith(b'}\n') for line in f)
+
+
+def test_failed_records_retried_and_superseded(tmp_path):
+    with ScrapeJournal('202502', str(tmp_path)) as journal:
+        journal.append('MATH', '1552', record(None, error='HTTP 503'))
+        assert journal.completed('MATH') == set()
+        journal.append('MATH', '1552', record('MATH 1552 - Integral Calculus'))
+    with ScrapeJournal('202502', str(tmp_path)) as journal:
+        assert journal.completed('MATH') == {'1552'}
+        assert [r['error'] for r in journal.records('MATH')] == [None]
+    # Without resume the journal starts empty
+    with ScrapeJournal('202502', str(tmp_path), resume=False) as journal:
+        assert journal.completed('MATH') == set()
+        assert list(journal.records('MATH')) == []
+
+
+def test_scraper_skips_journaled_courses(tmp_path):
+    with open(LISTING_PAGE, encoding='utf-8') as f:
+        listing_html = f.read()
+    with open(COURSE_PAGE, encoding='utf-8') as f:
+        course_html = f.read()
+    fetched = []
+
+    async def listing(request):
+        return web.Response(text=listing_html, content_type='text/html')
+
+    async def detail(request):
+        fetched.append(request.query['crse_numb_in'])
+        return web.Response(text=course_html, content_type='text/html')
+
+    async def main(journal):
+        app = web.Application()
+        app.router.add_get('/listing', listing)
+        app.router.add_get('/detail', detail)
+        server = TestServer(app, host='127.0.0.1')
+        await server.start_server()
+        try:
+            async with Fetcher(base_delay=0.01) as fetcher:
+                return await scrape_subject_async('MATH', '202502', fetcher, listing_url=str(server.make_url('/listing')),
+                                                  detail_url=str(server.make_url('/detail')), journal=journal)
+        finally:
+            await server.close()
+
+    with ScrapeJournal('202502', str(tmp_path)) as journal:
+        journal.append('MATH', '1552', record('MATH 1552 - Integral Calculus'))
+        journal.append('MATH', '2550', record('MATH 2550 - Intro to Multivariable Calc'))
+        journal.append('MATH', '4803', record(None, error='HTTP 503'))
+    with ScrapeJournal('202502', str(tmp_path)) as journal:
+        assert asyncio.run(main(journal)) is None
+        assert sorted(fetched) == ['1554', '1X51', '2010R', '4803']
+        assert journal.completed('MATH') == {'1552', '1554', '1X51', '2010R', '2550', '4803'}
+        # Journaled records are kept as they were
+        assert next(journal.records('MATH'))['title'] == 'MATH 1552 - Integral Calculus'
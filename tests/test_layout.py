@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import networkx as nx
+
+from graph_core import CompactGraph
+from layout import _acyclic_edges, layered_layout, longest_path_layers
+
+
+def test_longest_path_layering():
+    edges = [('1551', '1552'), ('1552', '2550'), ('2550', '4305'), ('1551', '4305'), ('1113', '2550')]
+    layer = longest_path_layers(['1551', '1552', '2550', '4305', '1113'], edges)
+    # 4305 sits below its deepest prerequisite, not its shallowest
+    assert layer == {'1551': 0, '1113': 0, '1552': 1, '2550': 2, '4305': 3}
+
+    positions = layered_layout(nx.DiGraph(edges), layer_spacing=100)
+    assert {node: y for node, (_, y) in positions.items()} == {node: 100 * level for node, level in layer.items()}
+
+
+def test_back_edges_reversed_in_a_cycle():
+    succ = {'a': ['b'], 'b': ['c'], 'c': ['a', 'd'], 'd': []}
+    edges, reversed_edges = _acyclic_edges(['a', 'b', 'c', 'd'], succ)
+    assert reversed_edges == {('c', 'a')}
+    assert sorted(edges) == [('a', 'b'), ('a', 'c'), ('b', 'c'), ('c', 'd')]
+
+    graph = nx.DiGraph([('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'd'), ('d', 'd'), ('e', 'f')])
+    positions = layered_layout(graph)
+    assert set(positions) == set(graph.nodes)
+    downward = [(u, v) for u, v in graph.edges if positions[u][1] < positions[v][1]]
+    # Every edge but the reversed back edge and the self-loop points down
+    assert sorted(set(graph.edges) - set(downward)) == [('c', 'a'), ('d', 'd')]
+
+
+def test_layers_are_spaced_and_isolated_courses_gridded():
+    graph = CompactGraph.from_edges(['1', '2', '3', '4', 'x', 'y'], [('1', '3'), ('2', '3'), ('3', '4')])
+    positions = layered_layout(graph, node_spacing=200)
+    assert abs(positions['1'][0] - positions['2'][0]) >= 200
+    # Below the last layer
+    assert positions['x'][1] > positions['4'][1] and positions['x'][1] == positions['y'][1]
+
+
+LAYOUT_SCRIPT = """
+import json
+from query_service import load_graph
+from layout import layered_layout
+print(json.dumps(sorted(layered_layout(load_graph()).items())))
+"""
+
+
+def test_layer_order_follows_parents():
+    # c and d are listed in crossing order; the sweeps uncross them
+    graph = CompactGraph.from_edges(['a', 'b', 'c', 'd'], [('b', 'c'), ('a', 'd')])
+    positions = layered_layout(graph)
+    assert positions['a'][0] < positions['b'][0]
+    assert positions['d'][0] < positions['c'][0]
+
+
+def test_layout_is_deterministic():
+    graph = nx.gnp_random_graph(60, 0.08, seed=3, directed=True)
+    assert layered_layout(graph) == layered_layout(graph.copy())
+    # Also across processes with different string hashing
+    outputs = []
+    for seed in ('1', '2'):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run([sys.executable, '-c', LAYOUT_SCRIPT], capture_output=True, text=True, check=True,
+                                env=env)
+        outputs.append(result.stdout)
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,26 @@
+from page_cache import PageCache
+
+
+def test_put_survives_without_close(tmp_path):
+    path = str(tmp_path / 'pages.sqlite')
+    cache = PageCache(path)
+    cache.put('202502', 'MATH', '1552', '<html>1552</html>', {'ETag': '"v1"'}, {'title': 'MATH 1552'}, 'v1')
+    cache.mark_validated('202502', 'MATH', '1552')
+    # A second connection (as after a crash) sees the write without close()
+    other = PageCache(path)
+    entry = other.get('202502', 'MATH', '1552')
+    assert entry.etag == '"v1"'
+    assert entry.record == {'title': 'MATH 1552'}
+    assert other.conditional_headers(entry) == {'If-None-Match': '"v1"'}
+    other.close()
+    cache.close()
+
+
+def test_evict_drops_least_recently_used(tmp_path):
+    with PageCache(str(tmp_path / 'pages.sqlite'), max_bytes=25) as cache:
+        for number in ('1111', '1113', '1552'):
+            cache.put('202502', 'MATH', number, 'x' * 10, {}, {}, 'v1')
+        cache.get('202502', 'MATH', '1111')
+        cache.evict()
+        assert cache.get('202502', 'MATH', '1113') is None
+        assert cache.get('202502', 'MATH', '1111') is not None
@@ -0,0 +1,52 @@
+import pandas as pd
+
+import pipeline
+from add_historical_info import add_historical_info, read_term_files
+
+
+def test_known_subjects_any_case(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data2').mkdir()
+    for name in ['gt_MATH_courses.csv', 'gt_cs_courses.csv', 'gt_Ece_courses.parquet',
+                 'gt_MATH_courses_history.parquet', 'gt_courses.csv', 'gt_math_courses_20250121_034050.csv']:
+        (tmp_path / 'data2' / name).write_text('')
+    assert pipeline.known_subjects() == ['CS', 'ECE', 'MATH']
+    assert pipeline.raw_stem('CS') == 'data2/gt_cs_courses'
+    assert pipeline.raw_stem('MATH') == 'data2/gt_MATH_courses'
+    # New departments are scraped under the uppercase name
+    assert pipeline.raw_stem('ISYE') == 'data2/gt_ISYE_courses'
+
+
+def test_page_stage_up_to_date_without_website_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, 'WEBSITE_STORE', str(tmp_path / 'missing_store'))
+    [page] = [stage for stage in pipeline.department_stages('MATH') if stage.name == 'page']
+    assert str(tmp_path / 'missing_store') not in page.inputs
+    state = {page.key: {'params': page.params, 'inputs': pipeline.hashes(page.inputs),
+                        'outputs': pipeline.hashes(page.outputs)}}
+    # Outputs may be missing in a fresh checkout; only the inputs matter here
+    reason = pipeline.stale_reason(page, state)
+    assert reason is None or reason.startswith('missing output')
+
+
+def test_history_stage_reads_only_schedule_csvs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # A catalog snapshot store under data/ is not schedule data
+    (tmp_path / 'data' / 'catalog_snapshots' / 'website').mkdir(parents=True)
+    assert pipeline.schedule_inputs() == []
+    assert [stage.name for stage in pipeline.department_stages('MATH')] == ['scrape', 'page']
+
+    (tmp_path / 'data' / 'schedule_202408_2024_MATH.csv').write_text(
+        'course_code,section,instructor\nMATH 1552,A,"Smith, Ann"\nMATH 1552,A1,"Lee, Bo"\n')
+    assert pipeline.schedule_inputs() == ['data/schedule_202408_2024_MATH.csv']
+    [history] = [stage for stage in pipeline.department_stages('MATH') if stage.name == 'history']
+    assert 'data/schedule_202408_2024_MATH.csv' in history.inputs
+    assert 'data/' not in history.inputs and 'data' not in history.inputs
+
+
+def test_read_term_files_without_csvs(tmp_path):
+    offerings = read_term_files(str(tmp_path))
+    assert offerings.empty
+    courses = pd.DataFrame({'title': ['MATH 1552 - Integral Calculus']})
+    enriched = add_historical_info(courses, offerings)
+    assert enriched['terms'].tolist() == [[]]
+    assert enriched['professors_str'].tolist() == ['']
@@ -0,0 +1,50 @@
+import pandas as pd
+
+from prereqs import And, Course, Or, Other, from_obj, must_have_and_optional, parse_many, parse_prerequisites
+
+
+def test_and_binds_tighter_than_or():
+    tree = parse_prerequisites("MATH 1502 or MATH 1512 or ( (MATH 1552 or MATH 1555 ) and MATH 1553 )")
+    assert tree == Or((Course('MATH', '1502'), Course('MATH', '1512'),
+                       And((Or((Course('MATH', '1552'), Course('MATH', '1555'))), Course('MATH', '1553')))))
+    assert must_have_and_optional(tree) == ([], ['MATH 1502', 'MATH 1512', 'MATH 1552', 'MATH 1555', 'MATH 1553'])
+
+
+def test_clauses_lists_and_one_of():
+    assert str(parse_prerequisites("Graduate standing required; ISYE 6793")) == \
+        "Graduate standing required and ISYE 6793"
+    tree = parse_prerequisites("MATH 4107 and one of MATH 2406, MATH 4305, or permission of instructor")
+    assert tree == And((Course('MATH', '4107'),
+                        Or((Course('MATH', '2406'), Course('MATH', '4305'), Other('permission of instructor')))))
+    assert must_have_and_optional(tree) == (['MATH 4107'], ['MATH 2406', 'MATH 4305'])
+
+
+def test_exclusions_qualifiers_and_broken_text():
+    assert parse_prerequisites("Credit restriction: MATH 1551; MATH 1501") == Course('MATH', '1501')
+    assert parse_prerequisites("Undergraduate Semester level CS 1331 Minimum Grade of C") == Course('CS', '1331')
+    assert str(parse_prerequisites("MATH 1552 with a minimum grade of D and (CS 1331 or")) == "MATH 1552 and CS 1331"
+    assert parse_prerequisites("MATH 1552 and and MATH 1553)") == And((Course('MATH', '1552'), Course('MATH', '1553')))
+
+
+def test_semicolon_inside_parentheses():
+    # Used to loop forever: the ';' never left the token stream
+    assert parse_prerequisites("(MATH 1552; MATH 1553)") == And((Course('MATH', '1552'), Course('MATH', '1553')))
+    assert parse_prerequisites("(MATH 1552 or ; CS 1331") == And((Course('MATH', '1552'), Course('CS', '1331')))
+    assert parse_prerequisites("with grade D ( ; Credit restriction: foo") == Other('Credit restriction: foo')
+
+
+def test_parse_many_aligns_with_input():
+    texts = pd.Series(["CS 1331", None, "", "CS 1331", float('nan'), "CS 1331 or CS 1371"])
+    trees = parse_many(texts)
+    assert len(trees) == len(texts)
+    assert trees[0] is trees[3]
+    assert trees[1] is None and trees[2] is None and trees[4] is None
+    assert trees[5] == Or((Course('CS', '1331'), Course('CS', '1371')))
+    assert parse_many(list(texts)) == trees
+
+
+def test_to_obj_round_trip():
+    for text in ["MATH 4107 and one of MATH 2406, MATH 4305, or permission of instructor",
+                 "MATH 1502 or (MATH 1552 and MATH 1553)", "CS 1331"]:
+        tree = parse_prerequisites(text)
+        assert from_obj(tree.to_obj()) == tree
@@ -0,0 +1,113 @@
+import asyncio
+
+import networkx as nx
+from aiohttp.test_utils import TestClient, TestServer
+
+from query_service import QueryService
+
+SERVICE = None
+
+
+def service():
+    # The default MATH catalog, loaded once for the module
+    global SERVICE
+    if SERVICE is None:
+        SERVICE = QueryService()
+    return SERVICE
+
+
+def run(requests, fresh=False):
+    """Call requests(client) against a served QueryService; returns its result."""
+    async def main():
+        subject = QueryService() if fresh else service()
+        async with TestClient(TestServer(subject.app(), host='127.0.0.1')) as client:
+            return await requests(client)
+    return asyncio.run(main())
+
+
+async def get(client, path, **params):
+    response = await client.get(path, params=params)
+    return response.status, await response.json()
+
+
+def test_course_by_code_or_id():
+    async def requests(client):
+        return await get(client, '/course', id='math  1552'), await get(client, '/course', course='1552')
+
+    (status, by_code), (_, by_id) = run(requests)
+    assert status == 200
+    assert by_code == by_id
+    assert by_code['id'] == '1552'
+    assert by_code['prerequisites'] == ['1501', '1550', '1551']
+    assert '2551' in by_code['leads_to']
+
+
+def test_subgraph_and_closure():
+    index = service().index
+    relation = nx.DiGraph(index.relation.edges)
+
+    async def requests(client):
+        return (await get(client, '/subgraph', course='MATH 1552', direction='up', depth='1'),
+                await get(client, '/subgraph', course='1552', direction='down'),
+                await get(client, '/ancestors', course='2552'),
+                await get(client, '/descendants', course='1551'))
+
+    (_, up), (_, down), (_, ancestors), (_, descendants) = run(requests)
+    assert [node['id'] for node in up['nodes']] == ['1552', '1501', '1550', '1551']
+    assert {(edge['from'], edge['to']) for edge in up['edges']} == {('1501', '1552'), ('1550', '1552'),
+                                                                   ('1551', '1552')}
+    assert {edge['drawn'] for edge in up['edges']} == {True, False}
+
+    assert {node['id'] for node in down['nodes']} == {'1552'} | nx.descendants(relation, '1552')
+    kept = {node['id'] for node in down['nodes']}
+    assert {(edge['from'], edge['to']) for edge in down['edges']} == set(relation.subgraph(kept).edges)
+
+    assert set(ancestors['ancestors']) == nx.ancestors(relation, '2552')
+    assert ancestors['count'] == len(ancestors['ancestors'])
+    assert set(descendants['descendants']) == nx.descendants(relation, '1551')
+
+
+def test_search():
+    async def requests(client):
+        return (await get(client, '/search', q='introduction to probability', limit='3'),
+                await get(client, '/search', q='the of'))
+
+    (status, found), (_, empty) = run(requests)
+    assert status == 200
+    assert found['total'] == 6
+    assert [record['id'] for record in found['results']] == ['3215', '3235', '7251']
+    assert empty == {'query': 'the of', 'total': 0, 'results': []}
+
+
+def test_bad_requests():
+    async def requests(client):
+        return [await get(client, path, **params) for path, params in [
+            ('/course', {'id': 'MATH 9999'}),
+            ('/ancestors', {}),
+            ('/subgraph', {'course': '1552', 'direction': 'sideways'}),
+            ('/subgraph', {'course': '1552', 'depth': 'two'}),
+            ('/search', {'q': 'calculus', 'limit': '0'}),
+        ]]
+
+    answers = run(requests)
+    assert [status for status, _ in answers] == [404, 400, 400, 400, 400]
+    assert answers[0][1] == {'error': "unknown course 'MATH 9999'"}
+    assert answers[3][1] == {'error': 'depth must be an integer'}
+    assert answers[4][1] == {'error': 'limit must be between 1 and 50'}
+
+
+def test_cache_hits_and_reload_clears_it():
+    async def requests(client):
+        await get(client, '/course', id='1552')
+        await get(client, '/course', id='1552')
+        _, before = await get(client, '/stats')
+        response = await client.post('/reload')
+        reloaded = await response.json()
+        _, after = await get(client, '/stats')
+        return before, reloaded, after
+
+    before, reloaded, after = run(requests, fresh=True)
+    assert before['cache'] == {'size': 1, 'maxsize': 4096, 'hits': 1, 'misses': 1}
+    assert before['generation'] == 1 and before['requests'] == 2
+    assert reloaded['generation'] == 2 and reloaded['courses'] == before['courses']
+    assert after['cache']['size'] == 0
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from add_historical_info import add_historical_info, build_offering_index, prepare_offerings, read_term_files
+from schedule_store import ingest_term, list_terms, load_offerings
+
+TERMS = {
+    ('08', '2024'): [('MATH 1552', 'A', 'Smith, John'), ('MATH 2550', 'B', 'Lee, Ann')],
+    ('02', '2025'): [('MATH 1552', 'C', 'Jones, Kim'), ('MATH 1552', 'HP1', 'Honors, X')],
+    ('08', '2025'): [('MATH 1552', 'A', 'Smith, John'), ('MATH 2550', 'A', 'Park, Sun')],
+}
+
+
+def write_terms(directory):
+    paths = []
+    for (term, year), rows in TERMS.items():
+        path = directory / f'schedule_{term}_{year}_export.csv'
+        pd.DataFrame(rows, columns=['course_code', 'section', 'instructor']).to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def test_store_matches_csv_path(tmp_path):
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    store = str(tmp_path / 'store')
+    for path in write_terms(csv_dir):
+        ingest_term(path, store=store)
+    assert sorted(list_terms(store)) == sorted(TERMS)
+
+    from_csv = read_term_files(str(csv_dir))
+    from_store = prepare_offerings(load_offerings(store, columns=['course_code', 'section', 'instructor']))
+    for df in (from_csv, from_store):
+        assert df['term'].map(type).eq(str).all() and df['year'].map(type).eq(str).all()
+
+    columns = ['course_code', 'year', 'term', 'term_year', 'instructor']
+    assert (build_offering_index(from_csv)[columns].astype(object).values.tolist()
+            == build_offering_index(from_store)[columns].astype(object).values.tolist())
+
+    courses = pd.DataFrame({'title': ['MATH 1552 - Integral Calculus', 'MATH 2550 - Multivariable Calculus']})
+    enriched_csv = add_historical_info(courses, from_csv)
+    enriched_store = add_historical_info(courses, from_store)
+    assert enriched_csv['terms_str'].tolist() == enriched_store['terms_str'].tolist()
+    assert enriched_store['terms'][0] == ['082025', '022025', '082024']
+
+
+def test_term_and_course_pushdown(tmp_path):
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    store = str(tmp_path / 'store')
+    for path in write_terms(csv_dir):
+        ingest_term(path, store=store)
+    df = load_offerings(store, course_codes=['MATH 2550'], terms=[('08', '2025'), ('08', 2024)])
+    assert sorted(zip(df['year'], df['term'], df['instructor'])) == [
+        ('2024', '08', 'Lee, Ann'), ('2025', '08', 'Park, Sun')]
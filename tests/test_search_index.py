@@ -0,0 +1,92 @@
+import base64
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from query_service import CatalogIndex, load_graph
+from search_index import build_search_index, term_postings
+
+QUERIES = ['introduction to probability', 'theory of computation', 'the linear algebra', 'calc',
+           'math 1552', 'math1552', 'of the', 'differential equations']
+
+# Just enough of vis and the DOM to run search.js outside a browser
+PAGE_STUB = """
+var ids = JSON.parse(process.argv[2]);
+var nodes = {getIds: function () { return ids; }, get: function () { return null; }};
+var network = {focus: function () {}, selectNodes: function () {}, unselectAll: function () {}};
+var element = function () { return {style: {}, addEventListener: function () {}, appendChild: function () {}}; };
+var document = {createElement: element, getElementById: element, body: {appendChild: function () {}}};
+var atob = function (s) { return Buffer.from(s, 'base64').toString('binary'); };
+"""
+
+
+def decode(index):
+    """The {term: {doc: field}} postings search.js would read from index."""
+    terms = []
+    for coded in index['terms'].split('\n'):
+        shared = ord(coded[0]) - ord('0')
+        terms.append((terms[-1][:shared] if terms else '') + coded[1:])
+    data = base64.b64decode(index['postings'])
+    position = 0
+
+    def varint():
+        nonlocal position
+        value = shift = 0
+        while True:
+            b = data[position]
+            position += 1
+            value |= (b & 0x7F) << shift
+            shift += 7
+            if not b & 0x80:
+                return value
+
+    postings = {}
+    for term in terms:
+        value = 0
+        postings[term] = {}
+        for _ in range(varint()):
+            value += varint()
+            postings[term][value >> 2] = value & 3
+    assert position == len(data)
+    return postings
+
+
+def test_encode_decode_round_trip():
+    catalog = CatalogIndex(load_graph())
+    index = build_search_index(load_graph())
+    assert index['count'] == catalog.net.number_of_nodes()
+    assert decode(index) == term_postings(catalog.codes, catalog.titles, catalog.professors, catalog.descriptions)
+
+
+def test_postings_keep_strongest_field_and_drop_stopwords():
+    postings = term_postings(['MATH 3215'], ['Intro to Probability'], [None],
+                             ['Probability of events. Prerequisite: MATH 2551.'])
+    assert postings['probability'] == {0: 1}
+    assert postings['math'] == {0: 0}
+    assert postings['math3215'] == {0: 0}
+    assert '2551' not in postings
+    assert 'to' not in postings and 'of' not in postings
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node to run search.js')
+def test_page_search_matches_query_service(tmp_path):
+    catalog = CatalogIndex(load_graph())
+    index = build_search_index(load_graph())
+    with open('search.js', encoding='utf-8') as f:
+        search_js = f.read()
+    script = tmp_path / 'search_page.js'
+    script.write_text(PAGE_STUB + 'var searchIndex = ' + json.dumps(index) + ';\n' + search_js
+                      + '\nconsole.log(JSON.stringify(JSON.parse(process.argv[3]).map(searchCourses)));\n',
+                      encoding='utf-8')
+    result = subprocess.run(['node', str(script), json.dumps(catalog.net.nodes), json.dumps(QUERIES)],
+                            capture_output=True, text=True, check=True)
+    page = json.loads(result.stdout)
+
+    service = [[record['id'] for record in catalog.search(query, limit=len(catalog.net.nodes))['results']]
+               for query in QUERIES]
+    assert page == service
+    # Stopwords in the query don't empty the results
+    assert page[0] and page[1] and page[2]
+    assert page[QUERIES.index('of the')] == []
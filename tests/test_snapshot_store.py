@@ -0,0 +1,73 @@
+import pandas as pd
+
+from snapshot_store import as_of, diff, ingest, list_terms
+
+
+def records(rows):
+    return pd.DataFrame(rows, columns=['title', 'description', 'prerequisites'])
+
+
+FALL = records([
+    ('CS 1331 - Intro-Object Orient Prog', 'Objects.', ['CS 1301']),
+    ('MATH 1552 - Integral Calculus', 'Integrals.', ['MATH 1551']),
+    ('MATH 2550 - Intro Multivariable Calculus', 'Vectors.', []),
+])
+SPRING = records([
+    ('CS 1331 - Intro-Object Orient Prog', 'Objects and classes.', ['CS 1301']),
+    ('MATH 1552 - Integral Calculus', 'Integrals.', ['MATH 1551', 'MATH 1501']),
+    ('MATH 3012 - Applied Combinatorics', 'Counting.', ['MATH 1552']),
+])
+SUMMER = records([
+    # Description reverted to the fall one
+    ('CS 1331 - Intro-Object Orient Prog', 'Objects.', ['CS 1301']),
+    ('MATH 1552 - Integral Calculus', 'Integrals.', ['MATH 1551', 'MATH 1501']),
+    ('MATH 3012 - Applied Combinatorics', 'Counting.', ['MATH 1552']),
+])
+
+
+def rows(df):
+    return sorted((r['title'], r['description'], list(r['prerequisites'])) for r in df.to_dict('records'))
+
+
+def test_round_trip_and_as_of(tmp_path):
+    store = str(tmp_path)
+    ingest(FALL, '202408', store)
+    ingest(SPRING, '202502', store)
+    changed, new_blobs = ingest(SUMMER, '202505', store)
+    assert list_terms(store) == ['202408', '202502', '202505']
+    # Only the reverted description changed, and its value is already stored
+    assert (changed, new_blobs) == (1, 0)
+
+    assert rows(as_of('202408', store)) == rows(FALL)
+    assert rows(as_of('202502', store)) == rows(SPRING)
+    assert rows(as_of('202503', store)) == rows(SPRING)
+    assert rows(as_of(None, store)) == rows(SUMMER)
+    assert rows(as_of('202505', store, subjects=['CS'])) == rows(SUMMER[:1])
+    assert as_of('202301', store).empty
+
+    changes = diff('202408', '202502', store)
+    assert sorted(zip(changes['subject'], changes['course'], changes['change'])) == [
+        ('CS', '1331', 'changed'), ('MATH', '1552', 'changed'),
+        ('MATH', '2550', 'removed'), ('MATH', '3012', 'added')]
+    assert changes.set_index('course').loc['1331', 'fields'] == ['description']
+
+
+def test_out_of_order_and_per_subject_ingest(tmp_path):
+    in_order = str(tmp_path / 'in_order')
+    ingest(FALL, '202408', in_order)
+    ingest(SPRING, '202502', in_order)
+
+    shuffled = str(tmp_path / 'shuffled')
+    ingest(SPRING, '202502', shuffled)
+    ingest(FALL, '202408', shuffled)
+    for term in ('202408', '202502'):
+        assert rows(as_of(term, shuffled)) == rows(as_of(term, in_order))
+
+    # Re-ingesting one subject of a term keeps the others
+    math_only = SPRING[SPRING['title'].str.startswith('MATH')].copy()
+    math_only.loc[math_only.index[0], 'description'] = 'Integrals, again.'
+    ingest(math_only, '202502', in_order)
+    latest = {r['title']: r['description'] for r in as_of('202502', in_order).to_dict('records')}
+    assert latest['MATH 1552 - Integral Calculus'] == 'Integrals, again.'
+    assert latest['CS 1331 - Intro-Object Orient Prog'] == 'Objects and classes.'
+    assert rows(as_of('202408', in_order)) == rows(FALL)
@@ -0,0 +1,68 @@
+"""
+Tooltip sidecar for the network pages.
+
+The hover tooltip HTML (title, description, prerequisites, professors,
+terms) is most of a page's weight but only one node's worth is needed at a
+time. Instead of shipping it inline in every node, it is written next to the
+page as gzipped JSON chunks:
+
+    network_math.html
+    network_math.tooltips/0.json.gz    {"1111": "<div>...</div>", ...}
+    network_math.tooltips/1.json.gz
+    ...
+
+Each node keeps only a `tip` attribute, the index of the chunk holding its
+tooltip. The page script (viewer.js) fetches a chunk on the first hover
+over any of its nodes and caches it, so the page itself only carries the
+graph topology.
+"""
+import gzip
+import json
+import os
+import shutil
+
+def sidecar_dir(out_path):
+    """network_math.html -> network_math.tooltips"""
+    return os.path.splitext(out_path)[0] + '.tooltips'
+
+def write_tooltip_sidecar(net, out_path, chunk_size=64):
+    """
+    Move every node's desc into compressed chunk files beside out_path.
+
+    Nodes are chunked in graph order, so a chunk holds courses that are
+    close in the catalog (and usually in the drawing). The desc column of the
+    CompactGraph is dropped and replaced by the chunk index column `tip`.
+
+    Returns:
+        Number of chunks written
+    """
+    directory = sidecar_dir(out_path)
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+
+    descs = net.pop_column('desc') or [None] * net.number_of_nodes()
+    tips = []
+    chunk = {}
+    count = 0
+    for node, desc in zip(net.nodes, descs):
+        if not desc:
+            tips.append(None)
+            continue
+        tips.append(count)
+        chunk[str(node)] = desc
+        if len(chunk) == chunk_size:
+            _write_chunk(directory, count, chunk)
+            chunk = {}
+            count += 1
+    if chunk:
+        _write_chunk(directory, count, chunk)
+        count += 1
+    net.set_column('tip', tips)
+    return count
+
+def _write_chunk(directory, index, chunk):
+    payload = json.dumps(chunk, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    # mtime=0 keeps rebuilds byte-identical when the tooltips didn't change
+    with open(os.path.join(directory, f'{index}.json.gz'), 'wb') as f:
+        f.write(gzip.compress(payload, compresslevel=9, mtime=0))
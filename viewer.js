@@ -0,0 +1,141 @@
+// Hover tooltips, chain highlighting and page links for the network pages.
+// emit.py inlines this after defining nodes, edges, network and tooltipBase
+// (and prereqClosure when the closure index is embedded).
+
+// Create tooltip element if it doesn't exist
+var tooltip = document.createElement('div');
+tooltip.id = 'customTooltip';
+tooltip.style.position = 'absolute';
+tooltip.style.display = 'none';
+tooltip.style.pointerEvents = 'none';
+tooltip.style.padding = '6px';
+tooltip.style.border = '1px solid #ccc';
+tooltip.style.borderRadius = '4px';
+tooltip.style.backgroundColor = '#f8f8f8';
+tooltip.style.fontFamily = 'sans-serif';
+tooltip.style.fontSize = '14px';
+tooltip.style.zIndex = '99999';
+tooltip.style.maxWidth = Math.min(window.innerWidth * 0.4, 500) + 'px'; // 40% of viewport width, max 500px
+document.body.appendChild(tooltip);
+
+// Update tooltip max width on window resize
+window.addEventListener('resize', function() {
+    tooltip.style.maxWidth = Math.min(window.innerWidth * 0.4, 500) + 'px';
+});
+
+// Tooltips live in gzipped chunk files next to the page (see tooltips.py);
+// nodes only carry the chunk index `tip`. Pages built with --inline-tooltips
+// keep `desc` inline.
+var tooltipCache = {};
+var tooltipChunks = {};
+var hoveredNode = null;
+
+function loadTooltipChunk(index) {
+    if (!(index in tooltipChunks)) {
+        tooltipChunks[index] = fetch(tooltipBase + '/' + index + '.json.gz')
+            .then(function (response) {
+                if (!response.ok) throw new Error(response.status);
+                var stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+                return new Response(stream).json();
+            })
+            .then(function (entries) {
+                Object.assign(tooltipCache, entries);
+            })
+            .catch(function (error) {
+                // Allow a retry on the next hover
+                delete tooltipChunks[index];
+                console.warn('Could not load tooltips', index, error);
+            });
+    }
+    return tooltipChunks[index];
+}
+
+function showTooltip(nodeId, desc) {
+    tooltip.innerHTML = desc;
+    tooltip.style.display = 'block';
+
+    // Position tooltip near cursor
+    var canvasPosition = network.getPosition(nodeId);
+    var DOMPosition = network.canvasToDOM(canvasPosition);
+    tooltip.style.left = (DOMPosition.x + 15) + 'px';
+    tooltip.style.top = (DOMPosition.y + 15) + 'px';
+}
+
+network.on("hoverNode", function (params) {
+    var nodeId = params.node;
+    if (!nodeId) return;
+    hoveredNode = nodeId;
+
+    var nodeData = nodes.get(nodeId);
+    if (nodeData && nodeData.desc) {
+        showTooltip(nodeId, nodeData.desc);
+        return;
+    }
+    if (!nodeData || nodeData.tip === undefined) {
+        tooltip.style.display = 'none';
+        return;
+    }
+    if (nodeId in tooltipCache) {
+        showTooltip(nodeId, tooltipCache[nodeId]);
+        return;
+    }
+    loadTooltipChunk(nodeData.tip).then(function () {
+        // Only show it if the pointer is still on this node
+        if (hoveredNode === nodeId && nodeId in tooltipCache) {
+            showTooltip(nodeId, tooltipCache[nodeId]);
+        }
+    });
+});
+
+// Stub nodes (courses from another department) and overview nodes link to a page
+network.on("doubleClick", function (params) {
+    if (params.nodes.length === 0) return;
+    var nodeData = nodes.get(params.nodes[0]);
+    if (nodeData && nodeData.page) {
+        window.location.href = nodeData.page;
+    }
+});
+
+// With an embedded closure index (gen_network.py --closure), clicking a course
+// highlights everything it needs and everything it leads to
+if (typeof prereqClosure !== 'undefined') {
+    var closurePosition = {};
+    prereqClosure.ids.forEach(function (id, i) {
+        closurePosition[id] = i;
+    });
+    var closureDescendants = null;
+
+    function descendantsOf(i) {
+        // Inverted once from the ancestor lists on first use
+        if (closureDescendants === null) {
+            closureDescendants = prereqClosure.ids.map(function () { return []; });
+            prereqClosure.ancestors.forEach(function (ancestors, course) {
+                ancestors.forEach(function (ancestor) {
+                    closureDescendants[ancestor].push(course);
+                });
+            });
+        }
+        return closureDescendants[i];
+    }
+
+    network.on("click", function (params) {
+        var selected = params.nodes.length ? params.nodes[0] : null;
+        var chain = null;
+        if (selected !== null && selected in closurePosition) {
+            var i = closurePosition[selected];
+            chain = {};
+            chain[selected] = true;
+            prereqClosure.ancestors[i].concat(descendantsOf(i)).forEach(function (j) {
+                chain[prereqClosure.ids[j]] = true;
+            });
+        }
+        nodes.update(nodes.getIds().map(function (id) {
+            return {id: id, opacity: chain === null || chain[id] ? 1 : 0.15};
+        }));
+    });
+}
+
+network.on("blurNode", function (params) {
+    hoveredNode = null;
+    tooltip.style.display = 'none';
+});
\ No newline at end of file